@@ -1,15 +1,16 @@
-import queue
 import time
 from mods.audio_detect import SpeechRecognitionThread  # Replace with your actual module name
+from mods.event_bus import EventBus
 
-# Queue for recognized speech
-speech_queue = queue.Queue(maxsize=10)
+# Event bus for recognized speech
+event_bus = EventBus()
+speech_cursor = event_bus.cursor()
 
 # Prompt user for language selection
 language = input("Choose language (english/hindi): ").strip().lower()
 
 # Start the speech recognition thread for the selected language
-speech_thread = SpeechRecognitionThread(audio_queue=speech_queue, language=language)
+speech_thread = SpeechRecognitionThread(event_bus, language=language)
 speech_thread.start()
 
 print(f"Listening for commands in {language}... Speak into the microphone!")
@@ -17,12 +18,8 @@ print(f"Listening for commands in {language}... Speak into the microphone!")
 try:
     while True:
         # Check for speech commands
-        try:
-            if not speech_queue.empty():
-                command = speech_queue.get(block=False)
-                print(f"Recognized command: {command}")
-        except queue.Empty:
-            pass
+        for event in speech_cursor.drain("speech"):
+            print(f"Recognized command: {event.value} ({event.age() * 1000:.0f} ms after capture)")
 
         time.sleep(0.1)  # Small delay to avoid busy waiting
 
@@ -0,0 +1,133 @@
+"""
+Bakes level images into pre-scaled sprite atlases.
+
+Every level module that defines IMAGE_ASSETS (a list of (path, (width, height)) pairs)
+has those images scaled to their display size and packed into atlas pages under
+images/baked/, with index.json mapping each (path, size) to its atlas and rectangle.
+Opaque images go into JPEG pages, images with transparency into PNG pages.
+mods.assets.load_image uses the bake automatically when it is present, so the original
+images are only needed to re-run this step.
+
+Run it again after changing any level image or display size:
+    python bake_assets.py [--page-size 2048]
+"""
+import argparse
+import importlib
+import json
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window needed
+import pygame
+from game_engine import LEVELS
+from mods.assets import BAKED_DIR
+
+
+def collect_assets():
+    """Return the unique (path, size) pairs from every level's IMAGE_ASSETS, in a stable order."""
+    assets = []
+    for level in LEVELS:
+        module = importlib.import_module(level["module"])
+        for path, size in getattr(module, "IMAGE_ASSETS", []):
+            if (path, tuple(size)) not in assets:
+                assets.append((path, tuple(size)))
+    return assets
+
+
+def scale_image(path, size):
+    """Load an image and scale it with smoothscale (bake time, so quality over speed)."""
+    image = pygame.image.load(path)
+    alpha = bool(image.get_flags() & pygame.SRCALPHA) or image.get_colorkey() is not None
+    # smoothscale needs a 24/32-bit surface; blitting onto a fresh one works without a display
+    converted = pygame.Surface(image.get_size(), pygame.SRCALPHA if alpha else 0, 32)
+    converted.blit(image, (0, 0))
+    return pygame.transform.smoothscale(converted, size), alpha
+
+
+def pack(items, page_size):
+    """
+    Shelf-pack (key, surface) items into pages of page_size x page_size.
+    Returns a list of pages, each a list of (key, surface, (x, y)).
+    """
+    items = sorted(items, key=lambda item: item[1].get_height(), reverse=True)
+    pages = []
+    page = []
+    x = y = shelf_height = 0
+    for key, surface in items:
+        width, height = surface.get_size()
+        if width > page_size or height > page_size:
+            raise ValueError(f"{key[0]} at {key[1]} does not fit on a {page_size}px atlas page")
+        if x + width > page_size:
+            # Next shelf
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        if y + height > page_size:
+            # Next page
+            pages.append(page)
+            page = []
+            x = y = shelf_height = 0
+        page.append((key, surface, (x, y)))
+        x += width
+        shelf_height = max(shelf_height, height)
+    if page:
+        pages.append(page)
+    return pages
+
+
+def page_surface(page, alpha):
+    """Draw a page's images onto one surface, cropped to the area actually used."""
+    width = max(x + surface.get_width() for _, surface, (x, _) in page)
+    height = max(y + surface.get_height() for _, surface, (_, y) in page)
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA if alpha else 0, 32)
+    for _, surface, position in page:
+        atlas.blit(surface, position)
+    return atlas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake level images into pre-scaled atlases")
+    parser.add_argument("--page-size", type=int, default=2048, help="Maximum atlas page width and height")
+    args = parser.parse_args()
+
+    pygame.init()
+    os.makedirs(BAKED_DIR, exist_ok=True)
+    for name in os.listdir(BAKED_DIR):
+        if name.startswith("atlas_"):
+            os.remove(os.path.join(BAKED_DIR, name))  # Pages left over from a previous bake
+
+    opaque = []
+    transparent = []
+    source_paths = set()
+    for path, size in collect_assets():
+        surface, alpha = scale_image(path, size)
+        (transparent if alpha else opaque).append(((path, size), surface))
+        source_paths.add(path)
+    source_bytes = sum(os.path.getsize(path) for path in source_paths)
+
+    entries = []
+    baked_bytes = 0
+    page_number = 0
+    for items, alpha, extension in ((opaque, False, "jpg"), (transparent, True, "png")):
+        for page in pack(items, args.page_size):
+            atlas_name = f"atlas_{page_number}.{extension}"
+            atlas_path = os.path.join(BAKED_DIR, atlas_name)
+            pygame.image.save(page_surface(page, alpha), atlas_path)
+            baked_bytes += os.path.getsize(atlas_path)
+            page_number += 1
+
+            for (path, size), surface, (x, y) in page:
+                entries.append({
+                    "path": path,
+                    "size": list(size),
+                    "atlas": atlas_name,
+                    "rect": [x, y, surface.get_width(), surface.get_height()],
+                })
+
+    with open(os.path.join(BAKED_DIR, "index.json"), "w", encoding="utf-8") as index_file:
+        json.dump({"images": entries}, index_file, indent=1)
+
+    print(f"Baked {len(entries)} images into {page_number} atlas pages in {BAKED_DIR}")
+    print(f"Source images: {source_bytes / 1024 / 1024:.1f} MB, atlases: {baked_bytes / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import pygame
-import queue
 from mods.blink_detect import BlinkDetectionThread  # Assuming the class above is saved in BlinkDetectionThread.py
+from mods.event_bus import EventBus
 
 # Initialize pygame
 pygame.init()
@@ -10,11 +10,12 @@ screen = pygame.display.set_mode((800, 600))
 pygame.display.set_caption("Blink Detection with Pygame")
 font = pygame.font.Font(None, 74)
 
-# Queue for communication
-blink_queue = queue.Queue()
+# Event bus for communication
+event_bus = EventBus()
+blink_cursor = event_bus.cursor()
 
 # Start Blink Detection Thread
-blink_thread = BlinkDetectionThread(blink_queue)
+blink_thread = BlinkDetectionThread(event_bus, debug=True)  # Show the annotated camera window
 blink_thread.start()
 
 running = True
@@ -26,16 +27,11 @@ while running:
             running = False
 
     # Check for blink messages
-    try:
-        blink_message = blink_queue.get_nowait()
-        if blink_message == "SINGLE_BLINK":
+    for event in blink_cursor.drain("blink"):
+        if event.value == "SINGLE_BLINK":
             message = "Single Blink Detected!"
-        elif blink_message == "DOUBLE_BLINK":
+        elif event.value == "DOUBLE_BLINK":
             message = "Double Blink Detected!"
-        else:
-            message = ""
-    except queue.Empty:
-        pass
 
     # Update screen
     screen.fill((0, 0, 0))  # Clear screen
@@ -1,4 +1,9 @@
 import importlib
+import threading
+from mods.input_service import get_input_service
+from mods.assets import prefetch_assets, load_level_assets
+from mods.metrics import get_metrics
+from mods.audio_scheduler import cancel_audio
 
 def calculate_time_score(time_taken, max_time):
     """
@@ -55,26 +60,56 @@ def calculate_domain_scores(data, domain_weights, game_weights):
     return final_domain_scores, overall_score
 
 
-def run(screen, player_name, player_age, initial_score, WIDTH, GAME_HEIGHT):
+# Levels in play order; max_time is the time budget used for the time score
+LEVELS = [
+    {"name": "form", "module": "levels.form", "max_time": 120},
+    {"name": "EchoMatch", "module": "levels.EchoMatch", "max_time": 120},
+    {"name": "PicChime", "module": "levels.PicChime", "max_time": 120},
+    {"name": "StoryWeave", "module": "levels.StoryWeaver", "max_time": 180},     
+    {"name": "LogicLink", "module": "levels.LogicLink", "max_time": 60},
+    {"name": "QuickAudio", "module": "levels.QuickAudio", "max_time": 60},
+    {"name": "BlockMorph", "module": "levels.BlockMorph", "max_time": 60},
+    {"name": "QuickTap", "module": "levels.QuickTap", "max_time": 30},            
+    {"name": "ChainReaction", "module": "levels.ChainReaction", "max_time": 60},
+    {"name": "NumberSort", "module": "levels.NumberSort", "max_time": 60},
+    {"name": "SpotTheDifference", "module": "levels.SpotTheDifference", "max_time": 120},
+    {"name": "PersonalQuiz", "module": "levels.PersonalQuiz", "max_time": 60},
+]
+
+
+def prefetch_level(level):
+    """
+    Import a level module and read its declared assets ahead (files only, see prefetch_assets).
+    Runs on a background thread while the previous level is being played.
+    """
+    try:
+        module = importlib.import_module(level["module"])
+        prefetch_assets(module)
+    except Exception as e:
+        # The level will load (and report) the same thing itself when it starts
+        print(f"Prefetching {level['name']} failed: {e}")
+
+
+def start_prefetch(level):
+    prefetch_thread = threading.Thread(target=prefetch_level, args=(level,), name=f"prefetch-{level['name']}")
+    prefetch_thread.daemon = True
+    prefetch_thread.start()
+    return prefetch_thread
+
+
+def run(screen, player_name, player_age, initial_score, WIDTH, GAME_HEIGHT, levels=None, listener=None):
     """
     Runs the game engine, managing levels and score.
+
+    :param levels: Level entries to play (same form as LEVELS), all of LEVELS if None.
+    :param listener: Optional object told about each level: level_started(level) before it
+                     runs and level_finished(level, result_list, time_taken) after it returns
+                     (used by the headless simulation).
     """
     max_attempts = 3
 
-    levels = [
-        {"name": "form", "module": "levels.form", "max_time": 120},
-        {"name": "EchoMatch", "module": "levels.EchoMatch", "max_time": 120},
-        {"name": "PicChime", "module": "levels.PicChime", "max_time": 120},
-        {"name": "StoryWeave", "module": "levels.StoryWeaver", "max_time": 180},     
-        {"name": "LogicLink", "module": "levels.LogicLink", "max_time": 60},
-        {"name": "QuickAudio", "module": "levels.QuickAudio", "max_time": 60},
-        {"name": "BlockMorph", "module": "levels.BlockMorph", "max_time": 60},
-        {"name": "QuickTap", "module": "levels.QuickTap", "max_time": 30},            
-        {"name": "ChainReaction", "module": "levels.ChainReaction", "max_time": 60},
-        {"name": "NumberSort", "module": "levels.NumberSort", "max_time": 60},
-        {"name": "SpotTheDifference", "module": "levels.SpotTheDifference", "max_time": 120},
-        {"name": "PersonalQuiz", "module": "levels.PersonalQuiz", "max_time": 60},
-    ]
+    if levels is None:
+        levels = LEVELS
 
     # levels = [
     #     # {"name": "form", "module": "levels.form", "max_time": 120},
@@ -91,21 +126,49 @@ def run(screen, player_name, player_age, initial_score, WIDTH, GAME_HEIGHT):
     #     {"name": "PersonalQuiz", "module": "test_levels.PersonalQuiz", "max_time": 60},
     # ]
 
+    # Levels subscribe to this service instead of starting their own input threads
+    get_input_service()
+
     win_width, win_height = screen.get_size()
     current_score = initial_score
 
     # Data to store level results in memory
     game_results = []
+    metrics = get_metrics()
+
+    prefetch_thread = None
+    for index, level in enumerate(levels):
+        # Whatever the background read for this level is complete before it is used
+        if prefetch_thread is not None:
+            prefetch_thread.join()
 
-    for level in levels:
-        # Dynamically import the level module
+        # Dynamically import the level module (already imported if it was prefetched)
         level_module = importlib.import_module(level["module"])
 
+        # Surfaces, sounds and fonts are made here, on the main thread
+        try:
+            load_level_assets(level_module)
+        except Exception as e:
+            print(f"Loading assets for {level['name']} failed: {e}")  # The level reports it itself
+
+        # Read the next level's files in the background while this one is played
+        prefetch_thread = start_prefetch(levels[index + 1]) if index + 1 < len(levels) else None
+
         print(f"Running {level['name']}...")
+        if listener is not None:
+            listener.level_started(level)
+
+        # Frame, input and latency measurements from here on belong to this level
+        metrics.start_scope(level["name"])
 
         # Run the level and get the results
         result_list, time_taken = level_module.run_game(screen, WIDTH, GAME_HEIGHT, win_width, win_height, max_attempts)
 
+        cancel_audio()  # No notes or narration left over from the level
+        metrics.start_scope("session")
+        if listener is not None:
+            listener.level_finished(level, result_list, time_taken)
+
         normalized_game_score = sum(result_list)
 
         # Calculate time efficiency score
@@ -2,9 +2,10 @@ import pygame
 import sys
 import random
 import math
-import queue
 import time
-from mods.audio_detect import SpeechRecognitionThread  # Replace with your actual module name
+from mods.input_service import get_input_service
+from mods.frame_clock import FrameScheduler
+from mods.text import render_text, render_cached, get_font
 
 
 def run_game(surface, level_width, level_height, win_width, win_height, max_attempts_arg):
@@ -19,10 +20,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     :param win_height: Height of the entire window.
     """
 
-    # speech detection setup
-    speech_queue = queue.Queue(maxsize=10)
-    speech_thread = SpeechRecognitionThread(audio_queue=speech_queue, language="english")
-    speech_thread.start()
+    # Speech input from the session-wide input service
+    subscription = get_input_service().subscribe(("speech",))
 
     # Clock to control frame rate
     clock = pygame.time.Clock()
@@ -43,28 +42,6 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         rotated_image = pygame.transform.rotozoom(image, -angle, 1)  # Negative angle to rotate correctly
         return rotated_image
     
-    def render_text(surface, text, font, color, x, y, max_width):
-        """
-        Helper function to render text with word wrapping.
-        """
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-
-        for word in words:
-            if font.size(current_line + word)[0] <= max_width:
-                current_line += word + " "
-            else:
-                lines.append(current_line)
-                current_line = word + " "
-
-        if current_line:
-            lines.append(current_line)
-
-        for line in lines:
-            text_surface = font.render(line, True, color)
-            surface.blit(text_surface, (x, y))
-            y += font.get_linesize() + 5
 
     def instruction_screen(surface, screen_width, screen_height):
         """
@@ -80,8 +57,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         BLACK = (0, 0, 0)
         RED = (255, 0, 0)
 
-        title_font = pygame.font.SysFont(None, 50)
-        text_font = pygame.font.SysFont(None, 30)
+        title_font = get_font(None, 50)
+        text_font = get_font(None, 30)
 
         # Instruction text
         instructions = (
@@ -91,11 +68,12 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         # Flag to keep the screen running
         running = True
 
+        frames = FrameScheduler(idle=True)  # Sleep until a key is pressed
         while running:
             surface.fill(WHITE)
 
             # Title
-            title_text = title_font.render("Game Instructions", True, BLUE)
+            title_text = render_cached(title_font, "Game Instructions", True, BLUE)
             surface.blit(title_text, (screen_width // 2 - title_text.get_width() // 2, 50))
 
             # Render the instruction
@@ -103,11 +81,11 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             render_text(surface, instructions, text_font, BLACK, 50, y_offset, screen_width - 100)
 
             # Navigation instructions
-            nav_text = text_font.render("Press ENTER to proceed.", True, RED)
+            nav_text = render_cached(text_font, "Press ENTER to proceed.", True, RED)
             surface.blit(nav_text, (screen_width // 2 - nav_text.get_width() // 2, screen_height - 100))
 
             # Event Handling
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -134,7 +112,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     user_angle = 0
 
     # Game font
-    font = pygame.font.SysFont(None, 48)
+    font = get_font(None, 48)
 
     # Limit the number of attempts
     max_attempts = max_attempts_arg
@@ -179,6 +157,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     # Get the subsurface offset for proper mouse handling
     subsurface_offset = surface.get_abs_offset()
 
+    subscription.skip()  # Drop blinks and commands made while reading the instructions
     while running and attempts < max_attempts:
         clock.tick(60)  # Limit to 60 frames per second
 
@@ -189,7 +168,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                 sys.exit()
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 # Adjust mouse position for subsurface
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = event.pos
                 adjusted_mouse_pos = (
                     mouse_pos[0] - subsurface_offset[0],
                     mouse_pos[1] - subsurface_offset[1]
@@ -205,7 +184,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                     angle_difference = abs((user_angle - reference_angle) % 360)
                     if angle_difference <= 7 or angle_difference >= 353:
                         # Player got it correct
-                        message = font.render("Correct!", True, (0, 255, 0))
+                        message = render_cached(font, "Correct!", True, (0, 255, 0))
                         surface.blit(message, (level_width // 2 - message.get_width() // 2, level_height - 50))
                         pygame.display.flip()
                         pygame.time.wait(2000)  # Pause for 2 seconds
@@ -213,7 +192,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                         
                     else:
                         # Player got it wrong
-                        message = font.render("Try Again!", True, (255, 0, 0))
+                        message = render_cached(font, "Try Again!", True, (255, 0, 0))
                         surface.blit(message, (level_width // 2 - message.get_width() // 2, level_height - 50))
                         pygame.display.flip()
                         pygame.time.wait(1000)  # Pause for 1 second
@@ -234,7 +213,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             angle_difference = abs((user_angle - reference_angle) % 360)
             if angle_difference <= 7 or angle_difference >= 353:
                 # Player got it correct
-                message = font.render("Correct!", True, (0, 255, 0))
+                message = render_cached(font, "Correct!", True, (0, 255, 0))
                 surface.blit(message, (level_width // 2 - message.get_width() // 2, level_height - 50))
                 pygame.display.flip()
                 pygame.time.wait(2000)  # Pause for 2 seconds
@@ -242,7 +221,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
             else:
                 # Player got it wrong
-                message = font.render("Try Again!", True, (255, 0, 0))
+                message = render_cached(font, "Try Again!", True, (255, 0, 0))
                 surface.blit(message, (level_width // 2 - message.get_width() // 2, level_height - 50))
                 pygame.display.flip()
                 pygame.time.wait(1000)  # Pause for 1 second
@@ -253,32 +232,29 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             attempts += 1
 
         # Speech Control
-        try:
-            if not speech_queue.empty():
-                command = speech_queue.get(block=False)
-                print(f"Recognized command: {command}")
-                if command == "left":
-                    user_angle = (user_angle + 5) % 360
-                elif command == "right":
-                    user_angle = (user_angle - 5) % 360
-                elif command == "select":
-                    angle_difference = abs((user_angle - reference_angle) % 360)
-                    if angle_difference <= 7 or angle_difference >= 353:
-                        # Player got it correct
-                        message = font.render("Correct!", True, (0, 255, 0))
-                        surface.blit(message, (level_width // 2 - message.get_width() // 2, level_height - 50))
-                        pygame.display.flip()
-                        pygame.time.wait(2000)  # Pause for 2 seconds
-                        results[attempts] = weights[attempts]
+        for event in subscription.drain("speech"):
+            command = event.value
+            print(f"Recognized command: {command}")
+            if command == "left":
+                user_angle = (user_angle + 5) % 360
+            elif command == "right":
+                user_angle = (user_angle - 5) % 360
+            elif command == "select":
+                angle_difference = abs((user_angle - reference_angle) % 360)
+                if angle_difference <= 7 or angle_difference >= 353:
+                    # Player got it correct
+                    message = render_cached(font, "Correct!", True, (0, 255, 0))
+                    surface.blit(message, (level_width // 2 - message.get_width() // 2, level_height - 50))
+                    pygame.display.flip()
+                    pygame.time.wait(2000)  # Pause for 2 seconds
+                    results[attempts] = weights[attempts]
                         
-                    else:
-                        # Player got it wrong
-                        message = font.render("Try Again!", True, (255, 0, 0))
-                        surface.blit(message, (level_width // 2 - message.get_width() // 2, level_height - 50))
-                        pygame.display.flip()
-                        pygame.time.wait(1000)  # Pause for 1 second
-        except queue.Empty:
-            pass
+                else:
+                    # Player got it wrong
+                    message = render_cached(font, "Try Again!", True, (255, 0, 0))
+                    surface.blit(message, (level_width // 2 - message.get_width() // 2, level_height - 50))
+                    pygame.display.flip()
+                    pygame.time.wait(1000)  # Pause for 1 second
 
         # Drawing
         surface.fill(WHITE)
@@ -299,16 +275,16 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         pygame.draw.rect(surface, (200, 200, 200), submit_button_rect)  # Submit button
 
         # Add button text
-        left_text = font.render("Left", True, BLACK)
-        right_text = font.render("Right", True, BLACK)
-        submit_text = font.render("Submit", True, BLACK)
+        left_text = render_cached(font, "Left", True, BLACK)
+        right_text = render_cached(font, "Right", True, BLACK)
+        submit_text = render_cached(font, "Submit", True, BLACK)
 
         surface.blit(left_text, (left_button_rect.centerx - left_text.get_width() // 2, left_button_rect.centery - left_text.get_height() // 2))
         surface.blit(right_text, (right_button_rect.centerx - right_text.get_width() // 2, right_button_rect.centery - right_text.get_height() // 2))
         surface.blit(submit_text, (submit_button_rect.centerx - submit_text.get_width() // 2, submit_button_rect.centery - submit_text.get_height() // 2))
 
         # Display instructions
-        instructions = font.render("Match the orientation!", True, BLACK)
+        instructions = render_cached(font, "Match the orientation!", True, BLACK)
         surface.blit(instructions, (level_width // 2 - instructions.get_width() // 2, 20))
 
         # Update display
@@ -321,13 +297,14 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
     end_time = time.time()-start_time
 
+    subscription.close()  # Stop receiving input events
     print("Results:", results, end_time)
     return results, end_time
 
 
 def render_text_1(surface, text, font, color, x, y):
     """Helper function to render text to the Pygame surface."""
-    text_surface = font.render(text, True, color)
+    text_surface = render_cached(font, text, True, color)
     rect = text_surface.get_rect(center=(x, y))
     surface.blit(text_surface, rect)
 
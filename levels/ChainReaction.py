@@ -1,20 +1,12 @@
 import pygame
 import random
 import time
-import queue
-from mods.blink_detect import BlinkDetectionThread  # Assuming the class above is saved in BlinkDetectionThread.py
-from mods.audio_detect import SpeechRecognitionThread  # Replace with your actual module name
+from mods.input_service import get_input_service
+from mods.text import render_cached, get_font
 
 def run_game(surface, level_width, level_height, win_width, win_height, max_attempts_arg):
-    # Blink detection setup
-    blink_queue = queue.Queue()
-    blink_thread = BlinkDetectionThread(blink_queue)
-    blink_thread.start()  # Start the blink detection thread
-
-    # speech detection setup
-    speech_queue = queue.Queue(maxsize=10)
-    speech_thread = SpeechRecognitionThread(audio_queue=speech_queue, language="english")
-    speech_thread.start()
+    # Blink and speech input from the session-wide input service
+    subscription = get_input_service().subscribe(("blink", "speech"))
 
     # Colors
     WHITE = (255, 255, 255)
@@ -23,7 +15,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     DARK_GRAY = (100, 100, 100)
 
     # Fonts
-    FONT = pygame.font.Font(None, 36)
+    FONT = get_font(None, 36)
 
     # Cause-Effect pairs
     cause_effect_pairs = [
@@ -69,6 +61,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
     start_time = time.time()
 
+    subscription.skip()  # Drop blinks and commands made before the first question
     while running and attempts < max_attempts:
         start_time = time.time()  # Start timing the attempt
 
@@ -77,7 +70,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             if event.type == pygame.QUIT:
                 running = False
                 pygame.quit()
-                blink_thread.stop()  # Stop the blink detection thread
+                subscription.close()  # Stop receiving input events
                 return
             
             elif event.type == pygame.KEYDOWN:
@@ -98,8 +91,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                         attempts += 1
 
         # Handle blink input
-        try:
-            blink_message = blink_queue.get_nowait()
+        for event in subscription.drain("blink"):
+            blink_message = event.value
             if blink_message == "SINGLE_BLINK":
                 # Toggle options using single blink
                 selected_option = (selected_option + 1) % len(options)
@@ -117,35 +110,32 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                     show_feedback = True
                     feedback_time = pygame.time.get_ticks()
                     attempts += 1  # Increment attempts
-        except queue.Empty:
-            pass
+                    break  # One answer per question
 
 
         # Speech Control
-        try:
-            if not speech_queue.empty():
-                command = speech_queue.get(block=False)
-                print(f"Recognized command: {command}")
-                if command == "down":
-                    selected_option = (selected_option + 1) % len(options)
-                elif command == "up":
-                    selected_option = (selected_option - 1) % len(options)
-                elif command == "select":
-                    # Submit selected option using double blink
-                    if current_index < len(cause_effect_pairs):
-                        correct_cause, effect = cause_effect_pairs[current_index]
+        for event in subscription.drain("speech"):
+            command = event.value
+            print(f"Recognized command: {command}")
+            if command == "down":
+                selected_option = (selected_option + 1) % len(options)
+            elif command == "up":
+                selected_option = (selected_option - 1) % len(options)
+            elif command == "select":
+                # Submit selected option using double blink
+                if current_index < len(cause_effect_pairs):
+                    correct_cause, effect = cause_effect_pairs[current_index]
 
-                        if options[selected_option] == correct_cause:
-                            results[attempts] = weights[attempts]
-                            feedback = "Correct!"
-                        else:
-                            feedback = f"Incorrect! The correct cause was: {correct_cause}"
+                    if options[selected_option] == correct_cause:
+                        results[attempts] = weights[attempts]
+                        feedback = "Correct!"
+                    else:
+                        feedback = f"Incorrect! The correct cause was: {correct_cause}"
                             
-                        show_feedback = True
-                        feedback_time = pygame.time.get_ticks()
-                        attempts += 1  # Increment attempts
-        except queue.Empty:
-            pass
+                    show_feedback = True
+                    feedback_time = pygame.time.get_ticks()
+                    attempts += 1  # Increment attempts
+                    break  # One answer per question
 
 
         # Clear the surface
@@ -154,7 +144,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         if current_index < len(cause_effect_pairs):
             # Display the current effect
             correct_cause, effect = cause_effect_pairs[current_index]
-            effect_surface = FONT.render("Effect: " + effect, True, BLACK)
+            effect_surface = render_cached(FONT, "Effect: " + effect, True, BLACK)
             surface.blit(effect_surface, (50, 50))
 
             # Generate options only once per question
@@ -171,12 +161,12 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                 rect = option_rects[idx]
                 color = DARK_GRAY if idx == selected_option else LIGHT_GRAY  # Highlight selected option
                 pygame.draw.rect(surface, color, rect)
-                option_surface = FONT.render(option, True, BLACK)
+                option_surface = render_cached(FONT, option, True, BLACK)
                 surface.blit(option_surface, (rect.x + 10, rect.y + 10))
 
             # Display feedback for 2 seconds
             if show_feedback:
-                feedback_surface = FONT.render(feedback, True, BLACK)
+                feedback_surface = render_cached(FONT, feedback, True, BLACK)
                 surface.blit(feedback_surface, (50, level_height - 100))
                 if pygame.time.get_ticks() - feedback_time > 2000:
                     show_feedback = False
@@ -194,6 +184,6 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
     end_time = time.time()-start_time
 
-    blink_thread.stop()  # Stop the blink detection thread
+    subscription.close()  # Stop receiving input events
     print("results", results, end_time)
     return results, end_time
@@ -1,21 +1,14 @@
 import pygame
 import random
-import queue
 import time
-from mods.blink_detect import BlinkDetectionThread  # Assuming this is the same BlinkDetectionThread used in Level 2
-from mods.audio_detect import SpeechRecognitionThread  # Replace with your actual module name
+from mods.input_service import get_input_service
+from mods.frame_clock import FrameScheduler
+from mods.text import render_cached, get_font
 
 
 def run_game(surface, level_width, level_height, win_width, win_height, max_attempts_arg):
-    # Blink detection setup
-    blink_queue = queue.Queue(maxsize=10)
-    blink_thread = BlinkDetectionThread(blink_queue)
-    blink_thread.start()  # Start the blink detection thread
-
-    # speech detection setup
-    speech_queue = queue.Queue(maxsize=10)
-    speech_thread = SpeechRecognitionThread(audio_queue=speech_queue, language="english")
-    speech_thread.start()
+    # Blink and speech input from the session-wide input service
+    subscription = get_input_service().subscribe(("blink", "speech"))
 
 
     # Define colors
@@ -71,8 +64,9 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         feedback = ""
         feedback_time = 0
 
-        # clock = pygame.time.Clock()
+        frames = FrameScheduler(idle=True)  # Sleep until a key, blink or command arrives
         running = True
+        subscription.skip()  # Drop blinks and commands made while the sequence was shown
 
         while running:
             surface.fill(BLACK)
@@ -92,34 +86,29 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             pygame.display.update()
 
             # Blink Control
-            try:
-                blink_message = blink_queue.get_nowait()
+            for event in subscription.drain("blink"):
+                blink_message = event.value
                 if blink_message == "SINGLE_BLINK":
                     print("Single Blink Detected - Pygame")
                     selected_index = (selected_index + 1) % len(options)
                 elif blink_message == "DOUBLE_BLINK":
                     print("Double Blink Detected - Pygame")
                     submit_pressed = True  # Ensure double blink sets submit_pressed
-            except queue.Empty:
-                pass
             
             # Speech Control
-            try:
-                if not speech_queue.empty():
-                    command = speech_queue.get(block=False)
-                    print(f"Recognized command: {command}")
-                    if command == "down":
-                        selected_index = (selected_index + 1) % len(options)
-                    elif command == "up":
-                        selected_index = (selected_index - 1) % len(options)
-                    elif command == "select":
-                        submit_pressed = True  # Ensure double blink sets submit_pressed
-            except queue.Empty:
-                pass
+            for event in subscription.drain("speech"):
+                command = event.value
+                print(f"Recognized command: {command}")
+                if command == "down":
+                    selected_index = (selected_index + 1) % len(options)
+                elif command == "up":
+                    selected_index = (selected_index - 1) % len(options)
+                elif command == "select":
+                    submit_pressed = True  # Ensure double blink sets submit_pressed
 
 
             # Keyboard Control
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     return None
@@ -134,14 +123,12 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             if submit_pressed:
                 running = False
 
-            # clock.tick(30)
-
         return options[selected_index]
 
 
     def instruction_screen():
         """Displays the instruction screen."""
-        font = pygame.font.SysFont(None, 30)
+        font = get_font(None, 30)
         surface.fill(WHITE)
 
         instructions = [
@@ -154,17 +141,18 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
         y_offset = 100
         for line in instructions:
-            text = font.render(line, True, BLACK)
+            text = render_cached(font, line, True, BLACK)
             surface.blit(text, (50, y_offset))
             y_offset += 40
 
-        prompt_text = font.render("Press Enter to Start", True, BLACK)
+        prompt_text = render_cached(font, "Press Enter to Start", True, BLACK)
         surface.blit(prompt_text, (level_width // 2 - prompt_text.get_width() // 2, level_height - 100))
 
         pygame.display.update()
 
+        frames = FrameScheduler(idle=True)  # Sleep until Enter is pressed
         while True:
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     return None
@@ -202,6 +190,6 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
     end_time = time.time()-start_time
 
-    blink_thread.stop()  # Stop the blink detection thread
+    subscription.close()  # Stop receiving input events
     print(results, end_time)
     return results, end_time
\ No newline at end of file
@@ -2,50 +2,63 @@ import pygame
 import random
 import sys
 import time
-import queue
-from mods.blink_detect import BlinkDetectionThread  # Assuming this is the same BlinkDetectionThread used in Level 2
-from mods.audio_detect import SpeechRecognitionThread  # Replace with your actual module name
+from mods.input_service import get_input_service
+from mods.assets import load_image
+from mods.ui import Screen, Label, Image
+from mods.frame_clock import FrameScheduler
+from mods.text import render_cached, get_font
+
+
+# Questions, options, and correct answers. Every image is shown at IMAGE_SIZE
+QUESTIONS = [
+    {
+        "question_images": ["images/level9/question_1/Sun.png", "images/level9/question_1/Day.png", "images/level9/question_1/Moon.png"],
+        "options": ["images/level9/question_1/Star.png", "images/level9/question_1/Sky.png", "images/level9/question_1/Night.png", "images/level9/question_1/Cloud.png"],
+        "correct_index": 2
+    },
+    {
+        "question_images": ["images/level9/question_2/Pen.png", "images/level9/question_2/Paper.png", "images/level9/question_2/Paintbrush.png"],
+        "options": ["images/level9/question_2/Easel.png", "images/level9/question_2/Canvas.png", "images/level9/question_2/Palette.png", "images/level9/question_2/Wall.png"],
+        "correct_index": 1
+    },
+    {
+        "question_images": ["images/level9/question_3/Monkey.png", "images/level9/question_3/Banana.png", "images/level9/question_3/Cow.png"],
+        "options": ["images/level9/question_3/Milk.png", "images/level9/question_3/Cheese.png", "images/level9/question_3/Carrot.png", "images/level9/question_3/Grass.png"],
+        "correct_index": 3
+    },
+    {
+        "question_images": ["images/level9/question_4/Ball.png", "images/level9/question_4/Bat.png", "images/level9/question_4/Shuttlecock.png"],
+        "options": ["images/level9/question_4/Racket.png", "images/level9/question_4/Net.png", "images/level9/question_4/Player.png", "images/level9/question_4/Court.png"],
+        "correct_index": 0
+    },
+    {
+        "question_images": ["images/level9/question_5/Musician.png", "images/level9/question_5/Guitar.png", "images/level9/question_5/Photographer.png"],
+        "options": ["images/level9/question_5/Reel.png", "images/level9/question_5/Tripod.png", "images/level9/question_5/Camera.png", "images/level9/question_5/Studio.png"],
+        "correct_index": 2
+    },
+    {
+        "question_images": ["images/level9/question_6/Bread.png", "images/level9/question_6/Baker.png", "images/level9/question_6/Book.png"],
+        "options": ["images/level9/question_6/Writer.png", "images/level9/question_6/Reader.png", "images/level9/question_6/Librarian.png", "images/level9/question_6/Teacher.png"],
+        "correct_index": 0
+    },
+]
+
+IMAGE_SIZE = (150, 150)
+
+# Every image the level shows, with its display size (used by the asset bake step)
+IMAGE_ASSETS = [
+    (path, IMAGE_SIZE) for question in QUESTIONS for path in question["question_images"] + question["options"]
+]
 
 
 def initialize_questions():
     """Load all images for questions and options and return the updated questions."""
-    # Define questions, options, and correct answers
-    questions = [
-        {
-            "question_images": ["images/level9/question_1/Sun.png", "images/level9/question_1/Day.png", "images/level9/question_1/Moon.png"],
-            "options": ["images/level9/question_1/Star.png", "images/level9/question_1/Sky.png", "images/level9/question_1/Night.png", "images/level9/question_1/Cloud.png"],
-            "correct_index": 2
-        },
-        {
-            "question_images": ["images/level9/question_2/Pen.png", "images/level9/question_2/Paper.png", "images/level9/question_2/Paintbrush.png"],
-            "options": ["images/level9/question_2/Easel.png", "images/level9/question_2/Canvas.png", "images/level9/question_2/Palette.png", "images/level9/question_2/Wall.png"],
-            "correct_index": 1
-        },
-        {
-            "question_images": ["images/level9/question_3/Monkey.png", "images/level9/question_3/Banana.png", "images/level9/question_3/Cow.png"],
-            "options": ["images/level9/question_3/Milk.png", "images/level9/question_3/Cheese.png", "images/level9/question_3/Carrot.png", "images/level9/question_3/Grass.png"],
-            "correct_index": 3
-        },
-        {
-            "question_images": ["images/level9/question_4/Ball.png", "images/level9/question_4/Bat.png", "images/level9/question_4/Shuttlecock.png"],
-            "options": ["images/level9/question_4/Racket.png", "images/level9/question_4/Net.png", "images/level9/question_4/Player.png", "images/level9/question_4/Court.png"],
-            "correct_index": 0
-        },
-        {
-            "question_images": ["images/level9/question_5/Musician.png", "images/level9/question_5/Guitar.png", "images/level9/question_5/Photographer.png"],
-            "options": ["images/level9/question_5/Reel.png", "images/level9/question_5/Tripod.png", "images/level9/question_5/Camera.png", "images/level9/question_5/Studio.png"],
-            "correct_index": 2
-        },
-        {
-            "question_images": ["images/level9/question_6/Bread.png", "images/level9/question_6/Baker.png", "images/level9/question_6/Book.png"],
-            "options": ["images/level9/question_6/Writer.png", "images/level9/question_6/Reader.png", "images/level9/question_6/Librarian.png", "images/level9/question_6/Teacher.png"],
-            "correct_index": 0
-        },
-    ]   
+    questions = [dict(question) for question in QUESTIONS]
+
 
     def load_images(image_paths):
         try:
-            return [pygame.transform.scale(pygame.image.load(path), (150, 150)) for path in image_paths]
+            return [load_image(path, IMAGE_SIZE) for path in image_paths]
         except FileNotFoundError as e:
             print(f"Error loading images: {e}")
             sys.exit()
@@ -70,15 +83,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     """
 
     
-    # Blink detection setup
-    blink_queue = queue.Queue(maxsize=10)
-    blink_thread = BlinkDetectionThread(blink_queue)
-    blink_thread.start()  # Start the blink detection thread
-
-    # speech detection setup
-    speech_queue = queue.Queue(maxsize=10)
-    speech_thread = SpeechRecognitionThread(audio_queue=speech_queue, language="english")
-    speech_thread.start()
+    # Blink and speech input from the session-wide input service
+    subscription = get_input_service().subscribe(("blink", "speech"))
 
 
     # Colors
@@ -89,47 +95,38 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     BLUE = (0, 0, 255)
 
     # Fonts
-    FONT = pygame.font.Font(None, 48)
-    FONT_SMALL = pygame.font.Font(None, 36)
+    FONT = get_font(None, 48)
+    FONT_SMALL = get_font(None, 36)
 
     # Load questions and images
     questions = initialize_questions()
 
-    def render_question(surface, question):
-        """Display the current question images forming the analogy."""
+    SYMBOL_FONT = get_font(None, 64)
+
+    def build_question_screen(surface, question):
+        """
+        Build the screen for a question: the images forming the analogy and the options.
+        Returns the screen and the option widgets, whose border marks the selected option.
+        """
+        screen = Screen(surface, WHITE)
         image_positions = [(150, 50), (350, 50), (550, 50)]
 
         for i, img in enumerate(question["question_images"]):
-            surface.blit(img, image_positions[i])
+            screen.add(Image(img, image_positions[i]))
 
-        # Render text symbols
+        # Text symbols after each image
         symbols = [":", "->", "?"]
-        font = pygame.font.Font(None, 64)
-        colon_position = (image_positions[0][0] + 150 + 25, image_positions[0][1] + 50)
-        arrow_position = (image_positions[1][0] + 150 + 25, image_positions[1][1] + 50)
-        question_mark_position = (image_positions[2][0] + 150 + 25, image_positions[2][1] + 50)
-
-        colon_surface = font.render(symbols[0], True, BLACK)
-        arrow_surface = font.render(symbols[1], True, BLACK)
-        question_mark_surface = font.render(symbols[2], True, BLACK)
+        for symbol, (x, y) in zip(symbols, image_positions):
+            screen.add(Label(symbol, SYMBOL_FONT, BLACK, (x + 150 + 25, y + 50)))
 
-        surface.blit(colon_surface, colon_position)
-        surface.blit(arrow_surface, arrow_position)
-        surface.blit(question_mark_surface, question_mark_position)
-
-    def render_options(surface, question, selected_option):
-        """Display the current question's options with a border around the selected option."""
         positions = [
             (100, 300),  # Top-left
             (300, 300),  # Top-right
             (500, 300),  # Bottom-left
             (700, 300),  # Bottom-right
         ]
-
-        for i, img in enumerate(question["options"]):
-            surface.blit(img, positions[i])
-            if i == selected_option:
-                pygame.draw.rect(surface, BLUE, pygame.Rect(positions[i][0], positions[i][1], 150, 150), 5)
+        option_widgets = [screen.add(Image(img, positions[i])) for i, img in enumerate(question["options"])]
+        return screen, option_widgets
 
     def check_answer(selected_option, question):
         """Check if the selected option is the correct answer."""
@@ -148,8 +145,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         BLACK = (0, 0, 0)
         RED = (255, 0, 0)
 
-        title_font = pygame.font.SysFont(None, 50)
-        text_font = pygame.font.SysFont(None, 30)
+        title_font = get_font(None, 50)
+        text_font = get_font(None, 30)
 
         instructions = (
             "1. You will be shown an incomplete analogy.",
@@ -160,22 +157,23 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
         running = True
 
+        frames = FrameScheduler(idle=True)  # Sleep until a key is pressed
         while running:
             surface.fill(WHITE)
 
-            title_text = title_font.render("Game Instructions", True, BLUE)
+            title_text = render_cached(title_font, "Game Instructions", True, BLUE)
             surface.blit(title_text, (screen_width // 2 - title_text.get_width() // 2, 50))
 
             y_offset = 150
             for line in instructions:
-                text_surface = text_font.render(line, True, BLACK)
+                text_surface = render_cached(text_font, line, True, BLACK)
                 surface.blit(text_surface, (50, y_offset))
                 y_offset += text_font.get_linesize() + 20
 
-            nav_text = text_font.render("Press ENTER to proceed.", True, RED)
+            nav_text = render_cached(text_font, "Press ENTER to proceed.", True, RED)
             surface.blit(nav_text, (screen_width // 2 - nav_text.get_width() // 2, screen_height - 100))
 
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -198,17 +196,23 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     start_time = time.time()
 
 
+    shown_question = None
+    subscription.skip()  # Drop blinks and commands made while reading the instructions
     while running:
-        surface.fill(WHITE)
+        if shown_question != attempts:
+            # New question: build its screen, render() then draws it in full
+            screen, option_widgets = build_question_screen(surface, questions[attempts])
+            shown_question = attempts
 
-        render_question(surface, questions[attempts])
-        render_options(surface, questions[attempts], selected_option)
-        pygame.display.flip()
+        # Only the options whose selection changed are redrawn
+        for i, option in enumerate(option_widgets):
+            option.set(border=(BLUE, 5) if i == selected_option else None)
+        screen.render()
 
 
         # Blink Control
-        try:
-            blink_message = blink_queue.get_nowait()
+        for event in subscription.drain("blink"):
+            blink_message = event.value
             if blink_message == "SINGLE_BLINK":
                 print("Single Blink Detected - Pygame")
                 selected_option = (selected_option + 1) % 4
@@ -224,20 +228,18 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                     game_state = "question"
                 else:
                     running = False
-        except queue.Empty:
-            pass
+                break  # Later blinks belonged to the answered question
         
         # Speech Control
-        try:
-            if not speech_queue.empty():
-                command = speech_queue.get(block=False)
-                print(f"Recognized command: {command}")
-                if command == "next":
-                    selected_option = (selected_option + 1) % 4
-                elif command == "revious":
-                    selected_option = (selected_option - 1) % 4
-                elif command == "select":
-                    is_correct = check_answer(selected_option, questions[attempts])
+        for event in subscription.drain("speech"):
+            command = event.value
+            print(f"Recognized command: {command}")
+            if command == "next":
+                selected_option = (selected_option + 1) % 4
+            elif command == "previous":
+                selected_option = (selected_option - 1) % 4
+            elif command == "select":
+                is_correct = check_answer(selected_option, questions[attempts])
                 if is_correct:
                     results[attempts] = weights[attempts]
 
@@ -247,8 +249,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                     game_state = "question"
                 else:
                     running = False
-        except queue.Empty:
-            pass
+                break  # Later commands belonged to the answered question
 
         # keybaord and mouse contorl
         for event in pygame.event.get():
@@ -276,5 +277,6 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
     end_time = time.time()-start_time
 
+    subscription.close()  # Stop receiving input events
     print("Results: ", results, "Time: ", end_time)
     return results, end_time
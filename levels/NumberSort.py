@@ -1,17 +1,32 @@
 import pygame
 import random
 import time
-import queue
-from mods.audio_detect import SpeechRecognitionThread  # Replace with your actual module name
+from mods.input_service import get_input_service
+from mods.assets import load_image
+from mods.frame_clock import FrameScheduler
+from mods.text import get_font
+
+# Currency note images and their values
+NOTES = [
+    {"value": 10, "path": "images/numbersort/10.jpeg"},
+    {"value": 50, "path": "images/numbersort/50.jpeg"},
+    {"value": 100, "path": "images/numbersort/100.jpeg"},
+    {"value": 200, "path": "images/numbersort/200.jpeg"},
+    {"value": 500, "path": "images/numbersort/500.jpeg"},
+    {"value": 2000, "path": "images/numbersort/2000.jpeg"},
+]
+NOTE_SIZE = (180, 90)  # In the grid
+ARRANGED_NOTE_SIZE = (90, 45)  # In the arranged row
+
+# Every image the level shows, with its display size (used by the asset bake step)
+IMAGE_ASSETS = [(note["path"], size) for note in NOTES for size in (NOTE_SIZE, ARRANGED_NOTE_SIZE)]
 
 def run_game(surface, level_width, level_height, win_width, win_height, max_attempts_arg):
     # Initialize Pygame
     pygame.init()
 
-    # speech detection setup
-    speech_queue = queue.Queue(maxsize=10)
-    speech_thread = SpeechRecognitionThread(audio_queue=speech_queue, language="english")
-    speech_thread.start()
+    # Speech input from the session-wide input service
+    subscription = get_input_service().subscribe(("speech",))
 
 
     # Colors
@@ -22,21 +37,12 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     BLUE = (0, 0, 255)
     
     # Font
-    font = pygame.font.Font(None, 36)
-
-    # Load currency note images and their values
-    notes = [
-        {"value": 10, "image": pygame.image.load("images/numbersort/10.jpeg")},
-        {"value": 50, "image": pygame.image.load("images/numbersort/50.jpeg")},
-        {"value": 100, "image": pygame.image.load("images/numbersort/100.jpeg")},
-        {"value": 200, "image": pygame.image.load("images/numbersort/200.jpeg")},
-        {"value": 500, "image": pygame.image.load("images/numbersort/500.jpeg")},
-        {"value": 2000, "image": pygame.image.load("images/numbersort/2000.jpeg")},
-    ]
-
-    # Resize images for consistent display
+    font = get_font(None, 36)
+
+    # Resized for consistent display, decoded once per session by the asset cache
+    notes = [dict(note) for note in NOTES]
     for note in notes:
-        note["image"] = pygame.transform.scale(note["image"], (180, 90))
+        note["image"] = load_image(note["path"], NOTE_SIZE)
 
     # Game variables
     attempts = 0
@@ -67,19 +73,20 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         def draw_arranged_notes():
             for i, note in enumerate(arranged_notes):
                 x = 10 + i * (GRID_CELL_WIDTH // 2)
-                scaled_image = pygame.transform.scale(note["image"], (GRID_CELL_WIDTH // 2, GRID_CELL_HEIGHT // 2))
+                scaled_image = load_image(note["path"], ARRANGED_NOTE_SIZE)
                 surface.blit(scaled_image, (x, arranged_notes_y))
 
         def is_correct_order():
             return [note["value"] for note in arranged_notes] == sorted([note["value"] for note in arranged_notes])
 
-        GRID_CELL_WIDTH = 180
-        GRID_CELL_HEIGHT = 90
+        GRID_CELL_WIDTH, GRID_CELL_HEIGHT = NOTE_SIZE
         GRID_MARGIN_X = (level_width - (3 * GRID_CELL_WIDTH)) // 2
         GRID_MARGIN_Y = 100
         arranged_notes_y = level_height - 120
 
+        frames = FrameScheduler(idle=True)  # Sleep until a key or command arrives
         running = True
+        subscription.skip()  # Drop blinks and commands made before this round
         while running:
             surface.fill(WHITE)
             draw_grid()
@@ -89,7 +96,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                 game_over = True
                 end_time = time.time()
 
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     running = False
 
@@ -103,19 +110,16 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                             arranged_notes.append(notes[selected_index])
 
             # Speech Control
-            try:
-                if not speech_queue.empty():
-                    command = speech_queue.get(block=False)
-                    print(f"Recognized command: {command}")
-                    if command == "next":
-                        selected_index = (selected_index - 1) % len(notes)
-                    elif command == "previous":
-                        selected_index = (selected_index + 1) % len(notes)
-                    elif command == "select":
-                        if notes[selected_index] not in arranged_notes:
-                            arranged_notes.append(notes[selected_index])
-            except queue.Empty:
-                pass
+            for event in subscription.drain("speech"):
+                command = event.value
+                print(f"Recognized command: {command}")
+                if command == "next":
+                    selected_index = (selected_index - 1) % len(notes)
+                elif command == "previous":
+                    selected_index = (selected_index + 1) % len(notes)
+                elif command == "select":
+                    if notes[selected_index] not in arranged_notes:
+                        arranged_notes.append(notes[selected_index])
 
 
             if game_over:
@@ -129,5 +133,5 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
     end_time = time.time()-start_time
 
-    pygame.quit()
+    subscription.close()  # Stop receiving input events
     return results, end_time
@@ -2,6 +2,9 @@ import pygame
 import random
 import global_data
 import time  # For time measurement
+from mods.ui import Screen, Label, Box
+from mods.frame_clock import FrameScheduler
+from mods.text import get_font
 
 def run_game(surface, level_width, level_height, win_width, win_height, max_attempts_arg):
     """
@@ -16,9 +19,9 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     RED = (255, 0, 0)
 
     # Fonts
-    TITLE_FONT = pygame.font.Font(None, 36)
-    QUESTION_FONT = pygame.font.Font(None, 24)
-    INPUT_FONT = pygame.font.Font(None, 20)
+    TITLE_FONT = get_font(None, 36)
+    QUESTION_FONT = get_font(None, 24)
+    INPUT_FONT = get_font(None, 20)
 
     # Fetch stored data
     stored_data = global_data.persistent_user_data
@@ -45,43 +48,21 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     question_start_time = start_time
     total_time = 0
 
+    # Widgets are built once and updated in place, so only what changed is redrawn
+    screen = Screen(surface, WHITE)
+    screen.add(Label("Quiz Level", TITLE_FONT, BLACK, (level_width // 2, 20), anchor="midtop"))
+    question_label = screen.add(Label("", QUESTION_FONT, BLACK, (level_width // 2, level_height // 2 - 50), anchor="midtop"))
+    input_box = screen.add(Box(input_field["rect"], GRAY, "", INPUT_FONT, BLACK))
+    score_label = screen.add(Label("", TITLE_FONT, BLACK, (level_width // 2, level_height // 2 - 50), anchor="midtop"))
+    score_label.visible = False
+    screen.add(Box(submit_button, GREEN, "Submit", QUESTION_FONT, WHITE, text_offset=(70, 10)))
+    feedback_label = screen.add(Label("", QUESTION_FONT, RED, (level_width // 2, level_height - 120), anchor="midtop"))
+
+    frames = FrameScheduler(idle=True)  # Nothing moves until a key or click
     running = True
     while running:
-        surface.fill(WHITE)
-
-        # Display title
-        title_surface = TITLE_FONT.render("Quiz Level", True, BLACK)
-        surface.blit(title_surface, (level_width // 2 - title_surface.get_width() // 2, 20))
-
-        # Display current question
-        if question_index < total_questions:
-            question_key = list(questions.keys())[question_index]
-            question_text = f"What is your {question_key.replace('_', ' ')}?"
-            question_surface = QUESTION_FONT.render(question_text, True, BLACK)
-            surface.blit(question_surface, (level_width // 2 - question_surface.get_width() // 2, level_height // 2 - 50))
-
-            # Draw input box
-            pygame.draw.rect(surface, GRAY, input_field["rect"])
-            input_surface = INPUT_FONT.render(input_field["value"], True, BLACK)
-            surface.blit(input_surface, (input_field["rect"].x + 5, input_field["rect"].y + 5))
-        else:
-            # Display final score
-            score_surface = TITLE_FONT.render(f"Your Score: {total_score}/{10}", True, BLACK)
-            surface.blit(score_surface, (level_width // 2 - score_surface.get_width() // 2, level_height // 2 - 50))
-            feedback_message = f"Time Taken: {total_time:.2f} seconds. Press ESC to exit."
-
-        # Draw submit button
-        pygame.draw.rect(surface, GREEN, submit_button)
-        submit_text = QUESTION_FONT.render("Submit", True, WHITE)
-        surface.blit(submit_text, (submit_button.x + 70, submit_button.y + 10))
-
-        # Display feedback message
-        if feedback_message:
-            feedback_surface = QUESTION_FONT.render(feedback_message, True, RED)
-            surface.blit(feedback_surface, (level_width // 2 - feedback_surface.get_width() // 2, level_height - 120))
-
         # Event handling
-        for event in pygame.event.get():
+        for event in frames.events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 return None  # Exit the game loop entirely
@@ -131,7 +112,19 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 running = False
 
-        pygame.display.update()
+        # Update the widgets for the current question, or the final score
+        if question_index < total_questions:
+            question_key = list(questions.keys())[question_index]
+            question_label.set(text=f"What is your {question_key.replace('_', ' ')}?")
+            input_box.set(text=input_field["value"])
+        else:
+            question_label.set(visible=False)
+            input_box.set(visible=False)
+            score_label.set(text=f"Your Score: {total_score}/{10}", visible=True)
+            feedback_message = f"Time Taken: {total_time:.2f} seconds. Press ESC to exit."
+        feedback_label.set(text=feedback_message)
+
+        screen.render()
 
     # Return the quiz results, scores, and total time
     return score_per_question, total_time
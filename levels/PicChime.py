@@ -2,10 +2,18 @@ import pygame
 import random
 import sys
 from pygame.locals import *
-import queue
 import time
-from mods.blink_detect import BlinkDetectionThread  # Assuming this is the same BlinkDetectionThread used in Level 2
-from mods.audio_detect import SpeechRecognitionThread  # Replace with your actual module name
+from mods.input_service import get_input_service
+from mods.assets import load_image
+from mods.frame_clock import FrameScheduler
+from mods.text import render_text, render_cached, get_font
+
+# Pictures shown in the sequences
+IMAGE_PATHS = [f'images/level6/img{i}.png' for i in range(1, 7)]
+IMAGE_SIZE = (200, 200)
+
+# Every image the level shows, with its display size (used by the asset bake step)
+IMAGE_ASSETS = [(path, IMAGE_SIZE) for path in IMAGE_PATHS]
 
 
 def run_game(surface, level_width, level_height, win_width, win_height, max_attempts_arg):
@@ -19,50 +27,16 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     :param win_width: Width of the entire window.
     :param win_height: Height of the entire window.
     """
-    # Blink detection setup
-    blink_queue = queue.Queue(maxsize=10)
-    blink_thread = BlinkDetectionThread(blink_queue)
-    blink_thread.start()  # Start the blink detection thread
-
-    # speech detection setup
-    speech_queue = queue.Queue(maxsize=10)
-    speech_thread = SpeechRecognitionThread(audio_queue=speech_queue, language="english")
-    speech_thread.start()
+    # Speech input from the session-wide input service (blink control is disabled below)
+    subscription = get_input_service().subscribe(("speech",))
 
 
     # Set up fonts
-    FONT = pygame.font.SysFont(None, 36)
-
-    # Load images
-    NUM_IMAGES = 6
-    image_list = []
-    for i in range(1, NUM_IMAGES + 1):
-        image = pygame.image.load(f'images/level6/img{i}.png')
-        image = pygame.transform.scale(image, (200, 200))  # Resize images
-        image_list.append(image)
-
-    def render_text(surface, text, font, color, x, y, max_width):
-        """
-        Helper function to render text with word wrapping.
-        """
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-
-        for word in words:
-            if font.size(current_line + word)[0] <= max_width:
-                current_line += word + " "
-            else:
-                lines.append(current_line)
-                current_line = word + " "
+    FONT = get_font(None, 36)
 
-        if current_line:
-            lines.append(current_line)
+    # Load images (resized, cached across attempts)
+    image_list = [load_image(path, IMAGE_SIZE) for path in IMAGE_PATHS]
 
-        for line in lines:
-            text_surface = font.render(line, True, color)
-            surface.blit(text_surface, (x, y))
-            y += font.get_linesize() + 5
 
     def instruction_screen(surface, screen_width, screen_height):
         """
@@ -78,8 +52,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         BLACK = (0, 0, 0)
         RED = (255, 0, 0)
 
-        title_font = pygame.font.SysFont(None, 50)
-        text_font = pygame.font.SysFont(None, 30)
+        title_font = get_font(None, 50)
+        text_font = get_font(None, 30)
 
         # Instruction text
         instructions = (
@@ -91,11 +65,12 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         # Flag to keep the screen running
         running = True
 
+        frames = FrameScheduler(idle=True)  # Sleep until a key is pressed
         while running:
             surface.fill(WHITE)
 
             # Title
-            title_text = title_font.render("Game Instructions", True, BLUE)
+            title_text = render_cached(title_font, "Game Instructions", True, BLUE)
             surface.blit(title_text, (screen_width // 2 - title_text.get_width() // 2, 50))
 
             # Render each line of instructions
@@ -105,11 +80,11 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                 y_offset += text_font.get_linesize() + 20  # Adjust spacing between lines
 
             # Navigation instructions
-            nav_text = text_font.render("Press ENTER to proceed.", True, RED)
+            nav_text = render_cached(text_font, "Press ENTER to proceed.", True, RED)
             surface.blit(nav_text, (screen_width // 2 - nav_text.get_width() // 2, screen_height - 100))
 
             # Event Handling
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -129,7 +104,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     def show_message(message):
         """Display a message in the center of the subsurface."""
         surface.fill((0, 0, 0))
-        text = FONT.render(message, True, (255, 255, 255))
+        text = render_cached(FONT, message, True, (255, 255, 255))
         rect = text.get_rect(center=(level_width // 2, level_height // 2))
         surface.blit(text, rect)
         pygame.display.update()
@@ -162,6 +137,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         scaled_images = [pygame.transform.scale(img, (img_width, img_height)) for img in all_images]
 
         running = True
+        frames = FrameScheduler(idle=True)  # Sleep until a click, key or speech command arrives
+        subscription.skip()  # Drop blinks and commands made while the sequence was shown
         while running:
             surface.fill((0, 0, 0))
             positions = []
@@ -182,8 +159,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             pygame.display.update()
 
             # # Handle blink input
-            # try:
-            #     blink_message = blink_queue.get_nowait()
+            # for event in subscription.drain("blink"):
+            #     blink_message = event.value
             #     if blink_message == "SINGLE_BLINK":
             #         print("Single Blink Detected - Pygame")
             #         current_index = (current_index + 1) % len(scaled_images)  # Navigate to the next image
@@ -197,31 +174,27 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             #         # Automatically end selection phase once enough images are selected
             #         if len(selected_images) == sequence_length:
             #             running = False
-            # except queue.Empty:
-            #     pass
 
             # Speech Control
-            try:
-                if not speech_queue.empty():
-                    command = speech_queue.get(block=False)
-                    print(f"Recognized command: {command}")
-                    if command == "next":
-                        current_index = (current_index + 1) % len(scaled_images)
-                    elif command == "previous":
-                        current_index = (current_index - 1) % len(scaled_images)
-                    elif command == "select":
-                        if current_index in selected_images:
-                            selected_images.remove(current_index)
-                        else:
-                            selected_images.append(current_index)
-
-                        # Automatically end selection phase once enough images are selected
-                        if len(selected_images) == sequence_length:
-                            running = False
-            except queue.Empty:
-                pass
+            for event in subscription.drain("speech"):
+                command = event.value
+                print(f"Recognized command: {command}")
+                if command == "next":
+                    current_index = (current_index + 1) % len(scaled_images)
+                elif command == "previous":
+                    current_index = (current_index - 1) % len(scaled_images)
+                elif command == "select":
+                    if current_index in selected_images:
+                        selected_images.remove(current_index)
+                    else:
+                        selected_images.append(current_index)
+
+                    # Automatically end selection phase once enough images are selected
+                    if len(selected_images) == sequence_length:
+                        running = False
+                        break
 
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == QUIT:
                     pygame.quit()
                     sys.exit()
@@ -322,5 +295,6 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     # show_message(f'Final Score: {score}')
     pygame.time.wait(2000)
 
+    subscription.close()  # Stop receiving input events
     print("Results: ", results, end_time)
     return results, end_time
\ No newline at end of file
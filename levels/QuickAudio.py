@@ -2,22 +2,38 @@ import pygame
 import random
 import time
 import sys
-import queue
-from mods.blink_detect import BlinkDetectionThread  # Assuming this is the same BlinkDetectionThread used in Level 2
-from mods.audio_detect import SpeechRecognitionThread  # Replace with your actual module name
+from mods.input_service import get_input_service
+from mods.assets import load_sound
+from mods.audio_scheduler import get_audio_scheduler
+from mods.tone_synth import synth_notes
+from mods.frame_clock import FrameScheduler
+from mods.text import render_text, render_cached, get_font
+
+# Audio files for notes
+NOTES = [
+    {'name': 'Sa', 'sound': 'sounds/QuickAudio/001.mp3'},
+    {'name': 'Re', 'sound': 'sounds/QuickAudio/002.mp3'},
+    {'name': 'Ga', 'sound': 'sounds/QuickAudio/003.mp3'},
+    {'name': 'Ma', 'sound': 'sounds/QuickAudio/004.mp3'},
+    {'name': 'Pa', 'sound': 'sounds/QuickAudio/005.mp3'},
+    {'name': 'Dha', 'sound': 'sounds/QuickAudio/006.mp3'},
+    {'name': 'Ni', 'sound': 'sounds/QuickAudio/007.mp3'},
+    {'name': 'Sa High', 'sound': 'sounds/QuickAudio/008.mp3'}
+]
+
+# Where the notes come from: "samples" plays the files above, "synth" generates the swaras
+# (mods/tone_synth.py) with no files to load, and offers more notes on later attempts
+NOTE_SOURCE = "samples"
+SYNTH_PITCHES = [8, 11, 15]  # Notes to choose from on each attempt with the "synth" source
+
+# Sounds read ahead by the level prefetcher and created when the level starts
+SOUND_ASSETS = [note['sound'] for note in NOTES] if NOTE_SOURCE == "samples" else []
 
 
 def run_game(surface, level_width, level_height, win_width, win_height, max_attempts_arg):
     
-    # Blink detection setup
-    blink_queue = queue.Queue(maxsize=10)
-    blink_thread = BlinkDetectionThread(blink_queue)
-    blink_thread.start()  # Start the blink detection thread
-
-    # speech detection setup
-    speech_queue = queue.Queue(maxsize=10)
-    speech_thread = SpeechRecognitionThread(audio_queue=speech_queue, language="english")
-    speech_thread.start()
+    # Blink and speech input from the session-wide input service
+    subscription = get_input_service().subscribe(("blink", "speech"))
 
 
     # Define constants
@@ -26,80 +42,80 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     GREEN = (0, 255, 0)
     RED = (255, 0, 0)
 
-    # Audio files for notes
-    notes = [
-        {'name': 'Sa', 'sound': 'sounds/QuickAudio/001.mp3'},
-        {'name': 'Re', 'sound': 'sounds/QuickAudio/002.mp3'},
-        {'name': 'Ga', 'sound': 'sounds/QuickAudio/003.mp3'},
-        {'name': 'Ma', 'sound': 'sounds/QuickAudio/004.mp3'},
-        {'name': 'Pa', 'sound': 'sounds/QuickAudio/005.mp3'},
-        {'name': 'Dha', 'sound': 'sounds/QuickAudio/006.mp3'},
-        {'name': 'Ni', 'sound': 'sounds/QuickAudio/007.mp3'},
-        {'name': 'Sa High', 'sound': 'sounds/QuickAudio/008.mp3'}
-    ]
-
-    # Load sounds
-    for note in notes:
+    # Notes are played by the session audio scheduler, so the screen keeps running meanwhile
+    audio = get_audio_scheduler()
+
+    if NOTE_SOURCE == "synth":
         try:
-            note['tone'] = pygame.mixer.Sound(note['sound'])
+            notes = synth_notes(max(SYNTH_PITCHES))
         except pygame.error as e:
-            print(f"Error loading sound {note['sound']}: {e}")
+            print(f"Error synthesising notes: {e}")
             pygame.quit()
             sys.exit()
+    else:
+        # Load sounds (already created by game_engine when the level started)
+        notes = [dict(note) for note in NOTES]
+        for note in notes:
+            try:
+                note['tone'] = load_sound(note['sound'])
+            except pygame.error as e:
+                print(f"Error loading sound {note['sound']}: {e}")
+                pygame.quit()
+                sys.exit()
+
+    def pitch_count(attempt):
+        """How many of the notes a sequence is drawn from on this attempt."""
+        if NOTE_SOURCE == "synth":
+            return SYNTH_PITCHES[min(attempt, len(SYNTH_PITCHES) - 1)]
+        return len(notes)
+
+    def play_sequence(sequence, speed=0.8, start_delay=1.0):
+        """
+        Play a sequence of notes `speed` seconds apart, starting after `start_delay` seconds.
+        Keeps drawing and handling events while the notes play; returns after the last one.
+        """
+        playback = audio.play_sequence([notes[index]['tone'] for index in sequence], speed,
+                                       start_delay=start_delay, tag="QuickAudio")
+        font = get_font(None, 36)
+        frames = FrameScheduler(idle=True)  # Woken by AUDIO_DONE_EVENT when the last note ends
+        while not playback.done:
+            surface.fill(BLACK)
+            if playback.notes_played:
+                render_centered_text(surface, f"Note {playback.notes_played} of {len(sequence)}", font, WHITE,
+                                     y_offset=0)
+            pygame.display.flip()
 
-    def play_sequence(sequence, speed=0.8):
-        """Play a sequence of notes with delay between tones."""
-        for index in sequence:
-            note = notes[index]
-            note['tone'].play()
-            time.sleep(speed)
-            note['tone'].stop()
+            for event in frames.events():
+                if event.type == pygame.QUIT:
+                    audio.cancel(playback)
+                    pygame.quit()
+                    sys.exit()
 
-    def generate_mcq(correct_sequence, num_choices=3):
-        """Generate MCQs with the correct sequence and incorrect ones."""
+    def generate_mcq(correct_sequence, num_pitches, num_choices=3):
+        """Generate MCQs with the correct sequence and incorrect ones, using the first num_pitches notes."""
         options = [correct_sequence]  # Start with the correct sequence
         while len(options) < num_choices:
-            random_sequence = random.sample(range(len(notes)), len(correct_sequence))
+            random_sequence = random.sample(range(num_pitches), len(correct_sequence))
             if random_sequence != correct_sequence and random_sequence not in options:
                 options.append(random_sequence)
         random.shuffle(options)
         return options
     
-    def render_text(surface, text, font, color, x, y, max_width):
-        """
-        Helper function to render text with word wrapping.
-        """
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-
-        for word in words:
-            if font.size(current_line + word)[0] <= max_width:
-                current_line += word + " "
-            else:
-                lines.append(current_line)
-                current_line = word + " "
-
-        if current_line:
-            lines.append(current_line)
-
-        for line in lines:
-            text_surface = font.render(line, True, color)
-            surface.blit(text_surface, (x, y))
-            y += font.get_linesize() + 5
 
     def render_centered_text(surface, text, font, color, y_offset):
         """Render text centered horizontally."""
-        text_surface = font.render(text, True, color)
+        text_surface = render_cached(font, text, True, color)
         x = (level_width - text_surface.get_width()) // 2
         y = (level_height // 2) + y_offset
         surface.blit(text_surface, (x, y))
 
     def get_player_selection(options, highlighted_index):
         """Display MCQs and return the selected option."""
-        font = pygame.font.Font(None, 36)
+        font = get_font(None, 36)
         selected_index = highlighted_index
 
+        frames = FrameScheduler(idle=True)  # Sleep until a key, blink or speech command arrives
+        subscription.skip()  # Drop blinks and commands made while the notes played
         while True:
             surface.fill(BLACK)
             for idx, option in enumerate(options):
@@ -109,7 +125,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
             pygame.display.flip()
 
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -122,30 +138,25 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                         return selected_index
                     
             # Blink Control
-            try:
-                blink_message = blink_queue.get_nowait()
+            for event in subscription.drain("blink"):
+                blink_message = event.value
                 if blink_message == "SINGLE_BLINK":
                     print("Single Blink Detected - Pygame")
                     selected_index = (selected_index + 1) % len(options)
                 elif blink_message == "DOUBLE_BLINK":
                     print("Double Blink Detected - Pygame")
                     return selected_index
-            except queue.Empty:
-                pass
             
             # Speech Control
-            try:
-                if not speech_queue.empty():
-                    command = speech_queue.get(block=False)
-                    print(f"Recognized command: {command}")
-                    if command == "down":
-                        selected_index = (selected_index + 1) % len(options)
-                    elif command == "up":
-                        selected_index = (selected_index - 1) % len(options)
-                    elif command == "select":
-                        return selected_index
-            except queue.Empty:
-                pass
+            for event in subscription.drain("speech"):
+                command = event.value
+                print(f"Recognized command: {command}")
+                if command == "down":
+                    selected_index = (selected_index + 1) % len(options)
+                elif command == "up":
+                    selected_index = (selected_index - 1) % len(options)
+                elif command == "select":
+                    return selected_index
                     
     def instruction_screen(surface, screen_width, screen_height):
         """
@@ -161,8 +172,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         BLACK = (0, 0, 0)
         RED = (255, 0, 0)
 
-        title_font = pygame.font.SysFont(None, 50)
-        text_font = pygame.font.SysFont(None, 30)
+        title_font = get_font(None, 50)
+        text_font = get_font(None, 30)
 
         # Instruction text
         instructions = (
@@ -173,11 +184,12 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         # Flag to keep the screen running
         running = True
 
+        frames = FrameScheduler(idle=True)  # Sleep until a key is pressed
         while running:
             surface.fill(WHITE)
 
             # Title
-            title_text = title_font.render("Game Instructions", True, BLUE)
+            title_text = render_cached(title_font, "Game Instructions", True, BLUE)
             surface.blit(title_text, (screen_width // 2 - title_text.get_width() // 2, 50))
 
             # Render each line of instructions
@@ -187,11 +199,11 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                 y_offset += text_font.get_linesize() + 20  # Adjust spacing between lines
 
             # Navigation instructions
-            nav_text = text_font.render("Press ENTER or CLICK to proceed.", True, RED)
+            nav_text = render_cached(text_font, "Press ENTER or CLICK to proceed.", True, RED)
             surface.blit(nav_text, (screen_width // 2 - nav_text.get_width() // 2, screen_height - 100))
 
             # Event Handling
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -220,18 +232,15 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     start_time = time.time()
 
     while running and attempts < max_attempts:
-        surface.fill(BLACK)
-        pygame.display.flip()
-        pygame.time.wait(1000)
-
         # Generate sequence
-        sequence = random.sample(range(len(notes)), level)
+        num_pitches = pitch_count(attempts)
+        sequence = random.sample(range(num_pitches), level)
 
-        # Play sequence
+        # Play sequence after a second of silence
         play_sequence(sequence)
 
         # Generate MCQs
-        mcq_options = generate_mcq(sequence)
+        mcq_options = generate_mcq(sequence, num_pitches)
         correct_index = mcq_options.index(sequence)
 
         # Get player's answer
@@ -254,12 +263,13 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
     # Final Stats
     surface.fill(BLACK)
-    font = pygame.font.Font(None, 36)
+    font = get_font(None, 36)
     final_text = f"Final Level Reached: {level - 3}"
     render_centered_text(surface, final_text, font, WHITE, y_offset=0)
     pygame.display.flip()
     pygame.time.wait(2000)
 
+    subscription.close()  # Stop receiving input events
     print("results: ", results, "time: ", end_time)
     return results, end_time
 
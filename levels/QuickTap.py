@@ -1,6 +1,8 @@
 import pygame
 import random
 import time
+from mods.frame_clock import FrameScheduler
+from mods.text import render_text, render_cached, get_font
 
 def run_game(surface, level_width, level_height, win_width, win_height, max_attempts_arg):
     """
@@ -29,31 +31,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     SPEED_INCREASE_RATE = 0.85  # Mole appear time decreases by this factor after each mole
 
     # Fonts
-    font = pygame.font.Font(None, 50)
-
-    def render_text(surface, text, font, color, x, y, max_width):
-        """
-        Helper function to render text with word wrapping.
-        """
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-
-        for word in words:
-            if font.size(current_line + word)[0] <= max_width:
-                current_line += word + " "
-            else:
-                lines.append(current_line)
-                current_line = word + " "
-
-        if current_line:
-            lines.append(current_line)
-
-        for line in lines:
-            text_surface = font.render(line, True, color)
-            surface.blit(text_surface, (x, y))
-            y += font.get_linesize() + 5
-
+    font = get_font(None, 50)
 
     def instruction_screen(surface, screen_width, screen_height):
         """
@@ -69,8 +47,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         BLACK = (0, 0, 0)
         RED = (255, 0, 0)
 
-        title_font = pygame.font.SysFont(None, 50)
-        text_font = pygame.font.SysFont(None, 30)
+        title_font = get_font(None, 50)
+        text_font = get_font(None, 30)
 
         # Instruction text
         instructions = (
@@ -82,11 +60,12 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         # Flag to keep the screen running
         running = True
 
+        frames = FrameScheduler(idle=True)  # Sleep until a key is pressed
         while running:
             surface.fill(WHITE)
 
             # Title
-            title_text = title_font.render("Game Instructions", True, BLUE)
+            title_text = render_cached(title_font, "Game Instructions", True, BLUE)
             surface.blit(title_text, (screen_width // 2 - title_text.get_width() // 2, 50))
 
             # Render each line of instructions
@@ -96,11 +75,11 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                 y_offset += text_font.get_linesize() + 20  # Adjust spacing between lines
 
             # Navigation instructions
-            nav_text = text_font.render("Press ENTER or CLICK to proceed.", True, RED)
+            nav_text = render_cached(text_font, "Press ENTER or CLICK to proceed.", True, RED)
             surface.blit(nav_text, (screen_width // 2 - nav_text.get_width() // 2, screen_height - 100))
 
             # Event Handling
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                 if event.type == pygame.KEYDOWN:
@@ -173,7 +152,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         if symbol is None and current_time >= next_mole_time:
             # Ensure mole doesn't spawn in the top reserved area (RESERVED_HEIGHT)
             symbol = random.choice(symbols)
-            render_text(surface, symbol, pygame.font.SysFont(None, 100), WHITE, 350, 200, 600)
+            render_text(surface, symbol, get_font(None, 100), WHITE, 350, 200, 600)
             mole_appeared_time = current_time
 
         # Remove mole if time exceeded
@@ -205,5 +184,5 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
 def render_text_simple(surface, text, font, color, x, y):
     """Helper function to render text to the Pygame surface."""
-    text_surface = font.render(text, True, color)
+    text_surface = render_cached(font, text, True, color)
     surface.blit(text_surface, (x, y))
\ No newline at end of file
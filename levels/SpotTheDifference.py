@@ -2,23 +2,59 @@ import pygame
 import random
 import sys
 import time
-import queue
-from mods.blink_detect import BlinkDetectionThread  # Assuming this is the same BlinkDetectionThread used in Level 2
-from mods.audio_detect import SpeechRecognitionThread  # Replace with your actual module name
+from mods.input_service import get_input_service
+from mods.assets import load_image
+from mods.frame_clock import FrameScheduler
+from mods.text import render_text, render_cached, get_font
+
+
+# Define questions, options, and correct answers. Every image is shown at IMAGE_SIZE
+QUESTIONS = [
+    {
+        "question_images": ["images/SpotTheDifference/11.png", "images/SpotTheDifference/12.png"],
+        "options": ["images/SpotTheDifference/1.jpg", "images/SpotTheDifference/3.jpg", "images/SpotTheDifference/4.jpg", "images/SpotTheDifference/6.jpg"],
+        "correct_index": 0
+    },
+    {
+        "question_images": ["images/SpotTheDifference/21.png", "images/SpotTheDifference/22.png"],
+        "options": ["images/SpotTheDifference/5.jpg", "images/SpotTheDifference/1.jpg", "images/SpotTheDifference/2.jpg", "images/SpotTheDifference/3.jpg"],
+        "correct_index": 2
+    },
+    {
+        "question_images": ["images/SpotTheDifference/31.png", "images/SpotTheDifference/32.png"],
+        "options": ["images/SpotTheDifference/6.jpg", "images/SpotTheDifference/2.jpg", "images/SpotTheDifference/4.jpg", "images/SpotTheDifference/3.jpg"],
+        "correct_index": 3
+    },
+    {
+        "question_images": ["images/SpotTheDifference/41.png", "images/SpotTheDifference/42.png"],
+        "options": ["images/SpotTheDifference/4.jpg", "images/SpotTheDifference/1.jpg", "images/SpotTheDifference/5.jpg", "images/SpotTheDifference/3.jpg"],
+        "correct_index": 0
+    },
+    {
+        "question_images": ["images/SpotTheDifference/51.png", "images/SpotTheDifference/52.png"],
+        "options": ["images/SpotTheDifference/2.jpg", "images/SpotTheDifference/5.jpg", "images/SpotTheDifference/6.jpg", "images/SpotTheDifference/4.jpg"],
+        "correct_index": 1
+    },
+    {
+        "question_images": ["images/SpotTheDifference/61.png", "images/SpotTheDifference/62.png"],
+        "options": ["images/SpotTheDifference/5.jpg", "images/SpotTheDifference/6.jpg", "images/SpotTheDifference/2.jpg", "images/SpotTheDifference/1.jpg"],
+        "correct_index": 1
+    },
+]
+
+IMAGE_SIZE = (150, 150)
+
+# Every image the level shows, with its display size (used by the asset bake step)
+IMAGE_ASSETS = [
+    (path, IMAGE_SIZE) for question in QUESTIONS for path in question["question_images"] + question["options"]
+]
 
 
 def run_game(surface, level_width, level_height, win_width, win_height, max_attempts_arg):
 
 
-    # Blink detection setup
-    blink_queue = queue.Queue(maxsize=10)
-    blink_thread = BlinkDetectionThread(blink_queue)
-    blink_thread.start()  # Start the blink detection thread
-
-    # speech detection setup
-    speech_queue = queue.Queue(maxsize=10)
-    speech_thread = SpeechRecognitionThread(audio_queue=speech_queue, language="english")
-    speech_thread.start()
+    # Blink and speech input from the session-wide input service
+    subscription = get_input_service().subscribe(("blink", "speech"))
 
 
     # Colors
@@ -29,48 +65,16 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     BLUE = (0, 0, 255)
 
     # Fonts
-    FONT = pygame.font.Font(None, 48)
-
-    # Define questions, options, and correct answers
-    # Define questions, options, and correct answers
-    questions = [
-        {
-            "question_images": ["images/SpotTheDifference/11.png", "images/SpotTheDifference/12.png"],
-            "options": ["images/SpotTheDifference/1.jpg", "images/SpotTheDifference/3.jpg", "images/SpotTheDifference/4.jpg", "images/SpotTheDifference/6.jpg"],
-            "correct_index": 0
-        },
-        {
-            "question_images": ["images/SpotTheDifference/21.png", "images/SpotTheDifference/22.png"],
-            "options": ["images/SpotTheDifference/5.jpg", "images/SpotTheDifference/1.jpg", "images/SpotTheDifference/2.jpg", "images/SpotTheDifference/3.jpg"],
-            "correct_index": 2
-        },
-        {
-            "question_images": ["images/SpotTheDifference/31.png", "images/SpotTheDifference/32.png"],
-            "options": ["images/SpotTheDifference/6.jpg", "images/SpotTheDifference/2.jpg", "images/SpotTheDifference/4.jpg", "images/SpotTheDifference/3.jpg"],
-            "correct_index": 3
-        },
-        {
-            "question_images": ["images/SpotTheDifference/41.png", "images/SpotTheDifference/42.png"],
-            "options": ["images/SpotTheDifference/4.jpg", "images/SpotTheDifference/1.jpg", "images/SpotTheDifference/5.jpg", "images/SpotTheDifference/3.jpg"],
-            "correct_index": 0
-        },
-        {
-            "question_images": ["images/SpotTheDifference/51.png", "images/SpotTheDifference/52.png"],
-            "options": ["images/SpotTheDifference/2.jpg", "images/SpotTheDifference/5.jpg", "images/SpotTheDifference/6.jpg", "images/SpotTheDifference/4.jpg"],
-            "correct_index": 1
-        },
-        {
-            "question_images": ["images/SpotTheDifference/61.png", "images/SpotTheDifference/62.png"],
-            "options": ["images/SpotTheDifference/5.jpg", "images/SpotTheDifference/6.jpg", "images/SpotTheDifference/2.jpg", "images/SpotTheDifference/1.jpg"],
-            "correct_index": 1
-        },
-    ]
+    FONT = get_font(None, 48)
+
+    # Questions, options, and correct answers (defined at module level)
+    questions = [dict(question) for question in QUESTIONS]
 
     random.shuffle(questions)   
 
     def load_images(image_paths):
         try:
-            return [pygame.transform.scale(pygame.image.load(path), (150, 150)) for path in image_paths]
+            return [load_image(path, IMAGE_SIZE) for path in image_paths]
         except FileNotFoundError as e:
             print(f"Error loading images: {e}")
             sys.exit()
@@ -79,31 +83,6 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         q["question_images"] = load_images(q["question_images"])
         q["options"] = load_images(q["options"])
 
-    
-    def render_text(surface, text, font, color, x, y, max_width):
-        """
-        Helper function to render text with word wrapping.
-        """
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-
-        for word in words:
-            if font.size(current_line + word)[0] <= max_width:
-                current_line += word + " "
-            else:
-                lines.append(current_line)
-                current_line = word + " "
-
-        if current_line:
-            lines.append(current_line)
-
-        for line in lines:
-            text_surface = font.render(line, True, color)
-            surface.blit(text_surface, (x, y))
-            y += font.get_linesize() + 5
-
-
     def render_question(surface, question):
         """Display the current question images forming the analogy."""
         image_positions = [(225, 50), (225, 50)]
@@ -149,8 +128,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             BLACK = (0, 0, 0)
             RED = (255, 0, 0)
 
-            title_font = pygame.font.SysFont(None, 50)
-            text_font = pygame.font.SysFont(None, 30)
+            title_font = get_font(None, 50)
+            text_font = get_font(None, 30)
 
             # Instruction text
             instructions = (
@@ -164,11 +143,12 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             # Flag to keep the screen running
             running = True
 
+            frames = FrameScheduler(idle=True)  # Sleep until a key is pressed
             while running:
                 surface.fill(WHITE)
 
                 # Title
-                title_text = title_font.render("Game Instructions", True, BLUE)
+                title_text = render_cached(title_font, "Game Instructions", True, BLUE)
                 surface.blit(title_text, (screen_width // 2 - title_text.get_width() // 2, 50))
 
                 # Render each line of instructions
@@ -178,11 +158,11 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                     y_offset += text_font.get_linesize() + 20  # Adjust spacing between lines
 
                 # Navigation instructions
-                nav_text = text_font.render("Press ENTER to proceed.", True, RED)
+                nav_text = render_cached(text_font, "Press ENTER to proceed.", True, RED)
                 surface.blit(nav_text, (screen_width // 2 - nav_text.get_width() // 2, screen_height - 100))
 
                 # Event Handling
-                for event in pygame.event.get():
+                for event in frames.events():
                     if event.type == pygame.QUIT:
                         pygame.quit()
                         sys.exit()
@@ -209,6 +189,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     clock = pygame.time.Clock()
     start_time = time.time()
 
+    subscription.skip()  # Drop blinks and commands made while reading the instructions
     while running:
         surface.fill(WHITE)
 
@@ -223,8 +204,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
 
             # Blink Control
-            try:
-                blink_message = blink_queue.get_nowait()
+            for event in subscription.drain("blink"):
+                blink_message = event.value
                 if blink_message == "SINGLE_BLINK":
                     print("Single Blink Detected - Pygame")
                     selected_option = (selected_option + 1) % 4
@@ -240,20 +221,18 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                         game_state = "question"
                     else:
                         running = False
-            except queue.Empty:
-                pass
+                    break  # Later blinks belonged to the answered question
             
             # Speech Control
-            try:
-                if not speech_queue.empty():
-                    command = speech_queue.get(block=False)
-                    print(f"Recognized command: {command}")
-                    if command == "next":
-                        selected_option = (selected_option + 1) % 4
-                    elif command == "revious":
-                        selected_option = (selected_option - 1) % 4
-                    elif command == "select":
-                        is_correct = check_answer(selected_option, questions[attempts])
+            for event in subscription.drain("speech"):
+                command = event.value
+                print(f"Recognized command: {command}")
+                if command == "next":
+                    selected_option = (selected_option + 1) % 4
+                elif command == "previous":
+                    selected_option = (selected_option - 1) % 4
+                elif command == "select":
+                    is_correct = check_answer(selected_option, questions[attempts])
                     if is_correct:
                         results[attempts] = weights[attempts]
 
@@ -263,8 +242,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                         game_state = "question"
                     else:
                         running = False
-            except queue.Empty:
-                pass
+                    break  # Later commands belonged to the answered question
 
 
 
@@ -296,4 +274,5 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
     end_time = time.time()-start_time
 
+    subscription.close()  # Stop receiving input events
     return results, end_time
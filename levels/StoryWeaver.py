@@ -2,10 +2,28 @@ import pygame
 import sys
 import random
 import time
-import json
-import queue
-from mods.blink_detect import BlinkDetectionThread  # Assuming this is the same BlinkDetectionThread used in Level 2
-from mods.audio_detect import SpeechRecognitionThread  # Replace with your actual module name
+from mods.input_service import get_input_service
+from mods.assets import load_json, load_font, warm_file
+from mods.frame_clock import FrameScheduler
+from mods.audio_scheduler import get_audio_scheduler
+from mods.text import render_text, render_cached, get_font
+
+STORIES_PATH = "data/level3_stories.json"
+HINDI_FONT_PATH = 'fonts/Nirmala.ttf'
+FONT_SIZE = 24
+
+# Read ahead by the level prefetcher, loaded when the level starts
+JSON_ASSETS = [STORIES_PATH]
+FONT_ASSETS = [(HINDI_FONT_PATH, 20), (HINDI_FONT_PATH, FONT_SIZE), (None, FONT_SIZE)]
+
+
+def prefetch():
+    """Read the narration files once so streaming them does not wait on the disk."""
+    for story in load_json(STORIES_PATH):
+        try:
+            warm_file(story["audio"])
+        except OSError:
+            pass  # Reported when the narration is played
 
 
 def run_game(surface, level_width, level_height, win_width, win_height, max_attempts_arg):
@@ -13,62 +31,20 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     Runs the entire game with language selection, story display, audio playback, and questions.
     """
 
-    # Blink detection setup
-    blink_queue = queue.Queue(maxsize=10)
-    blink_thread = BlinkDetectionThread(blink_queue)
-    blink_thread.start()  # Start the blink detection thread
-
-    # speech detection setup
-    speech_queue = queue.Queue(maxsize=10)
-    speech_thread = SpeechRecognitionThread(audio_queue=speech_queue, language="english")
-    speech_thread.start()
+    # Blink and speech input from the session-wide input service
+    subscription = get_input_service().subscribe(("blink", "speech"))
 
 
     # Load the JSON file
     def load_stories(file_path):
-        with open(file_path, "r", encoding="utf-8") as file:
-            return json.load(file)
+        return load_json(file_path)
 
     def play_audio(audio):
         """
-        Play the audio narration of the story.
+        Start streaming the audio narration of the story and return its Playback straight
+        away; the story screen stays responsive while it plays.
         """
-        try:
-            pygame.mixer.init()
-            pygame.mixer.music.load(audio)
-            pygame.mixer.music.play()
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)  # Wait for the audio to finish
-        except pygame.error as e:
-            print(f"Error loading audio: {e}")
-
-    def render_text(surface, text, font, color, x, y, max_width):
-        """
-        Helper function to render text with word wrapping.
-        """
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-
-        for word in words:
-            if font.size(current_line + word)[0] <= max_width:
-                current_line += word + " "
-            else:
-                lines.append(current_line)
-                current_line = word + " "
-
-        if current_line:
-            lines.append(current_line)
-
-        text_rects = []
-        for line in lines:
-            text_surface = font.render(line, True, color)
-            rect = surface.blit(text_surface, (x, y))
-            text_rects.append(rect)
-            y += font.get_linesize() + 5
-
-        return text_rects  # Return rectangles of rendered text for interaction
-
+        return get_audio_scheduler().play_music(audio, tag="StoryWeaver")
 
     def language_selection(surface, win_width, win_height):
         """Display a language selection screen with mouse and keyboard functionality, accounting for subsurface offsets."""
@@ -76,13 +52,13 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         WHITE = (255, 255, 255)
         BLACK = (0, 0, 0)
         HIGHLIGHT_COLOR = (200, 200, 200)  # Light gray for highlighting
-        font = pygame.font.Font('fonts/Nirmala.ttf', 20)
+        font = load_font(HINDI_FONT_PATH, 20)
 
         surface.fill(WHITE)
 
         # Render text
-        text_hindi = font.render("1. हिंदी", True, BLACK)
-        text_english = font.render("2. English", True, BLACK)
+        text_hindi = render_cached(font, "1. हिंदी", True, BLACK)
+        text_english = render_cached(font, "2. English", True, BLACK)
         text_hindi_rect = text_hindi.get_rect(center=(win_width // 2, win_height // 3))
         text_english_rect = text_english.get_rect(center=(win_width // 2, win_height // 3 + 60))
 
@@ -106,6 +82,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
             pygame.display.update()
 
+        frames = FrameScheduler(idle=True)  # Redraw only on key presses and mouse movement
         while selected_language is None:
             # Get mouse position
             mouse_pos = pygame.mouse.get_pos()
@@ -119,7 +96,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
             draw_screen(mouse_over_hindi, mouse_over_english)
 
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -152,8 +129,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         BLACK = (0, 0, 0)
         RED = (255, 0, 0)
 
-        title_font = pygame.font.SysFont(None, 50)
-        text_font = pygame.font.SysFont(None, 30)
+        title_font = get_font(None, 50)
+        text_font = get_font(None, 30)
 
         # Instruction text
         instructions = (
@@ -166,11 +143,12 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         # Flag to keep the screen running
         running = True
 
+        frames = FrameScheduler(idle=True)  # Sleep until a key is pressed
         while running:
             surface.fill(WHITE)
 
             # Title
-            title_text = title_font.render("Game Instructions", True, BLUE)
+            title_text = render_cached(title_font, "Game Instructions", True, BLUE)
             surface.blit(title_text, (screen_width // 2 - title_text.get_width() // 2, 50))
 
             # Render each line of instructions
@@ -180,11 +158,11 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                 y_offset += text_font.get_linesize() + 20  # Adjust spacing between lines
 
             # Navigation instructions
-            nav_text = text_font.render("Press ENTER to proceed.", True, RED)
+            nav_text = render_cached(text_font, "Press ENTER to proceed.", True, RED)
             surface.blit(nav_text, (screen_width // 2 - nav_text.get_width() // 2, screen_height - 100))
 
             # Event Handling
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                 # if any mouse button is pressed, proceed to the next screen
@@ -202,16 +180,15 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     BLACK = (0, 0, 0)
 
     # Fonts
-    FONT_SIZE = 24
-    hindi_font = pygame.font.Font('fonts/Nirmala.ttf', FONT_SIZE)
-    english_font = pygame.font.Font(None, FONT_SIZE)
+    hindi_font = load_font(HINDI_FONT_PATH, FONT_SIZE)
+    english_font = load_font(None, FONT_SIZE)
     
     instruction_screen(surface, win_width, win_height)
 
     # Language Selection
     selected_language = language_selection(surface, win_width, win_height)
 
-    stories = load_stories("data/level3_stories.json")
+    stories = load_stories(STORIES_PATH)
 
     # Filter stories by selected language
     selected_stories = [story for story in stories if story["language"] == selected_language]
@@ -245,22 +222,24 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
         surface.fill(WHITE)
         render_text(surface, title, font, BLACK, 50, 50, level_width - 100)
         render_text(surface, content, font, BLACK, 50, 100, level_width - 100)
-        continue_text = font.render("Press Enter to continue...", True, BLACK)
+        continue_text = render_cached(font, "Press Enter to continue...", True, BLACK)
         surface.blit(continue_text, (50, level_height - 50))
         pygame.display.update()
 
         # Play audio narration
-        # play_audio(audio)
+        narration = play_audio(audio)
 
-        # Wait for user to proceed after audio playback
+        # Wait for user to proceed, during or after the narration
         story_read = False
+        frames = FrameScheduler(idle=True)  # Sleep until Enter is pressed
         while not story_read:
-            for event in pygame.event.get():
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
                     story_read = True
+        get_audio_scheduler().cancel(narration)  # Stop the narration if it is still playing
 
         # Clear the screen before showing questions
         surface.fill(WHITE)
@@ -280,6 +259,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             # Initialize hovered_option before the loop
             hovered_option = None  # Tracks the currently highlighted option (None if no option is hovered)
 
+            frames = FrameScheduler(idle=True)  # Sleep until input arrives
+            subscription.skip()  # Drop blinks and commands made before this question
             while True:
                 # Clear the surface once
                 surface.fill(WHITE)
@@ -332,8 +313,8 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                 pygame.display.update()
 
                 # Handle events - Blink detection
-                try:
-                    blink_message = blink_queue.get_nowait()
+                for event in subscription.drain("blink"):
+                    blink_message = event.value
                     if blink_message == "SINGLE_BLINK":
                         print("Single Blink Detected")
                         if hovered_option is None:
@@ -351,41 +332,40 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                             questions_score = questions_score + 0
                         current_question += 1
                         break
-                except queue.Empty:
-                    pass
+                if selected_option != -1:
+                    break  # Answer submitted by blink
 
 
                 # Handle events - Speech detection
-                try:
-                    if not speech_queue.empty():
-                        command = speech_queue.get(block=False)
-                        print(f"Recognized command: {command}")
-                        if command == "down":
-                            if hovered_option is None:
-                                hovered_option = 0  # Default to the first option if none is highlighted
-                            else:
-                                hovered_option = (hovered_option + 1) % len(question["options"])  # Move to next option
-                        elif command == "up":
-                            if hovered_option is None:
-                                hovered_option = 0  # Default to the first option if none is highlighted
-                            else:
-                                hovered_option = (hovered_option - 1) % len(question["options"])  # Move to next option
-                        elif command == "select" and hovered_option is not None:
-                            selected_option = hovered_option  # Select the current option
-                            time_taken = time.time() - start_time
-                            is_correct = question["options"][selected_option] == question["answer"]
-                            if is_correct:
-                                questions_score = questions_score + ques_weights[story_attempts]
-                            else:
-                                questions_score = questions_score + 0
-                            current_question += 1
-                            break
-                except queue.Empty:
-                    pass
+                for event in subscription.drain("speech"):
+                    command = event.value
+                    print(f"Recognized command: {command}")
+                    if command == "down":
+                        if hovered_option is None:
+                            hovered_option = 0  # Default to the first option if none is highlighted
+                        else:
+                            hovered_option = (hovered_option + 1) % len(question["options"])  # Move to next option
+                    elif command == "up":
+                        if hovered_option is None:
+                            hovered_option = 0  # Default to the first option if none is highlighted
+                        else:
+                            hovered_option = (hovered_option - 1) % len(question["options"])  # Move to next option
+                    elif command == "select" and hovered_option is not None:
+                        selected_option = hovered_option  # Select the current option
+                        time_taken = time.time() - start_time
+                        is_correct = question["options"][selected_option] == question["answer"]
+                        if is_correct:
+                            questions_score = questions_score + ques_weights[story_attempts]
+                        else:
+                            questions_score = questions_score + 0
+                        current_question += 1
+                        break
+                if selected_option != -1:
+                    break  # Answer submitted by speech
 
                 
                 # Handle events - Keyboard and Mouse
-                for event in pygame.event.get():
+                for event in frames.events():
                     if event.type == pygame.QUIT:
                         pygame.quit()
                         sys.exit()
@@ -439,6 +419,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
     end_time = time.time()-start_time
 
+    subscription.close()  # Stop receiving input events
     print("Results:", results, end_time)
     return results, end_time
     # return [0,3,5], end_time
\ No newline at end of file
@@ -1,5 +1,8 @@
 import pygame
 import global_data
+from mods.ui import Screen, Label, Box
+from mods.frame_clock import FrameScheduler
+from mods.text import get_font
 
 
 
@@ -14,9 +17,9 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
     GREEN = (0, 255, 0)
 
     # Fonts (Reduced sizes)
-    TITLE_FONT = pygame.font.Font(None, 36)
-    LABEL_FONT = pygame.font.Font(None, 24)
-    INPUT_FONT = pygame.font.Font(None, 20)
+    TITLE_FONT = get_font(None, 36)
+    LABEL_FONT = get_font(None, 24)
+    INPUT_FONT = get_font(None, 20)
 
     # Input fields (organized in two columns)
     input_fields = {
@@ -42,43 +45,28 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
 
     submit_button = pygame.Rect(level_width // 2 - 100, level_height - 70, 200, 50)
 
+    # Build the screen once; only input boxes whose text changes are redrawn
+    screen = Screen(surface, WHITE)
+    screen.add(Label("Basic Details", TITLE_FONT, BLACK, (level_width // 2, 20), anchor="midtop"))
+    for key, field in input_fields.items():
+        col_x = padding_x + field["col"] * column_width
+        row_y = 100 + field["row"] * row_height
+
+        # Label and input box
+        screen.add(Label(field["label"], LABEL_FONT, BLACK, (col_x, row_y - 25)))
+        field["rect"] = pygame.Rect(col_x, row_y, input_box_width, input_box_height)  # For interaction
+        field["box"] = screen.add(Box(field["rect"], GRAY, field["value"], INPUT_FONT, BLACK))
+    screen.add(Box(submit_button, GREEN, "Submit", LABEL_FONT, WHITE, text_offset=(70, 18)))
+
     # Main loop
     running = True
     inputs_collected = False
     collected_data = {}
 
+    frames = FrameScheduler(idle=True)  # Nothing moves until a key or click
     while running:
-        surface.fill(WHITE)
-
-        # Draw title
-        title_surface = TITLE_FONT.render("Basic Details", True, BLACK)
-        surface.blit(title_surface, (level_width // 2 - title_surface.get_width() // 2, 20))
-
-        # Draw input fields
-        for key, field in input_fields.items():
-            col_x = padding_x + field["col"] * column_width
-            row_y = 100 + field["row"] * row_height
-
-            # Draw label
-            label_surface = LABEL_FONT.render(field["label"], True, BLACK)
-            surface.blit(label_surface, (col_x, row_y - 25))
-
-            # Draw input box
-            input_rect = pygame.Rect(col_x, row_y, input_box_width, input_box_height)
-            pygame.draw.rect(surface, GRAY, input_rect)
-            value_surface = INPUT_FONT.render(field["value"], True, BLACK)
-            surface.blit(value_surface, (input_rect.x + 5, input_rect.y + 5))
-
-            # Save the rect for interaction
-            field["rect"] = input_rect
-
-        # Draw submit button
-        pygame.draw.rect(surface, GREEN, submit_button)
-        submit_text = LABEL_FONT.render("Submit", True, WHITE)
-        surface.blit(submit_text, (submit_button.x + 70, submit_button.y + 18))
-
         # Event handling
-        for event in pygame.event.get():
+        for event in frames.events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 return None  # Exit the game loop entirely
@@ -114,6 +102,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
                             field["active"] = False
                         else:
                             field["value"] += event.unicode
+                        field["box"].set(text=field["value"])
 
         if inputs_collected:
             # Collect data from all fields
@@ -125,7 +114,7 @@ def run_game(surface, level_width, level_height, win_width, win_height, max_atte
             
             running = False  # Exit the loop after collecting data
 
-        pygame.display.update()
+        screen.render()
 
     # Return the collected data
     return [0,0,0], 0.0
\ No newline at end of file
@@ -2,6 +2,12 @@ import os
 import csv
 import pygame
 import game_engine  # Import the game engine
+from mods.input_service import start_input_service, get_input_service
+from mods.blink_calibration import BlinkCalibrator
+from mods.ui import Screen, Label, Box
+from mods.frame_clock import FrameScheduler
+from mods.text import render_cached, get_font
+from mods.metrics import get_metrics, instrument_display
 import json
 import matplotlib.pyplot as plt
 import numpy as np
@@ -14,6 +20,7 @@ pygame.init()
 # Screen dimensions
 WIDTH, HEIGHT = 800, 600
 GAME_HEIGHT = 500
+SPEECH_LANGUAGE = "english"  # Speech commands for the whole session; only this model is loaded
 
 # Colors
 WHITE = (255, 255, 255)
@@ -24,8 +31,8 @@ BLUE = (173, 216, 230)
 RED = (255, 0, 0)
 
 # Fonts
-FONT = pygame.font.Font(None, 36)
-TITLE_FONT = pygame.font.Font(None, 48)
+FONT = get_font(None, 36)
+TITLE_FONT = get_font(None, 48)
 
 # Global state
 player_name = ""
@@ -83,7 +90,8 @@ def save_game_result(attempt_data, overall_score, attempt_number, radar_image_pa
         "Attempt": attempt_number,
         "Overall Score": overall_score,
         "Radar Image": radar_image_path,
-        "Data": attempt_data  # Store the complete JSON data for this attempt
+        "Data": attempt_data,  # Store the complete JSON data for this attempt
+        "Metrics": get_metrics().summary()  # Frame times, input latency and queue depths per level
     }
 
     # Add to attempts list
@@ -95,6 +103,50 @@ def save_game_result(attempt_data, overall_score, attempt_number, radar_image_pa
     print(f"Game result saved to JSON file: {json_file_path}")
 
 
+def load_blink_calibration():
+    """
+    Returns the blink calibration stored in the player's JSON file, or None.
+    """
+    try:
+        with open(json_file_path, mode="r") as json_file:
+            return json.load(json_file).get("blink_calibration")
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def save_blink_calibration(calibration):
+    """
+    Stores the blink calibration in the player's JSON file, next to the attempts.
+    """
+    with open(json_file_path, mode="r") as json_file:
+        try:
+            data = json.load(json_file)
+        except json.JSONDecodeError:
+            data = {"attempts": []}
+
+    data["blink_calibration"] = calibration
+
+    with open(json_file_path, mode="w") as json_file:
+        json.dump(data, json_file, indent=4)
+    print(f"Blink calibration saved to JSON file: {json_file_path}")
+
+
+def apply_blink_calibration(calibrator):
+    """
+    Uses this session's blink calibration if it finished (and saves it for next time),
+    otherwise the one stored in the player's profile. Without either the defaults stay.
+    """
+    if calibrator.ready():
+        calibration = calibrator.to_dict()
+        save_blink_calibration(calibration)
+    else:
+        calibration = load_blink_calibration()
+
+    if calibration:
+        get_input_service().set_blink_thresholds(calibration["high"], calibration["low"])
+        print(f"Blink thresholds: high {calibration['high']}, low {calibration['low']}")
+
+
 
 def generate_radar_plot(scores, output_path):
     """
@@ -211,6 +263,10 @@ def calculate_cognitive_scores(json_file_path):
     return aggregated_scores, radar_image_path
 
 
+# Paces the end screen, which main() redraws until the window is closed
+end_screen_frames = FrameScheduler(idle=True)
+
+
 def draw_end_screen(screen, cognitive_scores, radar_image_path):
     """
     Displays the end screen with smaller text on the left and a larger radar plot on the right.
@@ -221,21 +277,21 @@ def draw_end_screen(screen, cognitive_scores, radar_image_path):
     screen.fill(WHITE)
 
     # Adjusted fonts for smaller text
-    small_font = pygame.font.Font(None, 24)
-    title_font = pygame.font.Font(None, 50)
+    small_font = get_font(None, 24)
+    title_font = get_font(None, 50)
 
     # Title centered at the top
-    title_surface = title_font.render("Game Over!", True, BLACK)
+    title_surface = render_cached(title_font, "Game Over!", True, BLACK)
     screen.blit(title_surface, (WIDTH // 2 - title_surface.get_width() // 2, 20))
 
     # Display final score on the left
-    score_surface = small_font.render(f"Final Score: {current_score}", True, BLACK)
+    score_surface = render_cached(small_font, f"Final Score: {current_score}", True, BLACK)
     screen.blit(score_surface, (30, 100))
 
     # Display cognitive scores on the left side with smaller font
     y_offset = 140
     for key, value in cognitive_scores.items():
-        score_text = small_font.render(f"{key}: {value}", True, BLACK)
+        score_text = render_cached(small_font, f"{key}: {value}", True, BLACK)
         screen.blit(score_text, (30, y_offset))
         y_offset += 30
 
@@ -260,11 +316,11 @@ def draw_end_screen(screen, cognitive_scores, radar_image_path):
         screen.blit(radar_image, (radar_x, radar_y))
     except Exception as e:
         # Display an error message if the image cannot be loaded
-        error_surface = small_font.render("Error loading radar image!", True, RED)
+        error_surface = render_cached(small_font, "Error loading radar image!", True, RED)
         screen.blit(error_surface, (WIDTH - 30 - error_surface.get_width(), 100))
 
     # Event Handling
-    for event in pygame.event.get():
+    for event in end_screen_frames.events():
         if event.type == pygame.QUIT:
             pygame.quit()
             exit()
@@ -303,126 +359,131 @@ def draw_main_menu(screen):
 
     # Clock for controlling video playback speed
     clock = pygame.time.Clock()
+    # The menu itself sleeps until a key, click or blink arrives
+    frames = FrameScheduler(idle=True)
+
+    # Learn the player's eye-ratio thresholds while they fill in the form
+    input_service = get_input_service()
+    input_service.set_blink_state_interval(0)  # Eye ratio on every processed frame
+    blink_subscription = input_service.subscribe(("blink_state",))
+    calibrator = BlinkCalibrator()
+
+    # Menu widgets, built once; typing or calibration progress only redraws what changed
+    menu = Screen(screen, WHITE)
+    menu.add(Label("Welcome to the Game Hub", TITLE_FONT, BLACK, (WIDTH // 2, 50), anchor="midtop"))
+    calibration_label = menu.add(Label("", FONT, GRAY, (WIDTH // 2, 120), anchor="midtop"))
+    menu.add(Label("Name:", FONT, BLACK, (200, 210)))
+    menu.add(Label("Age:", FONT, BLACK, (200, 310)))
+    name_box = menu.add(Box(name_rect, GRAY, player_name, FONT, BLACK, text_offset=(10, 10)))
+    age_box = menu.add(Box(age_rect, GRAY, player_age, FONT, BLACK, text_offset=(10, 10)))
+    menu.add(Box(start_button, BLACK, "Start", FONT, WHITE, text_offset=(10, 10)))
+    menu.add(Box(video_button, BLUE, "Watch Instructions", FONT, WHITE, text_offset=None))
 
-    while game_state == "MAIN_MENU":
-        if showing_video:
-            if video_capture and video_capture.isOpened():
-                # Grab the next frame from the video
-                ret, frame = video_capture.read()
-                if not ret:
-                    # If no frame is returned, video is done or error occurred
-                    showing_video = False
-                    video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Restart video
-                    continue
-
-                # Calculate the aspect ratio and scale factor
-                video_aspect_ratio = video_original_width / video_original_height
-                screen_aspect_ratio = WIDTH / HEIGHT
-                if video_aspect_ratio > screen_aspect_ratio:
-                    scale_factor = WIDTH / video_original_width
-                else:
-                    scale_factor = HEIGHT / video_original_height
-
-                # Resize the frame while maintaining aspect ratio
-                new_width = int(video_original_width * scale_factor)
-                new_height = int(video_original_height * scale_factor)
-                frame = cv2.resize(frame, (new_width, new_height))
-
-                # Convert the frame to a Pygame Surface
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)  # Convert color to RGB
-                frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-
-                # Center the frame on the screen
-                frame_x = (WIDTH - new_width) // 2
-                frame_y = (HEIGHT - new_height) // 2
-                screen.blit(frame_surface, (frame_x, frame_y))
-
-            # Display the skip button
-            skip_button = pygame.Rect(WIDTH - 120, HEIGHT - 50, 100, 40)
-            pygame.draw.rect(screen, RED, skip_button)
-            skip_text = FONT.render("Skip", True, WHITE)
-            screen.blit(skip_text, (skip_button.x + 10, skip_button.y + 5))
-
-            for event in pygame.event.get():
+    try:
+        while game_state == "MAIN_MENU":
+            for event in blink_subscription.drain():
+                if event.source == "blink_state":
+                    calibrator.add(event.value["ratio"])
+
+            if showing_video:
+                if video_capture and video_capture.isOpened():
+                    # Grab the next frame from the video
+                    ret, frame = video_capture.read()
+                    if not ret:
+                        # If no frame is returned, video is done or error occurred
+                        showing_video = False
+                        video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Restart video
+                        menu.invalidate()  # The video covered the menu
+                        continue
+
+                    # Calculate the aspect ratio and scale factor
+                    video_aspect_ratio = video_original_width / video_original_height
+                    screen_aspect_ratio = WIDTH / HEIGHT
+                    if video_aspect_ratio > screen_aspect_ratio:
+                        scale_factor = WIDTH / video_original_width
+                    else:
+                        scale_factor = HEIGHT / video_original_height
+
+                    # Resize the frame while maintaining aspect ratio
+                    new_width = int(video_original_width * scale_factor)
+                    new_height = int(video_original_height * scale_factor)
+                    frame = cv2.resize(frame, (new_width, new_height))
+
+                    # Convert the frame to a Pygame Surface
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)  # Convert color to RGB
+                    frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
+
+                    # Center the frame on the screen
+                    frame_x = (WIDTH - new_width) // 2
+                    frame_y = (HEIGHT - new_height) // 2
+                    screen.blit(frame_surface, (frame_x, frame_y))
+
+                # Display the skip button
+                skip_button = pygame.Rect(WIDTH - 120, HEIGHT - 50, 100, 40)
+                pygame.draw.rect(screen, RED, skip_button)
+                skip_text = render_cached(FONT, "Skip", True, WHITE)
+                screen.blit(skip_text, (skip_button.x + 10, skip_button.y + 5))
+
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        exit()
+                    if event.type == pygame.MOUSEBUTTONDOWN:
+                        if skip_button.collidepoint(event.pos):
+                            showing_video = False
+
+                pygame.display.update()
+                clock.tick(video_fps)  # Limit to video FPS
+                if not showing_video:
+                    menu.invalidate()  # Skipped: the video covered the menu
+                continue
+
+            # Event Handling
+            for event in frames.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if skip_button.collidepoint(event.pos):
-                        showing_video = False
-
-            pygame.display.update()
-            clock.tick(video_fps)  # Limit to video FPS
-            continue
 
-        screen.fill(WHITE)
-
-        # Title
-        title_surface = TITLE_FONT.render("Welcome to the Game Hub", True, BLACK)
-        screen.blit(title_surface, (WIDTH // 2 - title_surface.get_width() // 2, 50))
-
-        # Labels for Name and Age
-        name_label = FONT.render("Name:", True, BLACK)
-        age_label = FONT.render("Age:", True, BLACK)
-        screen.blit(name_label, (200, 210))
-        screen.blit(age_label, (200, 310))
-
-        # Player Name Input
-        pygame.draw.rect(screen, GRAY, name_rect)
-        name_text = FONT.render(player_name, True, BLACK)
-        screen.blit(name_text, (name_rect.x + 10, name_rect.y + 10))
-
-        # Player Age Input
-        pygame.draw.rect(screen, GRAY, age_rect)
-        age_text = FONT.render(player_age, True, BLACK)
-        screen.blit(age_text, (age_rect.x + 10, age_rect.y + 10))
-
-        # Start Button
-        pygame.draw.rect(screen, BLACK, start_button)
-        start_text = FONT.render("Start", True, WHITE)
-        screen.blit(start_text, (start_button.x + 10, start_button.y + 10))
-
-        # Instructional Video Button
-        pygame.draw.rect(screen, BLUE, video_button)
-        video_text = FONT.render("Watch Instructions", True, WHITE)
-        text_x = video_button.x + (video_button.width - video_text.get_width()) // 2
-        text_y = video_button.y + (video_button.height - video_text.get_height()) // 2
-        screen.blit(video_text, (text_x, text_y))
-
-        # Event Handling
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                x, y = event.pos
-                if name_rect.collidepoint(x, y):
-                    input_active["name"] = True
-                    input_active["age"] = False
-                elif age_rect.collidepoint(x, y):
-                    input_active["name"] = False
-                    input_active["age"] = True
-                elif start_button.collidepoint(x, y):
-                    if player_name and player_age.isdigit():
-                        setup_player_folder_and_json(player_name)
-                        game_state = "GAMEPLAY"
-                elif video_button.collidepoint(x, y):
-                    showing_video = True
-
-            if event.type == pygame.KEYDOWN:
-                if input_active["name"]:
-                    if event.key == pygame.K_BACKSPACE:
-                        player_name = player_name[:-1]
-                    else:
-                        player_name += event.unicode
-                elif input_active["age"]:
-                    if event.key == pygame.K_BACKSPACE:
-                        player_age = player_age[:-1]
-                    elif event.unicode.isdigit():
-                        player_age += event.unicode
-
-        pygame.display.update()
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    x, y = event.pos
+                    if name_rect.collidepoint(x, y):
+                        input_active["name"] = True
+                        input_active["age"] = False
+                    elif age_rect.collidepoint(x, y):
+                        input_active["name"] = False
+                        input_active["age"] = True
+                    elif start_button.collidepoint(x, y):
+                        if player_name and player_age.isdigit():
+                            setup_player_folder_and_json(player_name)
+                            apply_blink_calibration(calibrator)
+                            game_state = "GAMEPLAY"
+                    elif video_button.collidepoint(x, y):
+                        showing_video = True
+
+                if event.type == pygame.KEYDOWN:
+                    if input_active["name"]:
+                        if event.key == pygame.K_BACKSPACE:
+                            player_name = player_name[:-1]
+                        else:
+                            player_name += event.unicode
+                    elif input_active["age"]:
+                        if event.key == pygame.K_BACKSPACE:
+                            player_age = player_age[:-1]
+                        elif event.unicode.isdigit():
+                            player_age += event.unicode
+
+            # Blink calibration progress
+            if calibrator.ready():
+                calibration_label.set(text="Blink calibration done")
+            else:
+                calibration_label.set(text="Please look at the screen and blink a few times")
+            name_box.set(text=player_name)
+            age_box.set(text=player_age)
+            menu.render()
+    finally:
+        # Also when the menu exits the program, so the heartbeat never outlives calibration
+        blink_subscription.close()
+        input_service.set_blink_state_interval(None)  # Nothing reads the eye ratio after calibration
 
 
 
@@ -432,8 +493,8 @@ def draw_status_bar(screen):
     """
     # Top Status Bar
     pygame.draw.rect(screen, LIGHT_GRAY, (0, 0, WIDTH, 50))
-    score_text = FONT.render(f"Score: {current_score}", True, BLACK)
-    game_name_text = FONT.render(f"Game: {current_game_name}", True, BLACK)
+    score_text = render_cached(FONT, f"Score: {current_score}", True, BLACK)
+    game_name_text = render_cached(FONT, f"Game: {current_game_name}", True, BLACK)
     screen.blit(score_text, (20, 15))
     screen.blit(game_name_text, (WIDTH - game_name_text.get_width() - 20, 15))
 
@@ -455,6 +516,9 @@ def main():
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Game Hub")
 
+    # Open the camera, microphone and speech model once for the whole session
+    start_input_service(language=SPEECH_LANGUAGE)
+
     cognitive_bool = False
 
     while True:
@@ -473,7 +537,9 @@ def main():
             game_surface = screen.subsurface(game_area)
 
             # Pass control to the game engine (only the game area is passed)
-            final_domain_scores, overall_score = game_engine.run(game_surface, player_name, player_age, current_score, WIDTH, GAME_HEIGHT)
+            get_metrics().reset()  # Only this attempt's measurements are saved with it
+            with instrument_display():  # Frame and display update times for the attempt's metrics
+                final_domain_scores, overall_score = game_engine.run(game_surface, player_name, player_age, current_score, WIDTH, GAME_HEIGHT)
             game_state = "END_SCREEN"
        
 
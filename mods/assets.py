@@ -0,0 +1,259 @@
+import collections
+import copy
+import json
+import os
+import threading
+import pygame
+from mods.audio_cache import load_pcm_sound, existing_cache_file
+
+# Output of bake_assets.py: pre-scaled images packed into atlases, with index.json
+BAKED_DIR = os.path.join("images", "baked")
+
+
+class SurfaceCache:
+    """
+    Decoded, scaled and display-converted surfaces shared by all levels, keyed by
+    (path, size, alpha). Least recently used surfaces are dropped once the cached pixel
+    data goes over budget_bytes.
+    """
+
+    def __init__(self, budget_bytes=64 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.surfaces = collections.OrderedDict()
+        self.used_bytes = 0
+        self.lock = threading.Lock()  # Levels and a preloading thread may share the cache
+
+        # Counters for tuning the budget
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            surface = self.surfaces.get(key)
+            if surface is None:
+                self.misses += 1
+                return None
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+    def put(self, key, surface):
+        size = surface_bytes(surface)
+        with self.lock:
+            if key in self.surfaces:
+                self.used_bytes -= surface_bytes(self.surfaces.pop(key))
+            self.surfaces[key] = surface
+            self.used_bytes += size
+            # Never evict the surface just added, even if it alone is over budget
+            while self.used_bytes > self.budget_bytes and len(self.surfaces) > 1:
+                _, evicted = self.surfaces.popitem(last=False)
+                self.used_bytes -= surface_bytes(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.surfaces.clear()
+            self.used_bytes = 0
+
+
+def surface_bytes(surface):
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+def prepare_surface(surface, alpha):
+    """
+    Convert a loaded surface to the display's pixel format so blits need no per-frame conversion.
+    alpha=None keeps per-pixel alpha only if the image has it.
+    """
+    if pygame.display.get_surface() is None:
+        return surface  # No display mode set yet (or headless), nothing to convert to
+    if alpha is None:
+        alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+# Session-wide caches
+_cache = SurfaceCache()
+_baked_index = None  # {(path, size): index entry}, read on first use; empty without a bake
+_sounds = {}  # path -> pygame.mixer.Sound
+_json = {}  # path -> parsed JSON
+_fonts = {}  # (path, size) -> pygame.font.Font
+_raw_images = {}  # path -> unconverted surface read ahead by a prefetch thread
+_other_lock = threading.Lock()
+
+
+def get_surface_cache():
+    return _cache
+
+
+def baked_index():
+    """Return the baked image index, keyed by (source path, size)."""
+    global _baked_index
+    if _baked_index is None:
+        try:
+            with open(os.path.join(BAKED_DIR, "index.json"), "r", encoding="utf-8") as index_file:
+                entries = json.load(index_file)["images"]
+            _baked_index = {(entry["path"], tuple(entry["size"])): entry for entry in entries}
+        except (OSError, ValueError, KeyError):
+            _baked_index = {}
+    return _baked_index
+
+
+def load_image(path, size=None, alpha=None):
+    """
+    Return the image at `path`, scaled to `size` (width, height) if given and converted for
+    fast blitting. Repeated calls with the same arguments return the same cached surface, so
+    callers must not draw on it (copy() it first). Images baked at this size are cut from
+    their atlas instead of decoding and scaling the original.
+
+    :param alpha: True for convert_alpha(), False for convert(), None to decide from the file.
+    Raises FileNotFoundError for missing files like pygame.image.load.
+    """
+    size = tuple(size) if size is not None else None
+    key = (path, size, alpha)
+    surface = _cache.get(key)
+    if surface is not None:
+        return surface
+
+    entry = baked_index().get((path, size)) if size is not None else None
+    if entry is not None:
+        # The unconverted page is kept with the prefetched images, not in the surface cache,
+        # so the level's other sprites reuse it and load_level_assets() drops it afterwards
+        atlas_path = os.path.join(BAKED_DIR, entry["atlas"])
+        read_image(atlas_path)
+        sprite = decoded_image(atlas_path).subsurface(pygame.Rect(entry["rect"]))
+        surface = prepare_surface(sprite.copy(), alpha)
+        _cache.put(key, surface)
+        return surface
+
+    surface = decoded_image(path)
+    if size is not None and surface.get_size() != size:
+        # Scale before converting, so only the small surface is converted and kept
+        surface = pygame.transform.scale(surface, size)
+    surface = prepare_surface(surface, alpha)
+    _cache.put(key, surface)
+    return surface
+
+
+def read_image(path):
+    """
+    Decode an image file for a later load_image() without converting it, so it is safe on a
+    background thread: pygame.image.load does not touch the display, convert() does.
+    """
+    with _other_lock:
+        if path in _raw_images:
+            return
+    surface = pygame.image.load(path)
+    with _other_lock:
+        _raw_images.setdefault(path, surface)
+
+
+def decoded_image(path):
+    """The surface read_image() decoded for `path`, or a fresh pygame.image.load."""
+    with _other_lock:
+        surface = _raw_images.get(path)
+    return surface if surface is not None else pygame.image.load(path)
+
+
+def preload_images(requests):
+    """
+    Load images into the cache ahead of time.
+
+    :param requests: Iterable of paths or (path, size) pairs.
+    """
+    for request in requests:
+        if isinstance(request, str):
+            load_image(request)
+        else:
+            load_image(*request)
+
+
+def load_sound(path):
+    """
+    Return a decoded pygame.mixer.Sound for `path`, shared by every caller. Decoded
+    samples are kept on disk (mods/audio_cache.py), so a file is only decoded once.
+    Raises pygame.error like pygame.mixer.Sound if the file cannot be decoded.
+    """
+    with _other_lock:
+        sound = _sounds.get(path)
+    if sound is None:
+        sound = load_pcm_sound(path)
+        with _other_lock:
+            sound = _sounds.setdefault(path, sound)
+    return sound
+
+
+def load_json(path):
+    """Return the parsed JSON file at `path`. Each call gets its own copy, so callers may modify it."""
+    with _other_lock:
+        data = _json.get(path)
+    if data is None:
+        with open(path, "r", encoding="utf-8") as json_file:
+            data = json.load(json_file)
+        with _other_lock:
+            data = _json.setdefault(path, data)
+    return copy.deepcopy(data)
+
+
+def load_font(path, size):
+    """Return a pygame.font.Font for `path` (None for the default font) at `size`, shared by every caller."""
+    key = (path, size)
+    with _other_lock:
+        font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(path, size)
+        with _other_lock:
+            font = _fonts.setdefault(key, font)
+    return font
+
+
+def warm_file(path, block_size=1024 * 1024):
+    """Read a file once so it is in the OS cache, e.g. music streamed later with pygame.mixer.music."""
+    with open(path, "rb") as warm:
+        while warm.read(block_size):
+            pass
+
+
+def image_file(request):
+    """The file load_image() decodes for a path or (path, size) request: its atlas page if baked."""
+    path, size = (request, None) if isinstance(request, str) else (request[0], tuple(request[1]))
+    entry = baked_index().get((path, size)) if size is not None else None
+    return os.path.join(BAKED_DIR, entry["atlas"]) if entry is not None else path
+
+
+def prefetch_assets(module):
+    """
+    Read ahead what a level module declares, on a background thread while another level is
+    running: IMAGE_ASSETS ((path, size) pairs) are decoded but not converted, SOUND_ASSETS and
+    font files from FONT_ASSETS are read into the OS cache and JSON_ASSETS are parsed, then the
+    module's own prefetch() is called. SDL video, SDL_ttf and the mixer are not thread-safe,
+    so surfaces for the display, Fonts and Sounds are made by load_level_assets().
+    """
+    for request in getattr(module, "IMAGE_ASSETS", []):
+        read_image(image_file(request))
+    for path in getattr(module, "SOUND_ASSETS", []):
+        warm_file(existing_cache_file(path) or path)
+    for path in getattr(module, "JSON_ASSETS", []):
+        load_json(path)
+    for path, size in getattr(module, "FONT_ASSETS", []):
+        if path is not None:
+            warm_file(path)
+    if hasattr(module, "prefetch"):
+        module.prefetch()
+
+
+def load_level_assets(module):
+    """
+    Make the display surfaces, Sounds and Fonts a level declares, on the main thread as the
+    level starts, from whatever prefetch_assets() read ahead. Then drop the unconverted images.
+    """
+    preload_images(getattr(module, "IMAGE_ASSETS", []))
+    if pygame.mixer.get_init():
+        for path in getattr(module, "SOUND_ASSETS", []):
+            load_sound(path)
+    for path, size in getattr(module, "FONT_ASSETS", []):
+        load_font(path, size)
+    with _other_lock:
+        _raw_images.clear()
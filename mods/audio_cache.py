@@ -0,0 +1,90 @@
+import hashlib
+import os
+import threading
+import pygame
+
+# Decoded sounds, one raw PCM file per (source file, mixer format). Meant for short clips
+# such as QuickAudio's notes: PCM is about ten times the size of the mp3, so long audio
+# like StoryWeaver's narrations is streamed with pygame.mixer.music instead.
+AUDIO_CACHE_DIR = os.path.join("sounds", "cache")
+
+
+def cache_path(path, mixer_format):
+    """
+    Cache file for `path` decoded to `mixer_format` (pygame.mixer.get_init()). The name
+    starts with a hash of the source path and ends with a hash of its size, mtime and the
+    mixer format, so an edited file or a different mixer setup never reads stale PCM.
+    """
+    stat = os.stat(path)
+    source_key = hashlib.sha1(os.path.normpath(path).encode("utf-8")).hexdigest()[:12]
+    version_key = hashlib.sha1(repr((stat.st_size, stat.st_mtime_ns, mixer_format)).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(AUDIO_CACHE_DIR, f"{source_key}-{version_key}.pcm")
+
+
+def read_cached(pcm_path):
+    """
+    Return a Sound built from a cache file, or None if there is none. pygame copies the
+    samples into its own buffer, so the file is simply read: the saving is the decode.
+    """
+    try:
+        with open(pcm_path, "rb") as pcm_file:
+            samples = pcm_file.read()
+    except OSError:
+        return None
+    if not samples:
+        return None
+    return pygame.mixer.Sound(buffer=samples)
+
+
+def write_cached(pcm_path, sound):
+    """Save a decoded Sound's samples, replacing older versions of the same source file."""
+    source_key = os.path.basename(pcm_path).split("-")[0]
+    temp_path = f"{pcm_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
+        with open(temp_path, "wb") as pcm_file:
+            pcm_file.write(sound.get_raw())
+        os.replace(temp_path, pcm_path)  # Readers never see a half-written file
+        for name in os.listdir(AUDIO_CACHE_DIR):
+            if name.startswith(source_key + "-") and name.endswith(".pcm") and name != os.path.basename(pcm_path):
+                os.remove(os.path.join(AUDIO_CACHE_DIR, name))
+    except OSError as e:
+        print(f"Could not cache decoded audio for {pcm_path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def existing_cache_file(path):
+    """The cache file holding `path` decoded for the current mixer, None if there is none yet."""
+    mixer_format = pygame.mixer.get_init()
+    if mixer_format is None:
+        return None
+    try:
+        pcm_path = cache_path(path, mixer_format)
+    except OSError:
+        return None
+    return pcm_path if os.path.exists(pcm_path) else None
+
+
+def load_pcm_sound(path):
+    """
+    Return a pygame.mixer.Sound for `path`, decoding it (e.g. from mp3) only the first time:
+    the samples are saved in the mixer's own format under AUDIO_CACHE_DIR and later loads
+    read them back into a Sound without decoding. Raises pygame.error like pygame.mixer.Sound if the
+    file cannot be decoded.
+    """
+    mixer_format = pygame.mixer.get_init()
+    if mixer_format is None:
+        return pygame.mixer.Sound(path)  # Raises: the mixer is not initialised
+    try:
+        pcm_path = cache_path(path, mixer_format)
+    except OSError:
+        return pygame.mixer.Sound(path)  # Missing source: let pygame report it
+
+    sound = read_cached(pcm_path)
+    if sound is None:
+        sound = pygame.mixer.Sound(path)
+        write_cached(pcm_path, sound)
+    return sound
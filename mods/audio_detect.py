@@ -1,48 +1,145 @@
 import threading
-import queue
-import pyaudio
+import json
 from vosk import Model, KaldiRecognizer
 import time
+from mods.audio_source import MicrophoneSource
+from mods.vad import EnergyGate
+
+# Default model paths
+DEFAULT_MODEL_PATHS = {
+    "english": "data/audio_model_en",
+    "hindi": "data/audio_model_hi"
+}
+
+# Command vocabulary per language, the only words the levels react to
+COMMAND_WORDS = {
+    "english": {"up", "down", "next", "previous", "left", "right", "select", "stop", "start", "quit"},
+    "hindi": {"ऊपर", "नीचे", "अगला", "पिछला", "बायां", "दायां", "चयन", "रोकें", "शुरू", "छोड़ें"},
+}
+
+# Process-wide model registry, one loaded Model per model path
+_models = {}
+_model_locks = {}
+_registry_lock = threading.Lock()
+model_load_times = {}  # model path -> seconds spent loading it
+
+
+def resolve_model_path(language, model_paths=None):
+    """Return the model path for a language, raising ValueError if it is not supported."""
+    if model_paths is None:
+        model_paths = DEFAULT_MODEL_PATHS
+
+    model_path = model_paths.get(language.lower())
+    if not model_path:
+        raise ValueError(f"Unsupported language: {language}. Supported languages are: {list(model_paths.keys())}")
+    return model_path
+
+
+def get_model(language="english", model_paths=None):
+    """
+    Return the Vosk Model for a language, loading it from disk only the first time.
+    The same Model object is shared by every recognizer in the process.
+    """
+    model_path = resolve_model_path(language, model_paths)
+
+    with _registry_lock:
+        model_lock = _model_locks.setdefault(model_path, threading.Lock())
+
+    # Per-path lock so a background preload and a level never load the same model twice
+    with model_lock:
+        if model_path not in _models:
+            load_start = time.perf_counter()
+            _models[model_path] = Model(model_path)
+            model_load_times[model_path] = time.perf_counter() - load_start
+            print(f"Loaded speech model {model_path} in {model_load_times[model_path]:.2f}s")
+        return _models[model_path]
+
+
+def preload_models(languages=("english",), model_paths=None, background=True):
+    """
+    Load the models for the given languages ahead of time, e.g. while the main menu is shown.
+    Returns the loader thread when background is True.
+    """
+    def load_all():
+        for language in languages:
+            try:
+                get_model(language, model_paths)
+            except Exception as e:
+                print(f"Error preloading speech model ({language}): {e}")
+
+    if not background:
+        load_all()
+        return None
+
+    loader = threading.Thread(target=load_all, daemon=True)
+    loader.start()
+    return loader
+
+
+# Reused decoder for the recognizer's JSON results
+_json_decoder = json.JSONDecoder()
+
+
+def parse_result(raw, key="text"):
+    """
+    Return one field of a Vosk Result()/PartialResult() JSON string.
+    Use key="partial" for partial results. Malformed input yields an empty string.
+    """
+    try:
+        return _json_decoder.decode(raw).get(key, "")
+    except ValueError:
+        return ""
+
+
+def build_grammar(words):
+    """
+    Build a Vosk grammar (JSON phrase list) from a set of command words. "[unk]" lets the
+    decoder map anything else to an unknown token instead of forcing a command.
+    """
+    return json.dumps(sorted(words) + ["[unk]"], ensure_ascii=False)
+
 
 class SpeechRecognitionThread(threading.Thread):
-    def __init__(self, audio_queue, language="english", model_paths=None):
+    def __init__(self, event_bus, language="english", model_paths=None, use_grammar=False, command_words=None,
+                 partial_results=True, source=None, chunk_size=1024, vad=False):
         super().__init__()
-        self.audio_queue = audio_queue  # Queue to store recognized words
+        self.event_bus = event_bus  # EventBus receiving recognized command words as "speech" events
         self.stop_thread = False  # Flag to stop the thread
         self.language = language.lower()
 
-        # Default model paths
-        default_model_paths = {
-            "english": "data/audio_model_en",
-            "hindi": "data/audio_model_hi"
-        }
-        
-        # Determine the model path
-        if model_paths is None:
-            model_paths = default_model_paths
-
-        model_path = model_paths.get(self.language)
-        if not model_path:
-            raise ValueError(f"Unsupported language: {language}. Supported languages are: {list(model_paths.keys())}")
-
-        # Load the model
-        self.model = Model(model_path)
-        self.recognizer = KaldiRecognizer(self.model, 16000)
-
-        # Audio stream settings
-        self.pyaudio_instance = pyaudio.PyAudio()
-        self.stream = self.pyaudio_instance.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=16000,
-            input=True,
-            frames_per_buffer=1024
-        )
-        self.stream.start_stream()
-
-        # Predefined words for each language
-        self.english_words = {"up", "down", "next", "previous", "left", "right", "select", "stop", "start", "quit"}
-        self.hindi_words = {"ऊपर", "नीचे", "अगला", "पिछला","बायां","दायां", "चयन ", "रोकें ", "शुरू", "छोड़ें" }
+        # The shared model is fetched from the registry when the thread starts, so
+        # constructing the thread never blocks on a model that is still loading
+        self.model_paths = model_paths
+        resolve_model_path(self.language, model_paths)
+        self.model = None
+        self.recognizer = None
+
+        # Audio input: live microphone unless a file/buffer source from mods.audio_source is given
+        self.chunk_size = chunk_size  # Samples read and decoded per step
+        if source is None:
+            source = MicrophoneSource(rate=16000, frames_per_buffer=chunk_size)
+        self.source = source
+
+        # Voice activity gate: True for the default EnergyGate, or a configured gate instance
+        if vad is True:
+            vad = EnergyGate(chunk_size=chunk_size)
+        self.vad = vad or None
+
+        # Predefined words for the selected language
+        if command_words is None:
+            command_words = COMMAND_WORDS.get(self.language, set())
+        self.command_words = set(command_words)
+
+        # Grammar mode decodes against the command words only instead of the full vocabulary
+        self.use_grammar = use_grammar
+        self.recognizer_stale = False  # Set when the grammar mode changes while running
+
+        # With partial_results False only final results are used ("final results only" mode)
+        self.partial_results = partial_results
+        self.last_partial_raw = ""  # Raw PartialResult() string, only decoded when it changes
+
+        # Capture time of the chunk being decoded, stamped on published events
+        self.chunk_timestamp = time.monotonic()
 
         # Tracking results
         self.last_result = ""
@@ -50,54 +147,93 @@ class SpeechRecognitionThread(threading.Thread):
         self.result_threshold = 1.5  # Time threshold in seconds
 
     def run(self):
-        print("Speech Recognition Started!")
         try:
+            self.prepare()
+            print("Speech Recognition Started!")
+
             while not self.stop_thread:
-                data = self.stream.read(1024, exception_on_overflow=False)
+                data = self.source.read(self.chunk_size)
+                captured_at = time.monotonic()
 
                 if len(data) == 0:
+                    if self.source.finished:
+                        break  # File or buffer input is used up
                     continue
 
-                # Process speech input
-                current_time = time.time()
-                if self.recognizer.AcceptWaveform(data):
-                    result = self.recognizer.Result()
-                    text = eval(result).get("text", "")
-                    if text and (text != self.last_result or (current_time - self.last_result_time) > self.result_threshold):
-                        self.last_result = text
-                        self.last_result_time = current_time
-                        self.process_text(text)
-                        # print(f"Final Recognized ({self.language}): {text}")
-                else:
-                    partial = eval(self.recognizer.PartialResult()).get("partial", "")
-                    if partial and (partial != self.last_result or (current_time - self.last_result_time) > self.result_threshold):
-                        self.last_result = partial
-                        self.last_result_time = current_time
-                        self.process_text(partial)
-                        # print(f"Partial Recognized ({self.language}): {partial}")
+                self.feed(data, captured_at)
 
         except Exception as e:
             print(f"Error in SpeechRecognitionThread: {e}")
 
         finally:
-            self.stream.stop_stream()
-            self.stream.close()
-            self.pyaudio_instance.terminate()
+            self.source.close()
             print("Speech Recognition Stopped.")
 
+    def prepare(self):
+        """Fetch the shared model and build the recognizer. Called by run(), or directly when feeding process_chunk."""
+        self.model = get_model(self.language, self.model_paths)
+        self.recognizer = self.create_recognizer()
+
+    def feed(self, data, captured_at=None):
+        """
+        Pass a chunk through the voice activity gate (if any) and decode what gets through.
+        captured_at is the time.monotonic() capture time stamped on resulting events.
+        """
+        self.chunk_timestamp = time.monotonic() if captured_at is None else captured_at
+        if self.vad is None:
+            self.process_chunk(data)
+            return
+        for chunk in self.vad.process(data):
+            self.process_chunk(chunk)
+
+    def process_chunk(self, data):
+        """Feed one chunk of 16 kHz mono int16 audio to the recognizer and handle its results."""
+        if self.recognizer_stale:
+            self.recognizer_stale = False
+            self.recognizer = self.create_recognizer()
+
+        # Process speech input
+        current_time = time.time()
+        if self.recognizer.AcceptWaveform(data):
+            self.last_partial_raw = ""
+            text = parse_result(self.recognizer.Result(), "text")
+            if text and (text != self.last_result or (current_time - self.last_result_time) > self.result_threshold):
+                self.last_result = text
+                self.last_result_time = current_time
+                self.process_text(text)
+                # print(f"Final Recognized ({self.language}): {text}")
+        elif self.partial_results:
+            # Vosk has no progress flag, so an unchanged raw partial string means nothing new was decoded
+            raw = self.recognizer.PartialResult()
+            if raw == self.last_partial_raw:
+                return
+            self.last_partial_raw = raw
+
+            partial = parse_result(raw, "partial")
+            if partial and (partial != self.last_result or (current_time - self.last_result_time) > self.result_threshold):
+                self.last_result = partial
+                self.last_result_time = current_time
+                self.process_text(partial)
+                # print(f"Partial Recognized ({self.language}): {partial}")
+
+    def create_recognizer(self):
+        """Create a recognizer for the current mode, restricted to the command words in grammar mode."""
+        if self.use_grammar and self.command_words:
+            return KaldiRecognizer(self.model, 16000, build_grammar(self.command_words))
+        return KaldiRecognizer(self.model, 16000)
+
+    def set_grammar(self, enabled):
+        """Switch between grammar-constrained and open vocabulary decoding."""
+        if enabled != self.use_grammar:
+            self.use_grammar = enabled
+            self.recognizer_stale = True  # Rebuilt by the recognition loop before the next chunk
+
     def process_text(self, text):
-        """Process the recognized text and add it to the queue if it matches predefined words."""
-        words_to_check = self.english_words if self.language == "english" else self.hindi_words
-        matched_words = set(text.split()).intersection(words_to_check)
+        """Process the recognized text and publish the words that match predefined commands."""
+        matched_words = set(text.split()).intersection(self.command_words)
 
         for word in matched_words:
-            try:
-                # Remove the oldest item if the queue is full
-                if self.audio_queue.full():
-                    self.audio_queue.get()
-                self.audio_queue.put(word, block=False)  # Non-blocking put
-            except queue.Full:
-                pass  # Ignore if the queue is full
+            self.event_bus.publish("speech", word, self.chunk_timestamp)
 
     def stop(self):
         self.stop_thread = True
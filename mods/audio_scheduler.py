@@ -0,0 +1,229 @@
+import heapq
+import itertools
+import threading
+import time
+import pygame
+
+# Posted when a scheduled sequence or narration ends; event.tag is the tag it was started with
+AUDIO_DONE_EVENT = pygame.event.custom_type()
+
+MUSIC_POLL_INTERVAL = 0.05  # How often streamed music is checked for its end, in seconds
+
+
+def ensure_mixer():
+    """Initialise the mixer once, instead of on every play. Returns False if there is no audio device."""
+    if pygame.mixer.get_init():
+        return True
+    try:
+        pygame.mixer.init()
+        return True
+    except pygame.error as e:
+        print(f"Error initialising audio: {e}")
+        return False
+
+
+class Playback:
+    """Handle for something started through the AudioScheduler."""
+
+    def __init__(self, tag, on_done):
+        self.tag = tag
+        self.on_done = on_done
+        self.end_time = None  # Monotonic time the last note ends, None for music
+        self.channels = []  # (channel, sound) of the notes played so far
+        self.notes_played = 0
+        self.done = False
+        self.cancelled = False
+
+    @property
+    def active(self):
+        return not self.done and not self.cancelled
+
+
+class AudioScheduler(threading.Thread):
+    """
+    Plays sounds at set times on a background thread, so game loops keep drawing and
+    handling input while a note sequence or a narration plays. Every sound is queued with
+    the monotonic time it is due; notes are cut off with the mixer's own maxtime, so the
+    thread only wakes when something starts or ends.
+
+    When a playback ends, AUDIO_DONE_EVENT is posted to the pygame queue with its tag (this
+    also wakes loops sleeping in FrameScheduler) and its on_done callback is called. Callbacks
+    run on the scheduler thread: set a flag there and draw in the game loop. A playback that
+    fails (e.g. a mixer error) is reported and ends early, so nothing waits on it forever.
+    """
+
+    def __init__(self):
+        super().__init__(name="audio-scheduler")
+        self.daemon = True
+        self.condition = threading.Condition()
+        self.queue = []  # Heap of (due time, order, action, playback, action arguments)
+        self.order = itertools.count()  # Keeps actions due at the same time in order
+        self.music = None  # Playback of the music track, if one is playing
+
+    def play_sequence(self, sounds, interval, start_delay=0.0, duration=None, tag=None, on_done=None):
+        """
+        Play sounds one after another.
+
+        :param sounds: pygame.mixer.Sound objects, in playing order.
+        :param interval: Seconds from the start of one sound to the start of the next.
+        :param start_delay: Seconds from now until the first sound.
+        :param duration: Seconds each sound plays before it is cut off, `interval` if None.
+        :param tag: Passed back in AUDIO_DONE_EVENT.
+        :param on_done: Called with the Playback once the last sound has ended.
+        :return: The Playback.
+        """
+        playback = Playback(tag, on_done)
+        duration = interval if duration is None else duration
+        start = time.monotonic() + start_delay
+        with self.condition:
+            for index, sound in enumerate(sounds):
+                self.schedule(start + index * interval, self.start_note, playback, (sound, duration))
+            playback.end_time = start + max(len(sounds) - 1, 0) * interval + (duration if sounds else 0)
+            self.schedule(playback.end_time, self.finish, playback)
+        return playback
+
+    def play_music(self, path, start_delay=0.0, tag=None, on_done=None):
+        """
+        Stream a long sound such as a narration with pygame.mixer.music, replacing any music
+        still playing. Ends when the track does, or straight away if it cannot be loaded.
+        """
+        playback = Playback(tag, on_done)
+        with self.condition:
+            if self.music is not None:
+                self.cancel_locked(self.music)
+            self.music = playback
+            self.schedule(time.monotonic() + start_delay, self.start_music, playback, (path,))
+        return playback
+
+    def cancel(self, playback):
+        """Stop a playback now. No AUDIO_DONE_EVENT is posted for it."""
+        with self.condition:
+            self.cancel_locked(playback)
+
+    def cancel_all(self):
+        """Stop everything; game_engine.run calls this when a level returns."""
+        with self.condition:
+            for _, _, _, playback, _ in self.queue:
+                self.cancel_locked(playback)
+            if self.music is not None:
+                self.cancel_locked(self.music)
+            self.queue = []
+
+    def schedule(self, due, action, playback, args=()):
+        # Caller holds the condition
+        heapq.heappush(self.queue, (due, next(self.order), action, playback, args))
+        self.condition.notify_all()
+
+    def cancel_locked(self, playback):
+        if not playback.active:
+            return
+        playback.cancelled = True
+        try:
+            for channel, sound in playback.channels:
+                if channel.get_sound() is sound:  # The channel may already be playing something else
+                    channel.stop()
+            if playback is self.music:
+                pygame.mixer.music.stop()
+        except pygame.error:
+            pass  # Mixer already closed, nothing is playing
+        if playback is self.music:
+            self.music = None
+
+    def run(self):
+        while True:
+            with self.condition:
+                # Sleep until the next action is due or, while music plays, until the next check
+                while True:
+                    now = time.monotonic()
+                    if self.queue and self.queue[0][0] <= now:
+                        break
+                    if self.music is not None and self.music_ended():
+                        break
+                    timeout = self.queue[0][0] - now if self.queue else None
+                    if self.music is not None:
+                        timeout = MUSIC_POLL_INTERVAL if timeout is None else min(timeout, MUSIC_POLL_INTERVAL)
+                    self.condition.wait(timeout)
+                due_actions = []
+                while self.queue and self.queue[0][0] <= now:
+                    _, _, action, playback, args = heapq.heappop(self.queue)
+                    if playback.active:
+                        due_actions.append((action, playback, args))
+                if self.music is not None and self.music_ended():
+                    due_actions.append((self.finish, self.music, ()))
+                    self.music = None
+
+            # Mixer calls and callbacks outside the lock, so play_* never waits on them
+            for action, playback, args in due_actions:
+                try:
+                    action(playback, *args)
+                except Exception as e:
+                    self.fail(playback, e)
+
+    def music_ended(self):
+        # Music that has not been started yet is still queued
+        if self.music.notes_played == 0:
+            return False
+        try:
+            return not pygame.mixer.music.get_busy()
+        except pygame.error:
+            return True  # Mixer closed: the track cannot still be playing
+
+    def start_note(self, playback, sound, duration):
+        if not playback.active:
+            return  # Cancelled after it was taken off the queue
+        channel = sound.play(maxtime=int(duration * 1000))
+        playback.notes_played += 1
+        if channel is not None:  # None when every channel is busy
+            playback.channels.append((channel, sound))
+
+    def start_music(self, playback, path):
+        if not playback.active:
+            return
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.play()
+        playback.notes_played = 1
+
+    def fail(self, playback, error):
+        """End a playback whose action raised, so loops waiting for it still finish."""
+        print(f"Error playing audio: {error}")
+        with self.condition:
+            if self.music is playback:
+                self.music = None
+        if playback.active:
+            self.finish(playback)
+
+    def finish(self, playback):
+        if not playback.active:
+            return
+        playback.done = True
+        try:
+            pygame.event.post(pygame.event.Event(AUDIO_DONE_EVENT, tag=playback.tag))
+        except pygame.error:
+            pass  # Display closed, nobody is waiting
+        if playback.on_done is not None:
+            try:
+                playback.on_done(playback)
+            except Exception as e:
+                print(f"Error in audio callback: {e}")
+
+
+# Session-wide scheduler
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def cancel_audio():
+    """Stop every scheduled sound and narration, if the scheduler was ever started."""
+    if _scheduler is not None:
+        _scheduler.cancel_all()
+
+
+def get_audio_scheduler():
+    """Return the session audio scheduler, initialising the mixer and starting it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            ensure_mixer()
+            _scheduler = AudioScheduler()
+            _scheduler.start()
+        return _scheduler
@@ -0,0 +1,89 @@
+import time
+import wave
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # int16
+
+
+class MicrophoneSource:
+    """Live 16 kHz mono input from the default PyAudio device."""
+
+    def __init__(self, rate=SAMPLE_RATE, frames_per_buffer=1024):
+        import pyaudio  # Only needed for live input
+
+        self.finished = False  # A live source never runs out
+        self.pyaudio_instance = pyaudio.PyAudio()
+        self.stream = self.pyaudio_instance.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=rate,
+            input=True,
+            frames_per_buffer=frames_per_buffer
+        )
+        self.stream.start_stream()
+
+    def read(self, frames):
+        return self.stream.read(frames, exception_on_overflow=False)
+
+    def close(self):
+        self.stream.stop_stream()
+        self.stream.close()
+        self.pyaudio_instance.terminate()
+
+
+class BufferSource:
+    """
+    In-memory 16 kHz mono int16 PCM. Reads return b"" and set finished once the data is used up.
+
+    :param realtime: Pace reads like a live microphone instead of returning data as fast as possible.
+    """
+
+    def __init__(self, data, realtime=False):
+        self.data = bytes(data)
+        self.position = 0
+        self.realtime = realtime
+        self.finished = False
+        self.start_time = None
+
+    def read(self, frames):
+        if self.realtime:
+            if self.start_time is None:
+                self.start_time = time.perf_counter()
+            # Wait until the end of the requested chunk would have been recorded
+            chunk_end = (self.position // SAMPLE_WIDTH + frames) / SAMPLE_RATE
+            delay = chunk_end - (time.perf_counter() - self.start_time)
+            if delay > 0:
+                time.sleep(delay)
+
+        chunk = self.data[self.position:self.position + frames * SAMPLE_WIDTH]
+        self.position += len(chunk)
+        if not chunk:
+            self.finished = True
+        return chunk
+
+    def close(self):
+        self.finished = True
+
+
+class PCMFileSource(BufferSource):
+    """Raw headerless 16 kHz mono int16 PCM file."""
+
+    def __init__(self, path, realtime=False):
+        with open(path, "rb") as pcm_file:
+            super().__init__(pcm_file.read(), realtime=realtime)
+
+
+class WavFileSource(BufferSource):
+    """16 kHz mono 16-bit WAV file."""
+
+    def __init__(self, path, realtime=False):
+        super().__init__(read_wav(path), realtime=realtime)
+
+
+def read_wav(path):
+    """Return the PCM frames of a 16 kHz mono 16-bit WAV file, raising ValueError for other formats."""
+    with wave.open(path, "rb") as wav_file:
+        if (wav_file.getframerate() != SAMPLE_RATE or wav_file.getnchannels() != 1
+                or wav_file.getsampwidth() != SAMPLE_WIDTH):
+            raise ValueError(f"{path} must be {SAMPLE_RATE} Hz mono 16-bit PCM")
+        return wav_file.readframes(wav_file.getnframes())
@@ -0,0 +1,104 @@
+import math
+
+
+class RunningStats:
+    """Streaming mean and standard deviation (Welford's algorithm)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class BlinkCalibrator:
+    """
+    Learns a player's open and closed eye-ratio distributions from a stream of ratios
+    (the "blink_state" heartbeat) and fits hysteresis thresholds for BlinkDetectionThread.
+
+    Nothing is stored per sample: each ratio goes to the open or the closed RunningStats.
+    Eyes are open most of the time, so the first samples seed the open distribution; a
+    ratio far above it starts the closed one, after which every ratio goes to the nearer
+    distribution (in standard deviations).
+
+    :param min_open: Open-eye samples needed before thresholds are fitted.
+    :param min_closed: Closed-eye samples needed (a blink gives a few at full frame rate).
+    :param min_gap: Smallest open/closed mean difference accepted as a real separation.
+    """
+
+    SEED_SAMPLES = 30  # Open samples before anything can count as closed
+    SEED_DISTANCE = 4.0  # Standard deviations above the open mean for the first closed sample
+    MIN_STD = 0.1  # Floor for standard deviations, so a very steady signal is not over-trusted
+
+    def __init__(self, min_open=90, min_closed=6, min_gap=0.6):
+        self.min_open = min_open
+        self.min_closed = min_closed
+        self.min_gap = min_gap
+        self.open = RunningStats()
+        self.closed = RunningStats()
+
+    def add(self, ratio):
+        """Feed one eye ratio. None (no face) and infinite ratios are ignored."""
+        if ratio is None or math.isinf(ratio):
+            return
+        open_std = max(self.open.std(), self.MIN_STD)
+
+        if self.closed.count == 0:
+            seed_distance = max(self.SEED_DISTANCE * open_std, self.min_gap)
+            if self.open.count >= self.SEED_SAMPLES and ratio > self.open.mean + seed_distance:
+                self.closed.add(ratio)
+            else:
+                self.open.add(ratio)
+            return
+
+        closed_std = max(self.closed.std(), self.MIN_STD)
+        if abs(ratio - self.closed.mean) / closed_std < abs(ratio - self.open.mean) / open_std:
+            self.closed.add(ratio)
+        else:
+            self.open.add(ratio)
+
+    def blinks_seen(self):
+        """Rough number of closed-eye samples, for progress display."""
+        return self.closed.count
+
+    def ready(self):
+        return (self.open.count >= self.min_open and self.closed.count >= self.min_closed
+                and self.closed.mean - self.open.mean >= self.min_gap)
+
+    def thresholds(self):
+        """
+        Return (high, low): close when the ratio rises above high, open when it falls below low.
+        Both sit between the two distributions, at least two standard deviations from each
+        mean where the gap allows it. None until ready().
+        """
+        if not self.ready():
+            return None
+        gap = self.closed.mean - self.open.mean
+        low = max(self.open.mean + 2 * self.open.std(), self.open.mean + 0.3 * gap)
+        high = min(self.closed.mean - 2 * self.closed.std(), self.open.mean + 0.7 * gap)
+        if high <= low:
+            # Wide distributions: fall back to a narrow band around the midpoint
+            low = self.open.mean + 0.4 * gap
+            high = self.open.mean + 0.6 * gap
+        return high, low
+
+    def to_dict(self):
+        """Fitted thresholds and the statistics behind them, for the player's profile."""
+        high, low = self.thresholds()
+        return {
+            "high": round(high, 3),
+            "low": round(low, 3),
+            "open_mean": round(self.open.mean, 3),
+            "open_std": round(self.open.std(), 3),
+            "closed_mean": round(self.closed.mean, 3),
+            "closed_std": round(self.closed.std(), 3),
+            "samples": self.open.count + self.closed.count,
+        }
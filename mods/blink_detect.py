@@ -1,15 +1,55 @@
 import cv2
 import mediapipe as mp
-from math import sqrt
+import numpy as np
 import threading
-import queue
 import time
+from mods.frame_source import CameraSource
 
 class BlinkDetectionThread(threading.Thread):
-    def __init__(self, blink_queue):
+    def __init__(self, event_bus, state_interval=None, debug=False, scale=1.0, source=None, profile=False,
+                 adaptive=False, idle_fps=4, tracking_fps=15, redetect_interval=2.0, near_margin=0.6):
+        """
+        :param event_bus: EventBus receiving "blink" events.
+        :param state_interval: Seconds between "blink_state" heartbeats, None to disable.
+        :param debug: Draw landmarks and the ratio on the frame and show it in a window.
+                      Off in the game, where nobody sees the frame.
+        :param scale: Resize factor applied before the face mesh. 1.0 processes the camera
+                      frame as is; values below 1 trade landmark precision for speed.
+        :param source: Frame source (see mods.frame_source), defaults to the first webcam.
+        :param profile: Accumulate per-stage processing times in stage_times.
+        :param adaptive: Track the face in a crop between full-frame detections and vary the
+                         frame rate: idle_fps without a face, tracking_fps with open eyes far
+                         from the thresholds, every frame when the ratio is within near_margin
+                         of LOW_THRESHOLD or the eyes are closed.
+        :param redetect_interval: Seconds between full-frame detections while tracking a crop.
+        """
         super().__init__()
-        self.blink_queue = blink_queue
+        self.event_bus = event_bus  # EventBus receiving "blink" events
         self.stop_thread = False
+        self.debug = debug
+        self.scale = scale
+        self.debug_frame = None  # Last annotated frame in debug mode
+
+        # Seconds spent per stage and frames processed, filled when profiling
+        self.profile = profile
+        self.stage_times = {"resize": 0.0, "color": 0.0, "face_mesh": 0.0, "ratio": 0.0}
+        self.frames_processed = 0
+        self.frames_skipped = 0  # Frames read but not processed by the adaptive governor
+
+        # Adaptive mode
+        self.adaptive = adaptive
+        self.idle_fps = idle_fps
+        self.tracking_fps = tracking_fps
+        self.redetect_interval = redetect_interval
+        self.near_margin = near_margin
+        self.face_box = None  # (x0, y0, x1, y1) crop around the face while tracking
+        self.crop_face_mesh = None  # Separate FaceMesh for crops, created on first use
+        self.last_detection_time = float("-inf")
+        self.next_frame_due = float("-inf")
+
+        # Optional low-rate heartbeat on the separate "blink_state" channel (seconds, None = off)
+        self.state_interval = state_interval
+        self.last_state_time = 0
 
         # Adjusted thresholds based on observed ratios
         self.HIGH_THRESHOLD = 4.1
@@ -24,12 +64,19 @@ class BlinkDetectionThread(threading.Thread):
         # Mediapipe initialization
         self.LEFT_EYE = [362, 382, 381, 380, 374, 373, 390, 249, 263, 466, 388, 387, 386, 385, 384, 398]
         self.RIGHT_EYE = [33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159, 160, 161, 246]
+
+        # The 8 landmarks eyeRatio needs, as (horizontal, horizontal, vertical, vertical) per eye
+        self.RATIO_POINTS = [
+            self.RIGHT_EYE[0], self.RIGHT_EYE[8], self.RIGHT_EYE[12], self.RIGHT_EYE[4],
+            self.LEFT_EYE[0], self.LEFT_EYE[8], self.LEFT_EYE[12], self.LEFT_EYE[4],
+        ]
+        self.ratio_coordinates = np.empty((len(self.RATIO_POINTS), 2), dtype=np.float64)  # Reused every frame
         self.face_mesh = mp.solutions.face_mesh.FaceMesh(
             max_num_faces=1,
             min_detection_confidence=0.6,
             min_tracking_confidence=0.7,
         )
-        self.video_capture = cv2.VideoCapture(0)
+        self.source = source if source is not None else CameraSource(0)
 
     def landmarksDetection(self, image, results):
         image_height, image_width = image.shape[:2]
@@ -39,112 +86,212 @@ class BlinkDetectionThread(threading.Thread):
         ]
         return mesh_coordinates
 
+    def eyeLandmarks(self, image, results):
+        """Pixel coordinates of only the RATIO_POINTS landmarks, written into a preallocated array."""
+        image_height, image_width = image.shape[:2]
+        landmark = results.multi_face_landmarks[0].landmark
+        coordinates = self.ratio_coordinates
+        for row, index in enumerate(self.RATIO_POINTS):
+            point = landmark[index]
+            coordinates[row, 0] = point.x
+            coordinates[row, 1] = point.y
+        coordinates *= (image_width, image_height)
+        return coordinates
+
     def drawLandmarks(self, image, landmarks):
         for point in landmarks:
             cv2.circle(image, point, 2, (0, 255, 0), -1)
         return image
 
-    def euclideanDistance(self, point, point1):
-        x, y = point
-        x1, y1 = point1
-        return sqrt((x1 - x)**2 + (y1 - y)**2)
+    def eyeRatio(self, coordinates):
+        """
+        Mean of both eyes' horizontal / vertical landmark distance, over the array returned
+        by eyeLandmarks. Grows as the eyes close.
+        """
+        deltas = coordinates[0::2] - coordinates[1::2]
+        right_h, right_v, left_h, left_v = np.hypot(deltas[:, 0], deltas[:, 1]).tolist()
+        if right_v == 0 or left_v == 0:
+            return float("inf")  # Lids fully together
+        return (right_h / right_v + left_h / left_v) / 2
 
-    def blinkRatio(self, landmarks):
-        right_eye_landmark1 = landmarks[self.RIGHT_EYE[0]]
-        right_eye_landmark2 = landmarks[self.RIGHT_EYE[8]]
-        right_eye_landmark3 = landmarks[self.RIGHT_EYE[12]]
-        right_eye_landmark4 = landmarks[self.RIGHT_EYE[4]]
+    def process_frame(self, frame, captured_at):
+        """Run one BGR frame through the detector, publish any events and return the eye ratio (None without a face)."""
+        profile = self.profile
+        if profile:
+            stage_start = time.perf_counter()
 
-        left_eye_landmark1 = landmarks[self.LEFT_EYE[0]]
-        left_eye_landmark2 = landmarks[self.LEFT_EYE[8]]
-        left_eye_landmark3 = landmarks[self.LEFT_EYE[12]]
-        left_eye_landmark4 = landmarks[self.LEFT_EYE[4]]
+        if self.scale != 1.0:
+            # INTER_AREA for shrinking, INTER_CUBIC as before for an upscale (e.g. the 1.5 reference)
+            interpolation = cv2.INTER_AREA if self.scale < 1.0 else cv2.INTER_CUBIC
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=interpolation)
+        if profile:
+            stage_start = self.addStageTime("resize", stage_start)
 
-        right_eye_horizontal_distance = self.euclideanDistance(right_eye_landmark1, right_eye_landmark2)
-        right_eye_vertical_distance = self.euclideanDistance(right_eye_landmark3, right_eye_landmark4)
+        # Between full-frame detections the adaptive mode only looks at the tracked face crop
+        tracking = (self.adaptive and self.face_box is not None
+                    and captured_at - self.last_detection_time < self.redetect_interval)
+        if tracking:
+            x0, y0, x1, y1 = self.face_box
+            face_frame = frame[y0:y1, x0:x1]
+        else:
+            face_frame = frame
 
-        left_eye_horizontal_distance = self.euclideanDistance(left_eye_landmark1, left_eye_landmark2)
-        left_eye_vertical_distance = self.euclideanDistance(left_eye_landmark3, left_eye_landmark4)
+        rgb_frame = cv2.cvtColor(face_frame, cv2.COLOR_RGB2BGR)
+        if profile:
+            stage_start = self.addStageTime("color", stage_start)
 
-        right_eye_ratio = right_eye_horizontal_distance / right_eye_vertical_distance
-        left_eye_ratio = left_eye_horizontal_distance / left_eye_vertical_distance
+        if tracking:
+            # The full-frame FaceMesh tracks landmarks from one frame to the next, which breaks
+            # when it is fed crops of a different geometry; crops get their own static instance
+            if self.crop_face_mesh is None:
+                self.crop_face_mesh = mp.solutions.face_mesh.FaceMesh(
+                    static_image_mode=True,
+                    max_num_faces=1,
+                    min_detection_confidence=0.6,
+                )
+            results = self.crop_face_mesh.process(rgb_frame)
+        else:
+            results = self.face_mesh.process(rgb_frame)
+        if profile:
+            stage_start = self.addStageTime("face_mesh", stage_start)
 
-        return (right_eye_ratio + left_eye_ratio) / 2
+        eyes_ratio = None
 
-    def run(self):
-        while not self.stop_thread:
-            ret, frame = self.video_capture.read()
-            if not ret:
-                break
+        if results.multi_face_landmarks:
+            eyes_ratio = self.eyeRatio(self.eyeLandmarks(face_frame, results))
+            if profile:
+                self.addStageTime("ratio", stage_start)
 
-            frame = cv2.resize(frame, None, fx=1.5, fy=1.5, interpolation=cv2.INTER_CUBIC)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            results = self.face_mesh.process(rgb_frame)
+            if self.adaptive and not tracking:
+                self.face_box = self.faceBox(face_frame, results, bounds=frame.shape[:2])
+                self.last_detection_time = captured_at
+            elif tracking:
+                # Follow the head between full-frame detections
+                self.face_box = self.faceBox(face_frame, results, offset=(x0, y0), bounds=frame.shape[:2])
 
-            blink_detected = False  # Flag to track if a blink event occurred
+            if self.debug:
+                # Draw landmarks and display the ratio
+                mesh_coordinates = self.landmarksDetection(face_frame, results)
+                self.drawLandmarks(face_frame, mesh_coordinates)  # Draws through the crop view into frame
+                cv2.putText(frame, f"Ratio: {eyes_ratio:.2f}", (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
 
-            if results.multi_face_landmarks:
-                mesh_coordinates = self.landmarksDetection(frame, results)
-                frame = self.drawLandmarks(frame, mesh_coordinates)  # Draw landmarks
-                eyes_ratio = self.blinkRatio(mesh_coordinates)
+            self.updateBlinkState(eyes_ratio, captured_at)
+        elif tracking:
+            self.face_box = None  # Lost the face in the crop, search the full frame next time
 
-                # Display the ratio for debugging
-                cv2.putText(frame, f"Ratio: {eyes_ratio:.2f}", (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        # Only edges go on the "blink" channel; the current state is a separate, low-rate heartbeat
+        if self.state_interval is not None and captured_at - self.last_state_time >= self.state_interval:
+            self.last_state_time = captured_at
+            self.event_bus.publish("blink_state", {
+                "face": eyes_ratio is not None,
+                "ratio": eyes_ratio,
+                "eyes_closed": self.eyes_closed,
+            }, captured_at)
+
+        if self.adaptive:
+            self.scheduleNextFrame(eyes_ratio, captured_at)
+
+        self.frames_processed += 1
+        if self.debug:
+            self.debug_frame = frame
+        return eyes_ratio
+
+    def faceBox(self, image, results, margin=0.25, offset=(0, 0), bounds=None):
+        """
+        Pixel bounding box of the face landmarks, grown by margin on each side. `image` is what
+        the face mesh saw, placed at `offset` in the full frame; the box is in full-frame
+        pixels and clipped to `bounds` (height, width), the image itself if None.
+        """
+        image_height, image_width = image.shape[:2]
+        frame_height, frame_width = bounds if bounds is not None else (image_height, image_width)
+        points = results.multi_face_landmarks[0].landmark
+        xs = [point.x for point in points]
+        ys = [point.y for point in points]
+        x_min, x_max, y_min, y_max = min(xs), max(xs), min(ys), max(ys)
+        pad_x = (x_max - x_min) * margin
+        pad_y = (y_max - y_min) * margin
+        offset_x, offset_y = offset
+        return (
+            max(0, offset_x + int((x_min - pad_x) * image_width)),
+            max(0, offset_y + int((y_min - pad_y) * image_height)),
+            min(frame_width, offset_x + int((x_max + pad_x) * image_width)),
+            min(frame_height, offset_y + int((y_max + pad_y) * image_height)),
+        )
+
+    def scheduleNextFrame(self, eyes_ratio, captured_at):
+        """Frame-rate governor for adaptive mode: pick when the next frame should be processed."""
+        if eyes_ratio is None:
+            fps = self.idle_fps  # Nobody in front of the camera
+        elif self.eyes_closed or eyes_ratio > self.LOW_THRESHOLD - self.near_margin:
+            self.next_frame_due = captured_at  # Close to a blink edge, take every frame
+            return
+        else:
+            fps = self.tracking_fps
+        self.next_frame_due = captured_at + 1.0 / fps
+
+    def updateBlinkState(self, eyes_ratio, captured_at):
+        """Apply the thresholds to one eye ratio and publish the resulting blink events."""
+        if eyes_ratio > self.HIGH_THRESHOLD and not self.eyes_closed:
+            self.eyes_closed = True  # Eyes are now closed
+            self.event_bus.publish("blink", "EYES_CLOSED", captured_at)
+
+        elif eyes_ratio < self.LOW_THRESHOLD and self.eyes_closed:
+            self.eyes_closed = False  # Eyes are now open
+            self.event_bus.publish("blink", "EYES_OPEN", captured_at)
+
+            # Blink detected. Timing uses the capture time so replayed video behaves like live input
+            if captured_at - self.last_blink_time < 1:  # Double blink threshold
+                self.event_bus.publish("blink", "DOUBLE_BLINK", captured_at)
+            elif captured_at - self.last_single_blink_time >= self.COOLDOWN_PERIOD:
+
+                # Emit single blink only if cooldown has passed
+                self.event_bus.publish("blink", "SINGLE_BLINK", captured_at)
+                self.last_single_blink_time = captured_at
+
+            self.last_blink_time = captured_at
+
+    def addStageTime(self, stage, stage_start):
+        now = time.perf_counter()
+        self.stage_times[stage] += now - stage_start
+        return now
+
+    def run(self):
+        try:
+            while not self.stop_thread:
+                slept = False
+                if self.adaptive and self.source.live:
+                    # Sleep instead of reading frames the governor would skip anyway
+                    delay = self.next_frame_due - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                        slept = True
+
+                if slept and hasattr(self.source, "read_fresh"):
+                    # Skip frames a camera queued during the sleep, so timestamps stay true
+                    frame, captured_at = self.source.read_fresh()
+                else:
+                    frame, captured_at = self.source.read()
+                if frame is None:
+                    break
+                if self.adaptive and captured_at < self.next_frame_due - 0.005:
+                    self.frames_skipped += 1
+                    continue
+                self.process_frame(frame, captured_at)
+
+                if self.debug:
+                    # Display the frame with landmarks and ratio
+                    cv2.imshow("Blink Detection with Landmarks", self.debug_frame)
+                    if cv2.waitKey(2) == 10:
+                        break
+        finally:
+            self.source.close()
+            if self.debug:
+                cv2.destroyAllWindows()
 
-                if eyes_ratio > self.HIGH_THRESHOLD and not self.eyes_closed:
-                    self.eyes_closed = True  # Eyes are now closed
-                    # print("Eyes Closed")
-
-                elif eyes_ratio < self.LOW_THRESHOLD and self.eyes_closed:
-                    self.eyes_closed = False  # Eyes are now open
-                    # print("Eyes Open")
-                    current_time = time.time()
-
-                    # Blink detected
-                    if current_time - self.last_blink_time < 1:  # Double blink threshold
-                        
-                        # self.blink_queue.put("DOUBLE_BLINK")
-                        try:
-                            self. blink_queue.put("DOUBLE_BLINK", block=False)  # Non-blocking put
-                        except queue.Full:
-                            # print("Queue is full. Dropping item.")
-                            pass
-
-                        # print("Double Blink Detected")
-                        blink_detected = True
-                    elif current_time - self.last_single_blink_time >= self.COOLDOWN_PERIOD:
-
-                        # Emit single blink only if cooldown has passed
-                        # self.blink_queue.put("SINGLE_BLINK")
-                        try:
-                            self. blink_queue.put("SINGLE_BLINK", block=False)  # Non-blocking put
-                        except queue.Full:
-                            # print("Queue is full. Dropping item.")
-                            pass
-
-                        # print("Single Blink Detected")
-                        blink_detected = True
-                        self.last_single_blink_time = current_time
-
-                    self.last_blink_time = current_time
-
-            # If no blink was detected, send an empty string
-            if not blink_detected:
-                # self.blink_queue.put("")
-                try:
-                    self. blink_queue.put("", block=False)  # Non-blocking put
-                except queue.Full:
-                    # print("Queue is full. Dropping item.")
-                    pass
-
-            # Display the frame with landmarks and ratio
-            # cv2.imshow("Blink Detection with Landmarks", frame)
-
-            if cv2.waitKey(2) == 10:
-                break
-
-        self.video_capture.release()
-        cv2.destroyAllWindows()
+    def configure(self, **settings):
+        """Change detector attributes while running, e.g. HIGH_THRESHOLD or state_interval."""
+        for name, value in settings.items():
+            setattr(self, name, value)
 
     def stop(self):
         self.stop_thread = True
@@ -0,0 +1,120 @@
+import collections
+import itertools
+import threading
+import time
+
+
+class InputEvent(collections.namedtuple("InputEvent", ["seq", "source", "value", "timestamp"])):
+    """
+    One input event on the bus.
+
+    :param seq: Bus-wide sequence number, increasing by one per event.
+    :param source: Where the event came from, e.g. "blink" or "speech".
+    :param value: The event payload, e.g. "SINGLE_BLINK" or a recognized command word.
+    :param timestamp: time.monotonic() when the underlying frame/audio was captured.
+    """
+    __slots__ = ()
+
+    def age(self, now=None):
+        """Seconds between capture and now (or the given monotonic time)."""
+        return (time.monotonic() if now is None else now) - self.timestamp
+
+
+class EventBus:
+    """
+    Thread-safe ring buffer of timestamped input events. Producers publish from any thread;
+    every consumer reads through its own EventCursor, so one slow reader never takes events
+    away from another. Only a reader that falls more than `capacity` events behind loses
+    events, and its cursor counts them.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.events = collections.deque(maxlen=capacity)
+        self.next_seq = 0
+        self.lock = threading.Lock()
+        self.listeners = []  # Called with each published event, on the publishing thread
+
+    def add_listener(self, callback):
+        """Call callback(event) for every event published from now on. It must be quick."""
+        with self.lock:
+            self.listeners = self.listeners + [callback]
+
+    def publish(self, source, value, timestamp=None):
+        """Add an event and return it. timestamp defaults to now (time.monotonic())."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self.lock:
+            event = InputEvent(self.next_seq, source, value, timestamp)
+            self.next_seq += 1
+            self.events.append(event)
+            listeners = self.listeners
+        for callback in listeners:
+            callback(event)
+        return event
+
+    def read_since(self, seq):
+        """Return all buffered events with a sequence number >= seq, oldest first."""
+        with self.lock:
+            if not self.events or seq >= self.next_seq:
+                return []
+            first_seq = self.events[0].seq
+            return list(itertools.islice(self.events, max(0, seq - first_seq), None))
+
+    def cursor(self, sources=None):
+        """Return a new cursor that sees events published from now on, only from `sources` if given."""
+        return EventCursor(self, sources)
+
+
+class EventCursor:
+    """
+    Per-consumer read position on an EventBus. Events from sources the cursor was not
+    created for are discarded as they are read, and at most `capacity` unread events are
+    kept, so a reader that never drains some source cannot grow without bound.
+    """
+
+    def __init__(self, bus, sources=None):
+        self.bus = bus
+        self.sources = None if sources is None else frozenset(sources)
+        with bus.lock:
+            self.position = bus.next_seq
+        # Read from the bus but not yet taken by a source-filtered drain; oldest dropped first
+        self.pending = collections.deque(maxlen=bus.capacity)
+        self.dropped = 0  # Events lost because this reader fell too far behind
+
+    def _pull(self):
+        events = self.bus.read_since(self.position)
+        if events:
+            if events[0].seq > self.position:
+                self.dropped += events[0].seq - self.position
+            self.position = events[-1].seq + 1
+            if self.sources is not None:
+                events = [event for event in events if event.source in self.sources]
+            overflow = len(self.pending) + len(events) - self.pending.maxlen
+            if overflow > 0:
+                self.dropped += overflow
+            self.pending.extend(events)
+
+    def drain(self, source=None):
+        """
+        Return every unread event (only those from `source` if given), oldest first.
+        Events from other sources stay queued for a later drain.
+        """
+        self._pull()
+        if source is None:
+            events = list(self.pending)
+            self.pending.clear()
+            return events
+
+        events = [event for event in self.pending if event.source == source]
+        if events:
+            kept = [event for event in self.pending if event.source != source]
+            self.pending.clear()
+            self.pending.extend(kept)
+        return events
+
+    def skip(self):
+        """Discard everything published so far, e.g. input that arrived during a cut-scene."""
+        with self.bus.lock:
+            self.position = self.bus.next_seq
+        self.pending.clear()
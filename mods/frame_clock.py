@@ -0,0 +1,70 @@
+import time
+import pygame
+from mods.metrics import get_metrics
+
+DEFAULT_FPS = 30  # Frame rate cap for screen loops
+IDLE_TIMEOUT = 0.1  # Longest an idle loop sleeps before redrawing anyway, in seconds
+
+# Posted when blink or speech input arrives, so idle loops wake up for it
+INPUT_EVENT = pygame.event.custom_type()
+
+
+class FrameScheduler:
+    """
+    Paces a screen loop. Call events() once per iteration instead of pygame.event.get():
+    it holds the loop to `fps` and, in idle mode, sleeps in pygame.event.wait() until a key,
+    mouse or input-service event arrives, so a screen waiting for input uses no CPU.
+
+    An idle loop only sleeps after an iteration without events, so the frame drawn after
+    handling input is shown straight away. Loops that animate or poll something other than
+    events should leave idle off and just get the frame rate cap.
+
+    :param fps: Frame rate cap, DEFAULT_FPS if None.
+    :param idle: Sleep until the next event instead of polling.
+    :param idle_timeout: Longest sleep in seconds, IDLE_TIMEOUT if None.
+    """
+
+    def __init__(self, fps=None, idle=False, idle_timeout=None):
+        self.fps = DEFAULT_FPS if fps is None else fps
+        self.idle = idle
+        self.idle_timeout = IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self.clock = pygame.time.Clock()
+        self.active = True  # Last iteration had events (or this is the first one)
+        self.metrics = get_metrics()
+        self.work_started = None  # When the caller got the previous frame's events
+
+    def tick(self):
+        """End a frame, waiting as needed to hold the frame rate. Returns milliseconds since the last tick."""
+        return self.clock.tick(self.fps)
+
+    def events(self):
+        """End a frame and return the pygame events that arrived, sleeping for them in idle mode."""
+        if self.work_started is not None:
+            # Handling the previous events and drawing, without the time spent waiting here
+            self.metrics.observe("loop_work", time.perf_counter() - self.work_started)
+        self.tick()
+        if not self.idle or self.active:
+            events = pygame.event.get()
+        else:
+            event = pygame.event.wait(int(self.idle_timeout * 1000))
+            events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+        self.active = bool(events)
+        self.metrics.gauge("pygame_events", len(events))
+        self.work_started = time.perf_counter()
+        return events
+
+
+def post_input_event(event):
+    """
+    Event bus listener: wake idle loops when blink or speech input arrives. At most one
+    INPUT_EVENT is queued at a time, so a burst of input never floods the pygame queue.
+    "blink_state" (the per-frame eye ratio during calibration) wakes nothing: loops that
+    read it pick it up when they next run.
+    """
+    if event.source == "blink_state":
+        return
+    try:
+        if not pygame.event.peek(INPUT_EVENT):
+            pygame.event.post(pygame.event.Event(INPUT_EVENT, source=event.source))
+    except pygame.error:
+        pass  # No display yet, nothing is waiting
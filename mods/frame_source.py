@@ -0,0 +1,157 @@
+import os
+import time
+from abc import ABC, abstractmethod
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+MAX_QUEUED_FRAMES = 8  # Most frames a camera backend is expected to queue while the reader sleeps
+QUEUED_GRAB_TIME = 0.005  # A grab() faster than this returned a queued frame, in seconds
+
+
+class CameraSource:
+    """Live BGR frames from a webcam."""
+
+    def __init__(self, index=0):
+        self.finished = False  # Set when the camera stops delivering frames
+        self.live = True  # Frames arrive in real time, so skipping one means not reading it
+        self.video_capture = cv2.VideoCapture(index)
+        # Ask for only the newest frame to be kept; many V4L2/MSMF backends ignore this, see read_fresh()
+        self.video_capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def read(self):
+        """Return (frame, capture time) or (None, None) when no frame could be read."""
+        ret, frame = self.video_capture.read()
+        if not ret:
+            self.finished = True
+            return None, None
+        return frame, time.monotonic()
+
+    def read_fresh(self):
+        """
+        Like read(), but for a frame captured after the call, e.g. after the reader slept.
+        Frames the backend queued meanwhile come back from grab() at once, so grab until
+        one has to wait for the camera and decode only that frame.
+        """
+        for _ in range(MAX_QUEUED_FRAMES):
+            started = time.monotonic()
+            if not self.video_capture.grab():
+                self.finished = True
+                return None, None
+            if time.monotonic() - started >= QUEUED_GRAB_TIME:
+                break
+        ret, frame = self.video_capture.retrieve()
+        if not ret:
+            self.finished = True
+            return None, None
+        return frame, time.monotonic()
+
+    def close(self):
+        self.video_capture.release()
+
+
+class FrameListSource(ABC):
+    """
+    Base for recorded frames. Capture times follow the recording's frame rate, so blink
+    timing (double blinks, cooldown) behaves as it did live even when replaying faster.
+
+    :param fps: Frame rate of the recording.
+    :param realtime: Pace reads like a live camera instead of returning frames as fast as possible.
+    """
+
+    def __init__(self, fps=30.0, realtime=False):
+        self.fps = fps
+        self.realtime = realtime
+        self.live = realtime
+        self.finished = False
+        self.frame_index = 0
+        self.start_time = None
+
+    @abstractmethod
+    def next_frame(self):
+        """Return the next BGR frame or None at the end."""
+
+    def read(self):
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        captured_at = self.start_time + self.frame_index / self.fps
+
+        if self.realtime:
+            delay = captured_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        frame = self.next_frame()
+        if frame is None:
+            self.finished = True
+            return None, None
+        self.frame_index += 1
+        return frame, captured_at
+
+    def media_time(self, captured_at):
+        """Seconds into the recording for a capture time returned by read()."""
+        return captured_at - self.start_time
+
+    def close(self):
+        self.finished = True
+
+
+class VideoFileSource(FrameListSource):
+    """Frames from a video file. fps defaults to the rate stored in the file."""
+
+    def __init__(self, path, fps=None, realtime=False):
+        self.video_capture = cv2.VideoCapture(path)
+        if not self.video_capture.isOpened():
+            raise ValueError(f"Could not open video {path}")
+        super().__init__(fps or self.video_capture.get(cv2.CAP_PROP_FPS) or 30.0, realtime=realtime)
+
+    def next_frame(self):
+        ret, frame = self.video_capture.read()
+        return frame if ret else None
+
+    def close(self):
+        super().close()
+        self.video_capture.release()
+
+
+class ImageDirectorySource(FrameListSource):
+    """Frames from a directory of numbered image files, read in name order."""
+
+    def __init__(self, path, fps=30.0, realtime=False):
+        super().__init__(fps, realtime=realtime)
+        self.paths = [
+            os.path.join(path, name) for name in sorted(os.listdir(path))
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+
+    def next_frame(self):
+        if self.frame_index >= len(self.paths):
+            return None
+        return cv2.imread(self.paths[self.frame_index])
+
+
+class SyntheticSource(FrameListSource):
+    """
+    Generated noise frames with no face in them. Useful for measuring capture and
+    FaceMesh throughput on a machine without a camera or recordings.
+
+    :param frames: Number of frames before the source finishes.
+    """
+
+    def __init__(self, frames=300, width=640, height=480, fps=30.0, realtime=False, seed=0):
+        super().__init__(fps, realtime=realtime)
+        self.frames = frames
+        self.random = np.random.default_rng(seed)
+        self.shape = (height, width, 3)
+
+    def next_frame(self):
+        if self.frame_index >= self.frames:
+            return None
+        return self.random.integers(0, 256, self.shape, dtype=np.uint8)
+
+
+def open_frame_source(path, fps=None, realtime=False):
+    """Return an ImageDirectorySource for a directory, otherwise a VideoFileSource."""
+    if os.path.isdir(path):
+        return ImageDirectorySource(path, fps=fps or 30.0, realtime=realtime)
+    return VideoFileSource(path, fps=fps, realtime=realtime)
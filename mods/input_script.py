@@ -0,0 +1,142 @@
+import json
+import random
+import threading
+import time
+import pygame
+
+
+class InputScript:
+    """
+    Input for a simulated session, per level name:
+
+        {"LogicLink": {"steps": [...], "random": {"actions": [...], "interval": [0.3, 1.0]}}}
+
+    The steps run in order once the level starts, each after its own "after" delay in
+    seconds. Then a random action is picked every `interval` seconds (uniform between the
+    two bounds) until the level returns. Actions (window coordinates for clicks):
+
+        {"key": "RETURN"}            key press, any pygame K_ name
+        {"text": "Asha"}             one key press per character
+        {"click": [400, 505]}        left click
+        {"blink": "DOUBLE_BLINK"}    blink event on the input service bus
+        {"speech": "select"}         speech command on the input service bus
+
+    Random actions may carry a "weight" (default 1).
+    """
+
+    def __init__(self, levels, seed=0):
+        self.levels = levels
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def load(cls, path, seed=0):
+        with open(path, "r", encoding="utf-8") as script_file:
+            return cls(json.load(script_file), seed)
+
+    def actions(self, level_name):
+        """Yield (delay, action) pairs for a level, endlessly if it has random actions."""
+        level = self.levels.get(level_name, {})
+        for step in level.get("steps", []):
+            yield step.get("after", 0.5), step
+
+        random_input = level.get("random")
+        if not random_input:
+            return
+        actions = random_input["actions"]
+        weights = [action.get("weight", 1) for action in actions]
+        low, high = random_input.get("interval", [0.3, 1.0])
+        while True:
+            yield self.rng.uniform(low, high), self.rng.choices(actions, weights)[0]
+
+
+class ScriptedInputDriver(threading.Thread):
+    """
+    Plays an InputScript into a running session: keys and clicks are posted to the pygame
+    event queue, blinks and speech commands are published on the input service's event bus,
+    so levels receive them exactly like real input. Call level_started() when a level begins
+    and level_finished() when it returns.
+    """
+
+    def __init__(self, script, event_bus):
+        super().__init__(name="input-script")
+        self.daemon = True
+        self.script = script
+        self.event_bus = event_bus
+        self.condition = threading.Condition()
+        self.level_name = None
+        self.level_generation = 0  # Changes with every level, so a sleeping action is dropped
+        self.stopped = False
+        self.actions_sent = 0
+
+    def level_started(self, level_name):
+        with self.condition:
+            self.level_name = level_name
+            self.level_generation += 1
+            self.condition.notify_all()
+
+    def level_finished(self):
+        with self.condition:
+            self.level_name = None
+            self.level_generation += 1
+            self.condition.notify_all()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.level_name is None and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                generation = self.level_generation
+                actions = self.script.actions(self.level_name)
+
+            for delay, action in actions:
+                with self.condition:
+                    # Sleep until the action is due, or until the level ends
+                    deadline = time.monotonic() + delay
+                    while not self.stopped and self.level_generation == generation:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self.condition.wait(remaining)
+                    if self.stopped or self.level_generation != generation:
+                        break
+                self.perform(action)
+
+            with self.condition:
+                # Script exhausted: wait for the next level
+                while self.level_generation == generation and not self.stopped:
+                    self.condition.wait()
+
+    def perform(self, action):
+        self.actions_sent += 1
+        if "key" in action:
+            self.press(getattr(pygame, "K_" + action["key"]), self.key_unicode(action["key"]))
+        elif "text" in action:
+            for character in action["text"]:
+                self.press(ord(character.lower()), character)
+        elif "click" in action:
+            position = tuple(action["click"])
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=position, button=1))
+        elif "blink" in action:
+            self.event_bus.publish("blink", action["blink"])
+        elif "speech" in action:
+            self.event_bus.publish("speech", action["speech"])
+
+    @staticmethod
+    def key_unicode(name):
+        if name == "RETURN":
+            return "\r"
+        if name == "SPACE":
+            return " "
+        return name if len(name) == 1 else ""
+
+    @staticmethod
+    def press(key, unicode):
+        # KEYDOWN only: some levels look at the last event of a frame for the key they wait for
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=0, scancode=0))
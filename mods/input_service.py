@@ -0,0 +1,207 @@
+import atexit
+import threading
+import time
+from mods.event_bus import EventBus
+from mods.blink_detect import BlinkDetectionThread
+from mods.vision_worker import VisionWorker
+from mods.audio_detect import SpeechRecognitionThread
+from mods.frame_clock import post_input_event
+from mods.metrics import get_metrics
+
+
+class InputSubscription:
+    """
+    Handle given to a level: a private cursor on the session event bus. Each frame the
+    level drains every blink/speech event that arrived since its last drain, with the
+    capture timestamp of each event.
+    """
+
+    def __init__(self, service, sources=None):
+        self.service = service
+        self.cursor = service.event_bus.cursor(sources)
+        self.closed = False
+
+    def drain(self, source=None):
+        """Return all new events, or only those from `source` ("blink" or "speech"), oldest first."""
+        if self.closed:
+            return []
+        events = self.cursor.drain(source)
+        if events:
+            # Capture-to-handling latency: levels act on events in the frame they drain them
+            metrics = get_metrics()
+            now = time.monotonic()
+            for event in events:
+                if event.source != "blink_state":
+                    metrics.observe(event.source + "_latency", now - event.timestamp)
+            metrics.gauge("input_queue", len(events) + len(self.cursor.pending))
+            metrics.gauge("input_dropped", self.cursor.dropped)
+        return events
+
+    def skip(self):
+        """Ignore everything received so far."""
+        self.cursor.skip()
+
+    def close(self):
+        """Stop receiving input events. Safe to call more than once."""
+        if not self.closed:
+            self.closed = True
+            self.service.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class InputService:
+    """
+    Owns the camera/face mesh (BlinkDetectionThread) and the Vosk model/microphone
+    (SpeechRecognitionThread) for the whole session. Both threads publish to one
+    EventBus that levels read through their subscriptions.
+    """
+
+    def __init__(self, language="english", blink=True, speech=True, use_grammar=True, vad=True,
+                 adaptive_blink=False, blink_process=False):
+        self.language = language
+        self.blink_process = blink_process  # Run capture and face mesh in child processes (VisionWorker)
+        self.adaptive_blink = adaptive_blink  # Face crop tracking and a variable camera frame rate
+        self.use_grammar = use_grammar
+        self.vad = vad  # Skip silent audio chunks before they reach the recognizer
+        self.blink_enabled = blink
+        self.speech_enabled = speech
+
+        self.event_bus = EventBus()
+        self.event_bus.add_listener(post_input_event)  # Wake screen loops sleeping in FrameScheduler
+        self.subscriptions = []
+        self.lock = threading.Lock()
+
+        self.blink_thread = None
+        self.speech_thread = None
+        self.running = False
+
+    def start(self):
+        """Start the input threads. A missing camera or model only disables that input."""
+        if self.running:
+            return
+        self.running = True
+
+        if self.blink_enabled:
+            try:
+                if self.blink_process:
+                    self.blink_thread = VisionWorker(
+                        self.event_bus, state_interval=None, adaptive=self.adaptive_blink
+                    )
+                else:
+                    self.blink_thread = BlinkDetectionThread(
+                        self.event_bus, state_interval=None, adaptive=self.adaptive_blink
+                    )
+                self.blink_thread.daemon = True  # Never keep the process alive on exit
+                self.blink_thread.start()
+            except Exception as e:
+                print(f"Blink detection unavailable: {e}")
+                self.blink_thread = None
+
+        if self.speech_enabled:
+            try:
+                self.speech_thread = SpeechRecognitionThread(
+                    self.event_bus, language=self.language, use_grammar=self.use_grammar,
+                    vad=self.vad
+                )
+                self.speech_thread.daemon = True
+                self.speech_thread.start()
+            except Exception as e:
+                print(f"Speech recognition unavailable: {e}")
+                self.speech_thread = None
+
+    def set_speech_grammar(self, enabled):
+        """Switch speech recognition between command grammar and open vocabulary."""
+        self.use_grammar = enabled
+        if self.speech_thread is not None:
+            self.speech_thread.set_grammar(enabled)
+
+    def set_blink_thresholds(self, high, low):
+        """Use per-player eye-ratio thresholds: eyes count as closed above high and open again below low."""
+        if self.blink_thread is not None:
+            self.blink_thread.configure(HIGH_THRESHOLD=high, LOW_THRESHOLD=low)
+
+    def set_blink_state_interval(self, seconds):
+        """
+        Change how often "blink_state" is published: seconds between updates, 0 for every
+        frame, None to stop. It is off unless something like calibration turns it on.
+        """
+        if self.blink_thread is not None:
+            self.blink_thread.configure(state_interval=seconds)
+
+    def subscribe(self, sources=None):
+        """
+        Return a new InputSubscription receiving input events from now on. Pass the sources
+        the caller drains (e.g. ("blink", "speech")) so events it never reads are not kept.
+        """
+        subscription = InputSubscription(self, sources)
+        with self.lock:
+            self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            if subscription in self.subscriptions:
+                self.subscriptions.remove(subscription)
+
+    def stop(self, timeout=2.0):
+        """Stop the input threads and release the camera and microphone."""
+        if not self.running:
+            return
+        self.running = False
+
+        for thread in (self.blink_thread, self.speech_thread):
+            if thread is not None:
+                thread.stop()
+        for thread in (self.blink_thread, self.speech_thread):
+            if thread is not None and thread.is_alive():
+                thread.join(timeout)
+
+        self.blink_thread = None
+        self.speech_thread = None
+
+
+# Session-wide service instance
+_service = None
+_service_lock = threading.Lock()
+
+
+def start_input_service(language="english", blink=True, speech=True, use_grammar=True, vad=True,
+                        adaptive_blink=False, blink_process=False):
+    """
+    Start the session input service if it is not running yet and return it.
+    use_grammar restricts speech decoding to the command vocabulary (much cheaper per chunk),
+    vad skips silent chunks before they reach the recognizer, adaptive_blink lowers the
+    camera frame rate while nobody is blinking (off until tests/blink_bench.py --adaptive
+    shows the same blink recall as full frames on recorded clips), blink_process moves blink detection into
+    child processes so it does not share the GIL with the game loop.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = InputService(language=language, blink=blink, speech=speech, use_grammar=use_grammar,
+                                    vad=vad, adaptive_blink=adaptive_blink,
+                                    blink_process=blink_process)
+            atexit.register(stop_input_service)
+        _service.start()
+        return _service
+
+
+def get_input_service():
+    """Return the running input service, starting it with default settings if needed."""
+    if _service is not None and _service.running:
+        return _service
+    return start_input_service()
+
+
+def stop_input_service():
+    """Stop the session input service, e.g. when the application exits."""
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.stop()
+            _service = None
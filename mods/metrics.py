@@ -0,0 +1,206 @@
+import contextlib
+import time
+import pygame
+
+
+def to_ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def add(self, amount=1):
+        self.value += amount
+
+
+class Gauge:
+    """Last value set and the highest one seen."""
+
+    def __init__(self):
+        self.value = 0
+        self.max = 0
+
+    def set(self, value):
+        self.value = value
+        if value > self.max:
+            self.max = value
+
+
+class Histogram:
+    """
+    Durations in log-linear buckets, like HdrHistogram: values are kept in microseconds,
+    exactly below 8us and above that in 8 buckets per power of two, so any percentile is
+    within about 6% of the true value. Recording is a bit_length, a shift and a dict update,
+    and the memory used does not grow with the number of samples.
+    """
+
+    SUB_BUCKETS = 8
+
+    def __init__(self):
+        self.buckets = {}  # Bucket index -> count
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        micros = int(seconds * 1000000)
+        if micros < self.SUB_BUCKETS:
+            index = max(micros, 0)
+        else:
+            shift = micros.bit_length() - 4  # Keep the top 4 bits: 8..15 << shift
+            index = self.SUB_BUCKETS * (shift + 1) + (micros >> shift) - self.SUB_BUCKETS
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def bucket_value(self, index):
+        """Middle of a bucket, in seconds."""
+        if index < self.SUB_BUCKETS:
+            return index / 1000000
+        shift = index // self.SUB_BUCKETS - 1
+        mantissa = index % self.SUB_BUCKETS + self.SUB_BUCKETS
+        return ((mantissa << shift) + (1 << shift) / 2) / 1000000
+
+    def percentile(self, fraction):
+        """Approximate value (seconds) below which `fraction` of the samples fall, None if empty."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.bucket_value(index), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "n": self.count,
+            "mean": to_ms(self.total / self.count),
+            "p50": to_ms(self.percentile(0.50)),
+            "p95": to_ms(self.percentile(0.95)),
+            "p99": to_ms(self.percentile(0.99)),
+            "max": to_ms(self.max),
+        }
+
+
+class MetricScope:
+    """Counters, gauges and histograms for one part of the session, e.g. a level."""
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def summary(self):
+        """Compact dict for the player's JSON file; histogram values are in milliseconds."""
+        summary = {}
+        if self.counters:
+            summary["counters"] = {name: counter.value for name, counter in self.counters.items()}
+        if self.gauges:
+            summary["max"] = {name: gauge.max for name, gauge in self.gauges.items()}
+        for name, histogram in self.histograms.items():
+            if histogram.count:
+                summary[name + "_ms"] = histogram.summary()
+        return summary
+
+
+class Metrics:
+    """
+    Session telemetry, cheap enough to leave on: every update is a dict lookup and a few
+    arithmetic operations on the thread that owns the game loop (no locks). Values go to the
+    current scope, which game_engine.run switches to each level's name while it runs.
+    """
+
+    def __init__(self):
+        self.scopes = {}
+        self.scope = None
+        self.start_scope("session")
+
+    def start_scope(self, name):
+        """Send further values to the scope `name`, creating it if needed."""
+        self.scope = self.scopes.get(name)
+        if self.scope is None:
+            self.scope = self.scopes[name] = MetricScope()
+
+    def reset(self):
+        self.scopes = {}
+        self.start_scope("session")
+
+    def count(self, name, amount=1):
+        counter = self.scope.counters.get(name)
+        if counter is None:
+            counter = self.scope.counters[name] = Counter()
+        counter.value += amount
+
+    def gauge(self, name, value):
+        gauge = self.scope.gauges.get(name)
+        if gauge is None:
+            gauge = self.scope.gauges[name] = Gauge()
+        gauge.set(value)
+
+    def observe(self, name, seconds):
+        """Record a duration in the histogram `name`."""
+        histogram = self.scope.histograms.get(name)
+        if histogram is None:
+            histogram = self.scope.histograms[name] = Histogram()
+        histogram.record(seconds)
+
+    def summary(self):
+        """{scope name: scope summary} for every scope that recorded something."""
+        summaries = {name: scope.summary() for name, scope in self.scopes.items()}
+        return {name: summary for name, summary in summaries.items() if summary}
+
+
+# Session-wide metrics
+_metrics = Metrics()
+
+
+def get_metrics():
+    return _metrics
+
+
+@contextlib.contextmanager
+def instrument_display():
+    """
+    Wrap pygame.display.flip and pygame.display.update inside the `with` block, so every
+    level's frames are measured without changing the levels: "frames" counts display updates,
+    the "frame" histogram holds the time between them and "display_update" the time spent in
+    the call itself. The original functions are put back when the block ends.
+    """
+    if getattr(pygame.display.flip, "instrumented", False):
+        yield  # An outer block is already measuring
+        return
+    flip = pygame.display.flip
+    update = pygame.display.update
+    last_frame = [None]
+
+    def record(started, finished):
+        _metrics.count("frames")
+        _metrics.observe("display_update", finished - started)
+        if last_frame[0] is not None:
+            _metrics.observe("frame", finished - last_frame[0])
+        last_frame[0] = finished
+
+    def instrumented_flip():
+        started = time.perf_counter()
+        flip()
+        record(started, time.perf_counter())
+
+    def instrumented_update(*args):
+        started = time.perf_counter()
+        update(*args)
+        record(started, time.perf_counter())
+
+    instrumented_flip.instrumented = True
+    pygame.display.flip = instrumented_flip
+    pygame.display.update = instrumented_update
+    try:
+        yield
+    finally:
+        pygame.display.flip = flip
+        pygame.display.update = update
@@ -0,0 +1,113 @@
+import collections
+import threading
+import pygame
+from mods.assets import SurfaceCache, load_font
+
+
+class LayoutCache:
+    """Least recently used mapping with at most max_entries entries, for wrapped text layouts."""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+# Session-wide caches
+_system_fonts = {}  # (name, size) -> pygame.font.Font from SysFont
+_fonts_lock = threading.Lock()
+_rendered = SurfaceCache(budget_bytes=8 * 1024 * 1024)  # Rendered text surfaces
+_layouts = LayoutCache()  # Wrapped lines
+
+
+def get_font(name, size):
+    """
+    Return a shared font: `name` is a font file path, a system font name, or None for
+    pygame's default font. Creating a font opens and parses the file, so never do it per frame.
+    """
+    if name is None or name.lower().endswith((".ttf", ".otf", ".ttc")):
+        return load_font(name, size)
+    key = (name, size)
+    with _fonts_lock:
+        font = _system_fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        with _fonts_lock:
+            font = _system_fonts.setdefault(key, font)
+    return font
+
+
+def render_cached(font, text, antialias, color, background=None):
+    """
+    Same as font.render(text, antialias, color, background), but repeated calls return the
+    same cached surface, so callers must not draw on it.
+    """
+    color = tuple(color)
+    background = tuple(background) if background is not None else None
+    key = (text, font, antialias, color, background)
+    surface = _rendered.get(key)
+    if surface is None:
+        surface = font.render(text, antialias, color, background)
+        _rendered.put(key, surface)
+    return surface
+
+
+def wrap_text(text, font, max_width):
+    """
+    Split text into lines no wider than max_width, breaking at spaces (a single word wider
+    than max_width gets a line of its own). Returns a tuple of lines, cached per (text, font, width).
+    """
+    key = (text, font, max_width)
+    lines = _layouts.get(key)
+    if lines is not None:
+        return lines
+
+    lines = []
+    current_line = ""
+    for word in text.split(' '):
+        if font.size(current_line + word)[0] <= max_width:
+            current_line += word + " "
+        else:
+            lines.append(current_line)
+            current_line = word + " "
+    if current_line:
+        lines.append(current_line)
+
+    lines = tuple(lines)
+    _layouts.put(key, lines)
+    return lines
+
+
+def render_text(surface, text, font, color, x, y, max_width):
+    """
+    Draw text with word wrapping, starting at (x, y). Returns the rects of the drawn lines,
+    e.g. for mouse hit tests on options.
+    """
+    text_rects = []
+    for line in wrap_text(text, font, max_width):
+        text_rects.append(surface.blit(render_cached(font, line, True, color), (x, y)))
+        y += font.get_linesize() + 5
+    return text_rects
@@ -0,0 +1,85 @@
+import numpy as np
+import pygame
+
+# Just-intonation ratios of the seven shuddha swaras to Sa
+SWARAS = [
+    ("Sa", 1.0), ("Re", 9 / 8), ("Ga", 5 / 4), ("Ma", 4 / 3),
+    ("Pa", 3 / 2), ("Dha", 5 / 3), ("Ni", 15 / 8),
+]
+OCTAVE_NAMES = ["", " High", " Higher", " Top"]  # Madhya, taar and ati-taar saptak, then the last Sa
+MAX_SWARAS = len(SWARAS) * (len(OCTAVE_NAMES) - 1) + 1
+BASE_FREQUENCY = 261.63  # Madhya Sa, in Hz (middle C)
+HARMONICS = [(1, 1.0), (2, 0.3), (3, 0.12)]  # (multiple of the pitch, amplitude): a soft, plain tone
+
+# numpy sample type for each pygame mixer format; get_init() reports a float32 mixer as -32
+SAMPLE_TYPES = {8: np.uint8, -8: np.int8, 16: np.uint16, -16: np.int16, -32: np.float32}
+
+
+def swara_scale(count, base_frequency=BASE_FREQUENCY):
+    """
+    Return `count` (name, frequency) pairs going up from Sa: Sa .. Ni, then "Sa High" ..
+    "Ni High" and so on, the same names as the recorded notes.
+    """
+    if count > MAX_SWARAS:
+        raise ValueError(f"At most {MAX_SWARAS} swaras are available")
+    scale = []
+    for index in range(count):
+        octave, degree = divmod(index, len(SWARAS))
+        name, ratio = SWARAS[degree]
+        scale.append((name + OCTAVE_NAMES[octave], base_frequency * ratio * 2 ** octave))
+    return scale
+
+
+def tone_wave(frequency, duration, sample_rate, attack=0.01, release=0.2, volume=0.5):
+    """
+    One tone as float samples in -1..1: a few harmonics of `frequency` under a linear attack
+    and an exponential release, so it starts and ends without clicks.
+    """
+    samples = int(duration * sample_rate)
+    t = np.arange(samples, dtype=np.float32) / sample_rate
+    wave = np.zeros(samples, dtype=np.float32)
+    for multiple, amplitude in HARMONICS:
+        if frequency * multiple < sample_rate / 2:  # Skip harmonics above Nyquist
+            wave += amplitude * np.sin(2 * np.pi * frequency * multiple * t)
+    wave /= sum(amplitude for _, amplitude in HARMONICS)
+
+    envelope = np.ones(samples, dtype=np.float32)
+    attack_samples = min(int(attack * sample_rate), samples)
+    envelope[:attack_samples] = np.linspace(0, 1, attack_samples, endpoint=False)
+    release_samples = min(int(release * sample_rate), samples - attack_samples)
+    if release_samples:
+        envelope[samples - release_samples:] = np.exp(np.linspace(0, -6, release_samples))  # Down to 0.25%
+    return wave * envelope * volume
+
+
+def to_sound(wave):
+    """Make a pygame.mixer.Sound from float samples, in whatever format the mixer was opened with."""
+    _, mixer_format, channels = pygame.mixer.get_init()
+    sample_type = SAMPLE_TYPES.get(mixer_format)
+    if sample_type is None:
+        raise pygame.error(f"Unsupported mixer format {mixer_format} for synthesised notes")
+    if sample_type == np.float32:
+        samples = wave
+    else:
+        bits = abs(mixer_format)
+        full_scale = 2 ** (bits - 1) - 1
+        samples = wave * full_scale
+        if mixer_format > 0:  # Unsigned: silence is the middle of the range
+            samples = samples + full_scale + 1
+    samples = samples.astype(sample_type)
+    if channels > 1:
+        samples = np.repeat(samples[:, np.newaxis], channels, axis=1)
+    return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+
+def synth_notes(count, duration=0.75, base_frequency=BASE_FREQUENCY):
+    """
+    Return `count` swara notes as [{"name", "tone"}] like the recorded QuickAudio notes,
+    synthesised for the current mixer format: no files to read or decode.
+    Raises pygame.error if the mixer is not initialised or uses an unsupported format.
+    """
+    if not pygame.mixer.get_init():
+        raise pygame.error("mixer not initialized")
+    sample_rate = pygame.mixer.get_init()[0]
+    return [{"name": name, "tone": to_sound(tone_wave(frequency, duration, sample_rate))}
+            for name, frequency in swara_scale(count, base_frequency)]
@@ -0,0 +1,175 @@
+from abc import ABC, abstractmethod
+import pygame
+from mods.text import render_cached
+
+
+class Widget(ABC):
+    """
+    Something drawn inside a fixed rect on a Screen. Change it with set(), which marks it
+    dirty only when a value actually changes, so the Screen knows what to redraw.
+    """
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.visible = True
+        self.dirty = True
+        self.drawn_rect = None  # Area covered the last time it was drawn, None if not on screen
+
+    def set(self, **attributes):
+        """Update attributes and return True if anything changed."""
+        changed = False
+        for name, value in attributes.items():
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                changed = True
+        if changed:
+            self.changed()
+        return changed
+
+    def changed(self):
+        self.dirty = True
+
+    @abstractmethod
+    def draw(self, surface):
+        """Draw the widget inside its rect."""
+
+
+class Label(Widget):
+    """
+    A line of text. `position` is applied to the rect attribute named by `anchor`,
+    e.g. anchor="midtop" to center the text horizontally on position[0].
+    """
+
+    def __init__(self, text, font, color, position, anchor="topleft"):
+        self.text = text
+        self.font = font
+        self.color = color
+        self.position = position
+        self.anchor = anchor
+        super().__init__((0, 0, 0, 0))
+        self.changed()
+
+    def changed(self):
+        self.rendered = render_cached(self.font, self.text, True, self.color)
+        self.rect = self.rendered.get_rect(**{self.anchor: self.position})
+        self.dirty = True
+
+    def draw(self, surface):
+        surface.blit(self.rendered, self.rect)
+
+
+class Box(Widget):
+    """
+    A filled rectangle with optional text: input fields and buttons.
+
+    :param text_offset: Text position relative to the top-left corner, None to center it.
+    :param border: (color, width) of an outline drawn inside the rect, or None.
+    """
+
+    def __init__(self, rect, color, text="", font=None, text_color=(0, 0, 0), text_offset=(5, 5), border=None):
+        super().__init__(rect)
+        self.color = color
+        self.text = text
+        self.font = font
+        self.text_color = text_color
+        self.text_offset = text_offset
+        self.border = border
+
+    def draw(self, surface):
+        pygame.draw.rect(surface, self.color, self.rect)
+        if self.border is not None:
+            pygame.draw.rect(surface, self.border[0], self.rect, self.border[1])
+        if self.text and self.font is not None:
+            text_surface = render_cached(self.font, self.text, True, self.text_color)
+            if self.text_offset is None:
+                surface.blit(text_surface, text_surface.get_rect(center=self.rect.center))
+            else:
+                surface.blit(text_surface, (self.rect.x + self.text_offset[0], self.rect.y + self.text_offset[1]))
+
+
+class Image(Widget):
+    """
+    A surface blitted at a position, with an optional outline.
+
+    :param border: (color, width) of an outline drawn inside the image, or None.
+    """
+
+    def __init__(self, image, position, border=None):
+        self.image = image
+        self.position = position
+        self.border = border
+        super().__init__(image.get_rect(topleft=position))
+
+    def changed(self):
+        self.rect = self.image.get_rect(topleft=self.position)
+        self.dirty = True
+
+    def draw(self, surface):
+        surface.blit(self.image, self.rect)
+        if self.border is not None:
+            pygame.draw.rect(surface, self.border[0], self.rect, self.border[1])
+
+
+class Screen:
+    """
+    Retained-mode screen: keeps its widgets, redraws only those that changed (plus
+    anything overlapping them) and passes only those areas to pygame.display.update().
+
+    Call invalidate() after anything else has drawn over the surface, e.g. a video or
+    another screen, so the next render() repaints everything.
+    """
+
+    def __init__(self, surface, background):
+        self.surface = surface
+        self.background = background
+        self.widgets = []
+        self.full_redraw = True
+
+    def add(self, widget):
+        self.widgets.append(widget)
+        return widget
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def dirty_rects(self):
+        rects = []
+        for widget in self.widgets:
+            if widget.dirty:
+                if widget.drawn_rect is not None:
+                    rects.append(widget.drawn_rect)  # Where it was, to erase it
+                if widget.visible:
+                    rects.append(widget.rect.copy())  # Where it is now
+        return rects
+
+    def render(self):
+        """Redraw what changed and update those areas of the display. Returns the updated rects."""
+        if self.full_redraw:
+            self.surface.fill(self.background)
+            for widget in self.widgets:
+                if widget.visible:
+                    widget.draw(self.surface)
+            rects = [self.surface.get_rect()]
+            self.full_redraw = False
+        else:
+            rects = self.dirty_rects()
+            if not rects:
+                return []
+            for rect in rects:
+                # Repaint the area from the background up, clipped so nothing outside it changes
+                self.surface.set_clip(rect)
+                self.surface.fill(self.background, rect)
+                for widget in self.widgets:
+                    if widget.visible and widget.rect.colliderect(rect):
+                        widget.draw(self.surface)
+            self.surface.set_clip(None)
+
+        for widget in self.widgets:
+            widget.dirty = False
+            widget.drawn_rect = widget.rect.copy() if widget.visible else None
+
+        # Display coordinates, for game areas that are subsurfaces of the window
+        offset = self.surface.get_abs_offset()
+        update_rects = [rect.move(offset) for rect in rects]
+        pygame.display.update(update_rects)
+        return update_rects
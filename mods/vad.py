@@ -0,0 +1,84 @@
+import collections
+import numpy as np
+
+
+class EnergyGate:
+    """
+    Energy-based voice activity gate for 16 kHz mono int16 audio chunks.
+
+    Chunks louder than the tracked noise floor by threshold_db open the gate. While it is
+    open every chunk passes through; it closes again after hangover seconds of quiet so the
+    recognizer still sees the trailing silence it needs to finalize a result. Quiet chunks
+    are kept in a short pre-roll buffer and flushed when speech starts, so onsets are not cut.
+
+    :param chunk_size: Samples per chunk, used to turn the time settings into chunk counts.
+    :param threshold_db: How far above the noise floor a chunk must be to count as speech.
+    :param min_level_db: Absolute level (dBFS) below which a chunk is never speech.
+    :param hangover: Seconds the gate stays open after the last speech chunk.
+    :param preroll: Seconds of audio kept from before speech starts.
+    :param noise_adapt: Smoothing factor for the noise floor estimate (0..1).
+    """
+
+    def __init__(self, chunk_size=1024, sample_rate=16000, threshold_db=10.0, min_level_db=-55.0,
+                 hangover=0.8, preroll=0.3, noise_adapt=0.05):
+        chunk_seconds = chunk_size / sample_rate
+        self.hangover_chunks = max(1, int(round(hangover / chunk_seconds)))
+        self.preroll = collections.deque(maxlen=max(1, int(round(preroll / chunk_seconds))))
+        self.threshold_db = threshold_db
+        self.min_level_db = min_level_db
+        self.noise_adapt = noise_adapt
+
+        self.noise_db = None  # Noise floor estimate, set from the first chunk
+        self.active = False
+        self.hangover_left = 0
+
+        # Counters for tuning
+        self.chunks_seen = 0
+        self.chunks_passed = 0
+
+    def level_db(self, data):
+        """Return the RMS level of an int16 chunk in dB relative to full scale."""
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+        if samples.size == 0:
+            return -120.0
+        rms = np.sqrt(np.mean(samples * samples))
+        return 20.0 * np.log10(rms / 32768.0 + 1e-6)
+
+    def is_speech(self, level):
+        if self.noise_db is None:
+            self.noise_db = level
+        return level > max(self.noise_db + self.threshold_db, self.min_level_db)
+
+    def process(self, data):
+        """Return the list of chunks to pass on to the recognizer for this input chunk (may be empty)."""
+        self.chunks_seen += 1
+        level = self.level_db(data)
+        speech = self.is_speech(level)
+
+        if not speech:
+            # Only quiet chunks update the noise floor, so speech never raises it
+            self.noise_db += self.noise_adapt * (level - self.noise_db)
+
+        if speech:
+            self.hangover_left = self.hangover_chunks
+            if not self.active:
+                self.active = True
+                chunks = list(self.preroll)
+                self.preroll.clear()
+                chunks.append(data)
+                self.chunks_passed += len(chunks)
+                return chunks
+        elif self.active:
+            self.hangover_left -= 1
+            if self.hangover_left <= 0:
+                self.active = False
+        else:
+            self.preroll.append(data)
+            return []
+
+        self.chunks_passed += 1
+        return [data]
+
+    def pass_ratio(self):
+        """Fraction of chunks that reached the recognizer so far."""
+        return self.chunks_passed / self.chunks_seen if self.chunks_seen else 0.0
@@ -0,0 +1,269 @@
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+HEADER_FIELDS = 2  # Per slot: sequence number, capture timestamp
+
+
+class FrameRing:
+    """
+    Fixed-size ring of frames in shared memory, written by one process and read by another.
+
+    The block starts with a float64 header (per slot: sequence number and capture time)
+    followed by the uint8 frames. Slot bookkeeping (newest published slot, slot being read)
+    lives in the header too, guarded by `condition`. The writer always fills a slot that is
+    neither the newest nor the one being read, so with 3 or more slots it never waits for
+    the reader and the reader always gets the newest complete frame.
+
+    :param name: Name of an existing block to attach to, or None to create one.
+    """
+
+    def __init__(self, frame_shape, slots, condition, name=None):
+        self.frame_shape = tuple(frame_shape)
+        self.slots = slots
+        self.condition = condition
+
+        frame_bytes = int(np.prod(self.frame_shape))
+        header_bytes = (slots * HEADER_FIELDS + 2) * 8
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=header_bytes + slots * frame_bytes)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.name = self.shm.name
+
+        header = np.ndarray((slots * HEADER_FIELDS + 2,), dtype=np.float64, buffer=self.shm.buf)
+        self.slot_info = header[:slots * HEADER_FIELDS].reshape(slots, HEADER_FIELDS)
+        self.state = header[slots * HEADER_FIELDS:]  # [newest slot, slot being read], -1 = none
+        self.frames = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=self.shm.buf,
+                                 offset=header_bytes)
+        if self.owner:
+            self.slot_info[:] = -1
+            self.state[:] = -1
+
+    def attach_args(self):
+        """Arguments for FrameRing in another process (the condition is passed separately)."""
+        return self.frame_shape, self.slots, self.name
+
+    def claim(self):
+        """Return the index of a slot the writer may fill."""
+        with self.condition:
+            newest, reading = int(self.state[0]), int(self.state[1])
+            free = [slot for slot in range(self.slots) if slot != newest and slot != reading]
+            # Overwrite the oldest free slot
+            return min(free, key=lambda slot: self.slot_info[slot, 0])
+
+    def publish(self, slot, seq, captured_at):
+        """Make a filled slot the newest frame and wake the reader."""
+        with self.condition:
+            self.slot_info[slot, 0] = seq
+            self.slot_info[slot, 1] = captured_at
+            self.state[0] = slot
+            self.condition.notify_all()
+
+    def acquire_newest(self, last_seq, timeout):
+        """
+        Wait for a frame newer than last_seq and mark it as being read.
+        Returns (slot, seq, captured_at), or None on timeout.
+        """
+        with self.condition:
+            deadline = time.monotonic() + timeout
+            while True:
+                newest = int(self.state[0])
+                if newest >= 0 and self.slot_info[newest, 0] > last_seq:
+                    self.state[1] = newest
+                    return newest, int(self.slot_info[newest, 0]), float(self.slot_info[newest, 1])
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.condition.wait(remaining):
+                    return None
+
+    def release(self):
+        """The reader is done with its slot."""
+        with self.condition:
+            self.state[1] = -1
+
+    def close(self):
+        # Drop the NumPy views before closing, the buffer cannot be released while they exist
+        self.slot_info = self.state = self.frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # A caller still holds a frame view; the block goes away with the process
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingFrameSource:
+    """Frame source (see mods.frame_source) reading the newest frame from a FrameRing as a zero-copy view."""
+
+    def __init__(self, ring, stop_event, command_connection=None):
+        self.ring = ring
+        self.stop_event = stop_event
+        self.command_connection = command_connection  # Settings sent by VisionWorker.configure
+        self.detector = None  # Receives those settings between frames
+        self.finished = False
+        self.live = True
+        self.last_seq = -1
+
+    def read(self):
+        self.ring.release()  # The previous frame has been processed
+        while self.command_connection is not None and self.command_connection.poll():
+            self.detector.configure(**self.command_connection.recv())
+        while not self.stop_event.is_set():
+            acquired = self.ring.acquire_newest(self.last_seq, timeout=0.5)
+            if acquired is not None:
+                slot, self.last_seq, captured_at = acquired
+                return self.ring.frames[slot], captured_at
+        self.finished = True
+        return None, None
+
+    def close(self):
+        self.ring.release()
+        self.finished = True
+
+
+class PipePublisher:
+    """Stands in for the EventBus inside the worker process and forwards events over a pipe."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def publish(self, source, value, timestamp=None):
+        self.connection.send((source, value, timestamp))
+
+
+def capture_main(ring_args, condition, stop_event, camera):
+    """Capture process: copy camera frames into the ring as fast as the camera delivers them."""
+    import cv2
+    from mods.frame_source import CameraSource
+
+    frame_shape, slots, name = ring_args
+    ring = FrameRing(frame_shape, slots, condition, name=name)
+    source = CameraSource(camera)
+    height, width = frame_shape[:2]
+    seq = 0
+    try:
+        while not stop_event.is_set():
+            frame, captured_at = source.read()
+            if frame is None:
+                break
+            slot = ring.claim()
+            if frame.shape == ring.frame_shape:
+                ring.frames[slot][...] = frame
+            else:
+                cv2.resize(frame, (width, height), dst=ring.frames[slot])
+            seq += 1
+            ring.publish(slot, seq, captured_at)
+    finally:
+        source.close()
+        ring.close()
+        stop_event.set()  # No more frames, let the inference process finish too
+
+
+def inference_main(ring_args, condition, stop_event, connection, command_connection, detector_options):
+    """Inference process: run the blink detector on ring frames and send its events back."""
+    from mods.blink_detect import BlinkDetectionThread
+
+    frame_shape, slots, name = ring_args
+    ring = FrameRing(frame_shape, slots, condition, name=name)
+    try:
+        source = RingFrameSource(ring, stop_event, command_connection)
+        detector = BlinkDetectionThread(PipePublisher(connection), source=source, **detector_options)
+        source.detector = detector
+        detector.run()  # In this process's main thread
+    finally:
+        ring.close()
+        connection.close()
+
+
+class VisionWorker(threading.Thread):
+    """
+    Blink detection in two child processes, so MediaPipe and the capture loop never compete
+    with the pygame loop or speech recognition for the GIL. The capture process writes
+    camera frames into a shared-memory FrameRing, the inference process runs
+    BlinkDetectionThread on zero-copy views of the newest frame and sends its events over a
+    pipe. This thread only receives those events and publishes them on the event bus.
+
+    Used in place of BlinkDetectionThread: start(), stop(), join().
+
+    :param frame_shape: (height, width, 3) of the frames in the ring; camera frames of another
+                        size are resized into it.
+    :param slots: Frames in the ring, at least 3.
+    :param detector_options: Keyword arguments for BlinkDetectionThread (state_interval, adaptive, ...).
+    """
+
+    def __init__(self, event_bus, frame_shape=(480, 640, 3), slots=4, camera=0, **detector_options):
+        super().__init__()
+        if slots < 3:
+            raise ValueError("FrameRing needs at least 3 slots")
+        self.event_bus = event_bus
+        self.frame_shape = frame_shape
+        self.slots = slots
+        self.camera = camera
+        self.detector_options = detector_options
+
+        self.stop_event = multiprocessing.Event()
+        self.ring = None
+        self.processes = []
+        self.connection = None
+        self.command_connection = None
+
+    def start(self):
+        condition = multiprocessing.Condition()
+        self.ring = FrameRing(self.frame_shape, self.slots, condition)
+        self.connection, worker_connection = multiprocessing.Pipe(duplex=False)
+        worker_commands, self.command_connection = multiprocessing.Pipe(duplex=False)
+
+        ring_args = self.ring.attach_args()
+        self.processes = [
+            multiprocessing.Process(
+                target=capture_main, args=(ring_args, condition, self.stop_event, self.camera),
+                name="vision-capture", daemon=True
+            ),
+            multiprocessing.Process(
+                target=inference_main,
+                args=(ring_args, condition, self.stop_event, worker_connection, worker_commands,
+                      self.detector_options),
+                name="vision-inference", daemon=True
+            ),
+        ]
+        for process in self.processes:
+            process.start()
+        worker_connection.close()  # Only the inference process uses these ends
+        worker_commands.close()
+        super().start()
+
+    def run(self):
+        try:
+            while True:
+                try:
+                    if not self.connection.poll(0.2):
+                        if self.stop_event.is_set() and not self.processes[1].is_alive():
+                            break
+                        continue
+                    source, value, timestamp = self.connection.recv()
+                except (EOFError, OSError):
+                    break  # Inference process exited
+                self.event_bus.publish(source, value, timestamp)
+        finally:
+            self.stop_event.set()
+            for process in self.processes:
+                process.join(2.0)
+                if process.is_alive():
+                    process.terminate()
+            self.connection.close()
+            self.command_connection.close()
+            self.ring.close()
+
+    def configure(self, **settings):
+        """Change detector attributes in the inference process, e.g. HIGH_THRESHOLD."""
+        try:
+            self.command_connection.send(settings)
+        except (OSError, AttributeError):
+            pass  # Worker not running
+
+    def stop(self):
+        self.stop_event.set()
@@ -0,0 +1,130 @@
+"""
+Headless playthrough of the real levels, for performance regression checks.
+
+Runs game_engine.run with SDL's dummy video and audio drivers and no camera or microphone:
+a ScriptedInputDriver plays tests/simulation_script.json (or --script) into the levels as
+key presses, clicks, blinks and speech commands. The seed fixes both the level content
+(the levels use the random module) and the random input, so runs are repeatable.
+
+    python -m simulate --seed 7 [--levels LogicLink,NumberSort] [--output report.json]
+
+Reports per level: wall time, frames rendered (display updates) and frame-time percentiles,
+from the same metrics (mods/metrics.py) that are saved with real attempts.
+"""
+import argparse
+import json
+import os
+import random
+import time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+import game_engine
+import global_data
+from mods.input_service import start_input_service, stop_input_service
+from mods.input_script import InputScript, ScriptedInputDriver
+from mods.metrics import get_metrics, instrument_display
+
+WIDTH, HEIGHT = 800, 600  # Same layout as main_menu: 50px bars above and below the game area
+GAME_HEIGHT = 500
+
+# Answers for PersonalQuiz when the form level is not part of the run
+SAMPLE_USER_DATA = {
+    "player_name": "Asha", "father_name": "Ravi", "mother_name": "Meena",
+    "birth_city": "Pune", "favorite_food": "Dosa", "hobby": "Chess", "favorite_color": "Blue",
+}
+
+
+class SimulationListener:
+    """game_engine.run listener: drives the input script and records each level's numbers."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.report = []
+        self.level_start = None
+
+    def level_started(self, level):
+        self.level_start = time.perf_counter()
+        self.driver.level_started(level["name"])
+
+    def level_finished(self, level, result_list, time_taken):
+        wall_time = time.perf_counter() - self.level_start
+        self.driver.level_finished()
+        level_metrics = get_metrics().scopes[level["name"]].summary()
+        frame_ms = level_metrics.get("frame_ms", {})
+        self.report.append({
+            "level": level["name"],
+            "wall_time": round(wall_time, 3),
+            "level_time": round(time_taken, 3),
+            "results": list(result_list),
+            "frames": level_metrics.get("counters", {}).get("frames", 0),
+            "frame_ms_p50": frame_ms.get("p50"),
+            "frame_ms_p95": frame_ms.get("p95"),
+            "frame_ms_p99": frame_ms.get("p99"),
+            "frame_ms_max": frame_ms.get("max"),
+            "metrics": level_metrics,
+        })
+
+
+def print_report(report, total_time):
+    print()
+    print(f"{'Level':<20}{'Wall s':>9}{'Frames':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>10}  Results")
+    for row in report:
+        columns = [row[key] if row[key] is not None else "-"
+                   for key in ("frame_ms_p50", "frame_ms_p95", "frame_ms_p99", "frame_ms_max")]
+        print(f"{row['level']:<20}{row['wall_time']:>9.2f}{row['frames']:>8}"
+              f"{columns[0]:>9}{columns[1]:>9}{columns[2]:>9}{columns[3]:>10}  {row['results']}")
+    print(f"Total: {total_time:.2f}s, {sum(row['frames'] for row in report)} frames")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless scripted playthrough of the levels")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for level content and random input")
+    parser.add_argument("--script", default=os.path.join("tests", "simulation_script.json"),
+                        help="Input script (JSON, see mods/input_script.py)")
+    parser.add_argument("--levels", default=None,
+                        help="Comma-separated level names to play, all of game_engine.LEVELS by default")
+    parser.add_argument("--output", default=None, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    levels = game_engine.LEVELS
+    if args.levels:
+        names = args.levels.split(",")
+        levels = [level for level in game_engine.LEVELS if level["name"] in names]
+        unknown = set(names) - {level["name"] for level in levels}
+        if unknown:
+            parser.error(f"Unknown levels: {', '.join(sorted(unknown))}")
+    if not any(level["name"] == "form" for level in levels):
+        global_data.persistent_user_data.update(SAMPLE_USER_DATA)
+
+    random.seed(args.seed)
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    game_surface = screen.subsurface(pygame.Rect(0, 50, WIDTH, GAME_HEIGHT))
+
+    # The session input service without camera or microphone; the script publishes on its bus
+    service = start_input_service(blink=False, speech=False)
+    driver = ScriptedInputDriver(InputScript.load(args.script, seed=args.seed), service.event_bus)
+    driver.start()
+
+    listener = SimulationListener(driver)
+
+    start = time.perf_counter()
+    try:
+        with instrument_display():
+            game_engine.run(game_surface, "simulation", "30", 0, WIDTH, GAME_HEIGHT, levels=levels, listener=listener)
+    finally:
+        driver.stop()
+        stop_input_service()
+    total_time = time.perf_counter() - start
+
+    print_report(listener.report, total_time)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"seed": args.seed, "total_time": round(total_time, 3), "levels": listener.report},
+                      output_file, indent=2)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
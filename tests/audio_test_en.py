@@ -1,3 +1,4 @@
+import json
 import pyaudio
 from vosk import Model, KaldiRecognizer
 
@@ -25,12 +26,12 @@ try:
         # Process partial results
         if recognizer.AcceptWaveform(data):
             result = recognizer.Result()
-            text = eval(result).get("text", "")
+            text = json.loads(result).get("text", "")
             if text:  # Print final result only if non-empty
                 print(f"Final Recognized: {text}")
             last_partial = ""  # Reset partial result tracker
         else:
-            partial = eval(recognizer.PartialResult()).get("partial", "")
+            partial = json.loads(recognizer.PartialResult()).get("partial", "")
             if partial != last_partial:  # Only print if partial has changed
                 print(f"Partial Recognized: {partial}")
                 last_partial = partial
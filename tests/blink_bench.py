@@ -0,0 +1,161 @@
+"""
+Throughput and accuracy benchmark for BlinkDetectionThread on recorded clips.
+
+Each clip is a video file or a directory of frame images. A clip is labelled by a JSON
+file next to it with the same name plus ".json", listing the times (seconds into the
+clip) at which the eyes close for each blink:
+    clips/blinks_01.mp4
+    clips/blinks_01.mp4.json    {"blinks": [1.2, 3.85, 4.3]}
+
+Clips are fed through the real detection code as fast as possible. The script reports
+frames per second, time per stage (resize, color convert, FaceMesh, ratio) and blink
+precision/recall for the HIGH_THRESHOLD/LOW_THRESHOLD pair (override with --high/--low).
+--every N keeps only every Nth frame, to see what a lower camera frame rate would cost
+in accuracy, and --adaptive runs the adaptive frame rate/face crop mode. Without
+labelled clips, --synthetic N measures throughput on N noise frames.
+
+Usage (from the repository root):
+    python -m tests.blink_bench clips/*.mp4 [--scale 1.0] [--every 2] [--adaptive] [--high 4.1 --low 3.1]
+    python -m tests.blink_bench --synthetic 300
+"""
+import argparse
+import json
+import os
+import time
+from mods.event_bus import EventBus
+from mods.blink_detect import BlinkDetectionThread
+from mods.frame_source import open_frame_source, SyntheticSource
+
+MATCH_TOLERANCE = 0.4  # Seconds between a labelled and a detected eye closure to count as a hit
+
+
+class FrameStepSource:
+    """Wraps a frame source and passes on only every `step`th frame."""
+
+    def __init__(self, source, step):
+        self.source = source
+        self.step = step
+        self.finished = False
+        self.live = source.live
+
+    def read(self):
+        for _ in range(self.step - 1):
+            frame, _ = self.source.read()
+            if frame is None:
+                self.finished = True
+                return None, None
+        frame, captured_at = self.source.read()
+        self.finished = self.source.finished
+        return frame, captured_at
+
+    def close(self):
+        self.source.close()
+
+
+def load_labels(clip_path):
+    label_path = clip_path.rstrip("/\\") + ".json"
+    if not os.path.exists(label_path):
+        return None
+    with open(label_path, "r", encoding="utf-8") as label_file:
+        return sorted(json.load(label_file)["blinks"])
+
+
+def match_blinks(detected, labelled):
+    """Return the number of detected closures within MATCH_TOLERANCE of a distinct labelled one."""
+    hits = 0
+    unmatched = list(labelled)
+    for closed_at in detected:
+        best = None
+        for label in unmatched:
+            if abs(label - closed_at) <= MATCH_TOLERANCE and (best is None or abs(label - closed_at) < abs(best - closed_at)):
+                best = label
+        if best is not None:
+            unmatched.remove(best)
+            hits += 1
+    return hits
+
+
+def run_clip(source, args):
+    """Run one source through a fresh detector and return (thread, eye closure times, wall seconds)."""
+    event_bus = EventBus(capacity=100000)
+    cursor = event_bus.cursor()
+    if args.every > 1:
+        source = FrameStepSource(source, args.every)
+    thread = BlinkDetectionThread(event_bus, scale=args.scale, source=source, profile=True, adaptive=args.adaptive)
+    if args.high is not None:
+        thread.HIGH_THRESHOLD = args.high
+    if args.low is not None:
+        thread.LOW_THRESHOLD = args.low
+
+    start = time.perf_counter()
+    thread.run()  # Runs in this thread until the clip ends
+    elapsed = time.perf_counter() - start
+
+    closures = [event.timestamp for event in cursor.drain("blink") if event.value == "EYES_CLOSED"]
+    return thread, closures, elapsed
+
+
+def print_throughput(name, thread, elapsed):
+    frames = max(1, thread.frames_processed)
+    stages = "  ".join(
+        f"{stage} {seconds / frames * 1000:6.2f} ms" for stage, seconds in thread.stage_times.items()
+    )
+    print(f"  {name:30s} {thread.frames_processed:5d} frames  {thread.frames_processed / elapsed:6.1f} fps  {stages}")
+    if thread.frames_skipped:
+        print(f"    adaptive: skipped {thread.frames_skipped} of {thread.frames_processed + thread.frames_skipped} frames")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark blink detection on recorded clips")
+    parser.add_argument("clips", nargs="*", help="Video files or frame directories, labelled with <clip>.json")
+    parser.add_argument("--synthetic", type=int, default=0, help="Also run this many generated frames (no face)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Processing scale passed to the detector")
+    parser.add_argument("--every", type=int, default=1, help="Keep only every Nth frame")
+    parser.add_argument("--adaptive", action="store_true", help="Use the adaptive frame rate and face crop mode")
+    parser.add_argument("--high", type=float, help="Override HIGH_THRESHOLD")
+    parser.add_argument("--low", type=float, help="Override LOW_THRESHOLD")
+    args = parser.parse_args()
+
+    if not args.clips and not args.synthetic:
+        parser.error("give at least one clip or --synthetic N")
+
+    print(f"scale={args.scale}, every={args.every}, adaptive={'on' if args.adaptive else 'off'}, thresholds high={args.high or 'default'} low={args.low or 'default'}")
+
+    if args.synthetic:
+        thread, _, elapsed = run_clip(SyntheticSource(frames=args.synthetic), args)
+        print_throughput("synthetic", thread, elapsed)
+
+    total_frames = 0
+    total_time = 0.0
+    true_positives = 0
+    detected_total = 0
+    labelled_total = 0
+
+    for clip_path in args.clips:
+        source = open_frame_source(clip_path)
+        thread, closures, elapsed = run_clip(source, args)
+        print_throughput(os.path.basename(clip_path.rstrip("/\\")), thread, elapsed)
+        total_frames += thread.frames_processed
+        total_time += elapsed
+
+        labels = load_labels(clip_path)
+        if labels is None:
+            print("    (no labels)")
+            continue
+        detected = [source.media_time(closed_at) for closed_at in closures]
+        hits = match_blinks(detected, labels)
+        true_positives += hits
+        detected_total += len(detected)
+        labelled_total += len(labels)
+        print(f"    blinks: {len(labels)} labelled, {len(detected)} detected, {hits} matched")
+
+    if total_frames:
+        print(f"  total: {total_frames} frames, {total_frames / total_time:.1f} fps")
+    if labelled_total:
+        precision = true_positives / detected_total if detected_total else 0.0
+        recall = true_positives / labelled_total
+        print(f"  precision {precision * 100:.1f}%  recall {recall * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Accuracy check for the blink detector's processing resolution.
+
+Runs BlinkDetectionThread over a recorded video once per scale and compares every run
+with the reference scale (1.5, the old cubic upscale): per-frame eye ratio difference,
+face detection agreement, blink events found and processing time per frame.
+
+Usage (from the repository root):
+    python -m tests.blink_scale_check recording.mp4 [--scales 1.5 1.0 0.75 0.5]
+
+The recording may also be a directory of frame images.
+"""
+import argparse
+import time
+from mods.event_bus import EventBus
+from mods.blink_detect import BlinkDetectionThread
+from mods.frame_source import open_frame_source
+
+REFERENCE_SCALE = 1.5
+
+
+def run_scale(video_path, scale):
+    """Process the whole video at one scale and return (ratios per frame, blink events, seconds)."""
+    event_bus = EventBus(capacity=100000)
+    cursor = event_bus.cursor()
+    thread = BlinkDetectionThread(event_bus, state_interval=0, scale=scale, source=open_frame_source(video_path))
+
+    start = time.perf_counter()
+    thread.run()  # Runs in this thread until the video ends
+    elapsed = time.perf_counter() - start
+
+    ratios = [event.value["ratio"] for event in cursor.drain("blink_state")]
+    blinks = [event.value for event in cursor.drain("blink") if event.value in ("SINGLE_BLINK", "DOUBLE_BLINK")]
+    return ratios, blinks, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare blink detection quality across processing scales")
+    parser.add_argument("video", help="Recorded webcam video (or frame directory) with a face blinking")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0, 0.75, 0.5])
+    args = parser.parse_args()
+
+    reference, reference_blinks, reference_time = run_scale(args.video, REFERENCE_SCALE)
+    if not reference:
+        print("No frames read from the video")
+        return
+    print(f"reference x{REFERENCE_SCALE}: {len(reference)} frames, {len(reference_blinks)} blinks, "
+          f"{reference_time / len(reference) * 1000:.1f} ms/frame")
+
+    for scale in args.scales:
+        ratios, blinks, elapsed = run_scale(args.video, scale)
+        frames = min(len(ratios), len(reference))
+
+        both = [(ratios[i], reference[i]) for i in range(frames)
+                if ratios[i] is not None and reference[i] is not None]
+        face_agreement = sum(
+            (ratios[i] is None) == (reference[i] is None) for i in range(frames)
+        ) / frames
+        if both:
+            errors = sorted(abs(ratio - ref) for ratio, ref in both if ratio != float("inf") and ref != float("inf"))
+            ratio_error = f"mean {sum(errors) / len(errors):.3f}, p95 {errors[int(len(errors) * 0.95)]:.3f}" \
+                if errors else "n/a"
+        else:
+            ratio_error = "n/a"
+
+        status = "OK" if blinks == reference_blinks else "DIFFERS"
+        print(f"x{scale}: {elapsed / max(1, len(ratios)) * 1000:.1f} ms/frame, face agreement "
+              f"{face_agreement * 100:.1f}%, ratio error {ratio_error}, "
+              f"{len(blinks)} blinks ({status})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Throughput benchmark for SpeechRecognitionThread on recorded command clips.
+
+Each clip is a 16 kHz mono 16-bit WAV file whose name starts with the expected command,
+e.g. clips/english/select_01.wav or clips/hindi/चयन_01.wav. Clips are fed through the
+real recognition code as fast as possible and the script reports real-time factor, CPU
+time, per-command latency and accuracy.
+
+Latency is measured in audio time: how far into the clip the command was emitted,
+relative to the end of the recorded speech (negative values mean a partial result
+fired before the clip ended).
+
+Usage (from the repository root):
+    python -m tests.speech_bench --english clips/english --hindi clips/hindi [--chunk 1024] [--grammar] [--vad]
+"""
+import argparse
+import os
+import time
+from mods.event_bus import EventBus
+from mods.vad import EnergyGate
+from mods.audio_detect import SpeechRecognitionThread
+from mods.audio_source import BufferSource, read_wav, SAMPLE_RATE, SAMPLE_WIDTH
+
+TRAILING_SILENCE = 0.5  # Seconds of silence appended so the recognizer finalizes each clip
+
+
+def run_clip(thread, cursor, pcm, expected, chunk):
+    """Feed one clip through the recognizer and return (emitted command, latency seconds or None)."""
+    source = BufferSource(pcm + bytes(int(TRAILING_SILENCE * SAMPLE_RATE) * SAMPLE_WIDTH))
+    speech_end = len(pcm) / SAMPLE_WIDTH / SAMPLE_RATE
+    thread.recognizer = thread.create_recognizer()  # Fresh decoder state per clip
+    thread.last_result = ""
+    thread.last_partial_raw = ""
+
+    consumed = 0
+    detected = None
+    latency = None
+    while True:
+        data = source.read(chunk)
+        if not data:
+            break
+        consumed += len(data) // SAMPLE_WIDTH
+        thread.feed(data)
+
+        for event in cursor.drain("speech"):
+            if detected is None and event.value == expected:
+                detected = event.value
+                latency = consumed / SAMPLE_RATE - speech_end
+
+    return detected, latency
+
+
+def bench_language(language, clip_dir, chunk, use_grammar, use_vad):
+    clips = sorted(name for name in os.listdir(clip_dir) if name.lower().endswith(".wav"))
+    if not clips:
+        print(f"No clips in {clip_dir}")
+        return
+
+    event_bus = EventBus()
+    cursor = event_bus.cursor()
+    thread = SpeechRecognitionThread(
+        event_bus, language=language, use_grammar=use_grammar,
+        source=BufferSource(b""), chunk_size=chunk, vad=EnergyGate(chunk_size=chunk) if use_vad else False
+    )
+    load_start = time.perf_counter()
+    thread.prepare()
+    print(f"\n{language}: model ready in {time.perf_counter() - load_start:.2f}s, "
+          f"chunk={chunk}, grammar={'on' if use_grammar else 'off'}, vad={'on' if use_vad else 'off'}")
+
+    audio_seconds = 0.0
+    wall_total = 0.0
+    cpu_total = 0.0
+    hits = 0
+    latencies = []
+
+    for name in clips:
+        expected = os.path.splitext(name)[0].split("_")[0]
+        pcm = read_wav(os.path.join(clip_dir, name))
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        detected, latency = run_clip(thread, cursor, pcm, expected, chunk)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        duration = len(pcm) / SAMPLE_WIDTH / SAMPLE_RATE + TRAILING_SILENCE
+        audio_seconds += duration
+        wall_total += wall
+        cpu_total += cpu
+        if detected:
+            hits += 1
+            latencies.append(latency)
+
+        status = f"latency {latency * 1000:+7.0f} ms" if detected else "MISSED"
+        print(f"  {name:30s} {expected:10s} RTF {wall / duration:6.3f}  CPU {cpu * 1000:7.1f} ms  {status}")
+
+    print(f"  total: {len(clips)} clips, {audio_seconds:.1f}s audio, RTF {wall_total / audio_seconds:.3f}, "
+          f"CPU {cpu_total:.2f}s, accuracy {hits}/{len(clips)}")
+    if thread.vad is not None:
+        print(f"  vad: {thread.vad.pass_ratio() * 100:.0f}% of chunks decoded")
+    if latencies:
+        latencies.sort()
+        print(f"  latency: median {latencies[len(latencies) // 2] * 1000:+.0f} ms, "
+              f"worst {latencies[-1] * 1000:+.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speech recognition on recorded command clips")
+    parser.add_argument("--english", help="Directory of English command clips")
+    parser.add_argument("--hindi", help="Directory of Hindi command clips")
+    parser.add_argument("--chunk", type=int, default=1024, help="Samples per recognizer call")
+    parser.add_argument("--grammar", action="store_true", help="Decode against the command grammar")
+    parser.add_argument("--vad", action="store_true", help="Skip silent chunks with the energy gate")
+    args = parser.parse_args()
+
+    if not args.english and not args.hindi:
+        parser.error("give at least one of --english/--hindi")
+
+    for language, clip_dir in (("english", args.english), ("hindi", args.hindi)):
+        if clip_dir:
+            bench_language(language, clip_dir, args.chunk, args.grammar, args.vad)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Micro-benchmark for the speech result parsing path.
+
+Feeds a recorded 16 kHz mono WAV file through a KaldiRecognizer and compares the old
+per-chunk eval() parsing with the JSON parsing in mods.audio_detect, with and without
+partial results.
+
+Usage (from the repository root):
+    python -m tests.speech_parse_bench recording.wav [--language english] [--repeat 200]
+"""
+import argparse
+import time
+from vosk import KaldiRecognizer
+from mods.audio_detect import get_model, parse_result
+from mods.audio_source import read_wav
+
+CHUNK = 1024
+
+
+def read_chunks(path):
+    """Read a 16 kHz mono int16 WAV file into a list of CHUNK-sample byte strings."""
+    data = read_wav(path)
+    step = CHUNK * 2
+    return [data[i:i + step] for i in range(0, len(data), step)]
+
+
+def run_loop(model, chunks, mode):
+    """
+    Run the recognizer over all chunks and return the elapsed seconds.
+
+    :param mode: "eval" (old behaviour), "json" (partials decoded only when they change)
+                 or "final" (final results only).
+    """
+    recognizer = KaldiRecognizer(model, 16000)
+    last_partial_raw = ""
+    start = time.perf_counter()
+    for data in chunks:
+        if recognizer.AcceptWaveform(data):
+            if mode == "eval":
+                eval(recognizer.Result()).get("text", "")
+            else:
+                last_partial_raw = ""
+                parse_result(recognizer.Result(), "text")
+        elif mode == "eval":
+            eval(recognizer.PartialResult()).get("partial", "")
+        elif mode == "json":
+            raw = recognizer.PartialResult()
+            if raw != last_partial_raw:
+                last_partial_raw = raw
+                parse_result(raw, "partial")
+    return time.perf_counter() - start
+
+
+def collect_raw_results(model, chunks):
+    """Return every raw Result()/PartialResult() string the old loop would have parsed."""
+    recognizer = KaldiRecognizer(model, 16000)
+    raw_results = []
+    for data in chunks:
+        if recognizer.AcceptWaveform(data):
+            raw_results.append(("text", recognizer.Result()))
+        else:
+            raw_results.append(("partial", recognizer.PartialResult()))
+    return raw_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speech result parsing")
+    parser.add_argument("wav", help="16 kHz mono 16-bit WAV recording")
+    parser.add_argument("--language", default="english")
+    parser.add_argument("--repeat", type=int, default=200, help="Repetitions for the parse-only benchmark")
+    args = parser.parse_args()
+
+    chunks = read_chunks(args.wav)
+    model = get_model(args.language)
+    print(f"{len(chunks)} chunks of {CHUNK} samples ({len(chunks) * CHUNK / 16000:.1f}s of audio)")
+
+    # Parsing only, over the strings the recognizer actually produced
+    raw_results = collect_raw_results(model, chunks)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for key, raw in raw_results:
+            eval(raw).get(key, "")
+    eval_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for key, raw in raw_results:
+            parse_result(raw, key)
+    json_time = time.perf_counter() - start
+
+    parsed = len(raw_results) * args.repeat
+    print(f"eval() parse:      {eval_time / parsed * 1e6:8.2f} us/result")
+    print(f"parse_result():    {json_time / parsed * 1e6:8.2f} us/result")
+
+    # Whole recognition loop, decoding included
+    for mode in ("eval", "json", "final"):
+        elapsed = run_loop(model, chunks, mode)
+        print(f"loop ({mode:5s}):      {elapsed / len(chunks) * 1e6:8.1f} us/chunk")
+
+
+if __name__ == "__main__":
+    main()